@@ -0,0 +1,103 @@
+"""
+Clock-skew estimator (core/clock.py) against the SNTP and KDC stand-ins in
+fakeservices.py: the median/MAD summary, timeouts of silent sources and the
+per-DC cache.
+
+Run with `pytest benchmarks/bench_clock.py -s`. The time a measurement may take
+past its per-request timeout can be relaxed with SEER_SKEW_SLACK_MS.
+"""
+import functools
+import json
+import os
+import time
+
+import pytest
+
+from fakeservices import FakeClock
+
+pytest.importorskip("minikerberos")
+
+SLACK_MS = float(os.getenv("SEER_SKEW_SLACK_MS", "500"))
+IP = "127.0.0.50"
+OFFSET = 8 * 3600 - 17.25  # the DC runs almost eight hours ahead
+
+
+def test_summary_is_median_and_mad():
+    from seerAD.core.clock import summarize_samples
+
+    samples = [{"source": "ntp", "offset": o, "delay": 0.004} for o in (10.0, 10.004, 9.998, 40.0)]
+    samples.append({"source": "kerberos", "offset": 10.001, "delay": 0.010})
+    summary = summarize_samples(samples)
+    assert summary["offset"] == 10.001  # the outlier does not move the median
+    assert summary["error"] == pytest.approx(0.003 * 1.4826)  # MAD of (0.001, 0.003, 0.003, 29.999, 0)
+    assert (summary["samples"], summary["sources"]) == (5, ["kerberos", "ntp"])
+    single = summarize_samples(samples[-1:])
+    assert (single["offset"], single["error"]) == (10.001, 0.005)  # one exchange: half its round trip
+
+
+def test_measure_against_stand_ins():
+    from seerAD.core.clock import measure_skew
+
+    with FakeClock(IP, ntp_offsets=[OFFSET, OFFSET + 0.004, OFFSET - 0.002, OFFSET + 30], kdc_offset=OFFSET) as dc:
+        start = time.perf_counter()
+        skew = measure_skew(IP, "corp.local", ntp_samples=4, timeout=1.0, **dc.ports)
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f"\nskew {skew['offset']:+.4f}s ± {skew['error'] * 1000:.1f} ms from {skew['samples']} samples "
+          f"in {elapsed:.1f} ms")
+    assert dc.requests == {"ntp": 4, "kerberos": 1}
+    assert skew["sources"] == ["kerberos", "ntp"] and skew["samples"] == 5
+    assert abs(skew["offset"] - OFFSET) < 0.01 and skew["error"] < 0.05
+
+
+def test_delay_is_inside_the_error():
+    """A slow path shifts each sample by up to half its round trip; the interval still holds the true offset."""
+    from seerAD.core.clock import measure_skew
+
+    with FakeClock(IP, offset=OFFSET, delay=0.2) as dc:
+        skew = measure_skew(IP, "corp.local", timeout=1.0, **dc.ports)
+    assert skew["error"] >= 0.1
+    assert abs(skew["offset"] - OFFSET) <= skew["error"] + 0.01
+
+
+def test_silent_sources_time_out_together():
+    from seerAD.core.clock import measure_skew
+
+    with FakeClock(IP, offset=OFFSET, silent_ntp=True) as dc:
+        start = time.perf_counter()
+        skew = measure_skew(IP, "corp.local", ntp_samples=4, timeout=0.5, **dc.ports)
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f"\nNTP silent: kerberos only after {elapsed:.0f} ms")
+    assert (skew["sources"], skew["samples"]) == (["kerberos"], 1)
+    assert abs(skew["offset"] - OFFSET) < 0.01
+    assert elapsed < 500 + SLACK_MS  # the four NTP timeouts run at once, not one after another
+
+    with FakeClock(IP, offset=OFFSET, silent_ntp=True, silent_kdc=True) as dc:
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError):
+            measure_skew(IP, "corp.local", timeout=0.5, **dc.ports)
+        elapsed = (time.perf_counter() - start) * 1000
+    assert elapsed < 500 + SLACK_MS
+
+
+def test_cache_ttl(monkeypatch):
+    from seerAD.core import clock
+
+    clock.SKEW_CACHE_FILE.unlink(missing_ok=True)
+    with FakeClock(IP, offset=OFFSET) as dc:
+        monkeypatch.setattr(clock, "measure_skew", functools.partial(clock.measure_skew, timeout=1.0, **dc.ports))
+        first = clock.get_skew(IP, "corp.local")
+        asked = dict(dc.requests)
+        second = clock.get_skew(IP, "corp.local")
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert dc.requests == asked and second["offset"] == first["offset"]
+
+        assert clock.get_skew(IP, "corp.local", refresh=True)["cached"] is False
+        assert dc.requests["kerberos"] == 2
+
+        cache = json.loads(clock.SKEW_CACHE_FILE.read_text())
+        cache[IP]["measured_at"] -= clock.SKEW_CACHE_TTL + 1
+        clock.SKEW_CACHE_FILE.write_text(json.dumps(cache))
+        assert clock.get_cached_skew(IP) is None
+        assert clock.get_skew(IP, "corp.local")["cached"] is False  # expired: measured again
+        assert dc.requests["kerberos"] == 3
+    clock.SKEW_CACHE_FILE.unlink(missing_ok=True)
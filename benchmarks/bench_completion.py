@@ -0,0 +1,108 @@
+"""
+Keystroke-to-menu latency of the interactive completer on a large workspace.
+
+Run with `pytest benchmarks/bench_completion.py -s`. Budgets can be relaxed
+with SEER_KEYSTROKE_BUDGET_MS (prefix hits) / SEER_FUZZY_BUDGET_MS (fuzzy
+fallback, which scans every username sharing the first letter).
+"""
+import os
+import statistics
+import time
+
+import pytest
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+KEYSTROKE_BUDGET_MS = float(os.getenv("SEER_KEYSTROKE_BUDGET_MS", "10"))
+FUZZY_BUDGET_MS = float(os.getenv("SEER_FUZZY_BUDGET_MS", "50"))
+N_USERS = 100_000
+
+
+@pytest.fixture
+def completer(workspace_factory):
+    workspace_factory(N_USERS)
+    from seerAD.shell import SeerCompleter
+    return SeerCompleter(os.getcwd)
+
+
+def complete(completer, text):
+    return list(completer.get_completions(Document(text), CompleteEvent(completion_requested=True)))
+
+
+def type_out(completer, prefix, word):
+    """Simulate typing `word` one key at a time after `prefix`; returns per-keystroke ms."""
+    timings = []
+    for i in range(1, len(word) + 1):
+        start = time.perf_counter()
+        complete(completer, prefix + word[:i])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def test_index_build(completer):
+    start = time.perf_counter()
+    assert len(complete(completer, "creds use ")) == 100
+    print(f"\ncold index build ({N_USERS} users): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def test_keystroke_latency_usernames(completer):
+    complete(completer, "creds use ")  # warm the index
+    timings = type_out(completer, "creds use ", "user04213")
+    p50, worst = statistics.median(timings), max(timings)
+    print(f"\nusername keystroke latency: p50 {p50:.2f} ms, max {worst:.2f} ms")
+    assert worst < KEYSTROKE_BUDGET_MS
+
+
+def test_keystroke_latency_fuzzy(completer):
+    complete(completer, "creds use ")
+    timings = type_out(completer, "creds use ", "u42139")
+    print(f"\nfuzzy keystroke latency: p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+    assert max(timings) < FUZZY_BUDGET_MS
+    assert [c.text for c in complete(completer, "creds use u42139")] == ["user042139"]
+
+
+def test_index_follows_changes(completer):
+    """Adds and deletes update the built indexes in place instead of rebuilding them."""
+    from seerAD.core.session import session
+    assert complete(completer, "creds use zz") == []
+    users, targets = completer.get_cred_users(), completer.get_target_labels()
+    start = time.perf_counter()
+    session.add_credential("t0", username="zzUser", domain="corp.local", password="x")
+    assert [c.text for c in complete(completer, "creds use zz")] == ["zzUser"]
+    print(f"\nadd + complete with {N_USERS} users indexed: {(time.perf_counter() - start) * 1000:.1f} ms")
+    session.delete_credential("t0", "ZZUSER")
+    session.add_target("zz-dc", "10.9.9.9")
+    assert complete(completer, "creds use zz") == []
+    assert [c.text for c in complete(completer, "target switch zz")] == ["zz-dc"]
+    assert completer.get_cred_users() is users and completer.get_target_labels() is targets
+    session.delete_target("zz-dc")
+    assert complete(completer, "target switch zz") == []
+
+
+def test_fuzzy_search_during_updates():
+    """The bus thread adds and discards words while the completion thread runs fuzzy searches."""
+    import threading
+    from seerAD.core.completion import PrefixIndex
+
+    index = PrefixIndex(f"user{i:06d}" for i in range(N_USERS))
+    stop, errors = threading.Event(), []
+
+    def search():
+        while not stop.is_set():
+            try:
+                assert index.search("u42139") == ["user042139"]
+            except Exception as e:  # an IndexError or a wrong hit from a half-updated index
+                errors.append(e)
+                return
+
+    worker = threading.Thread(target=search)
+    worker.start()
+    try:
+        for i in range(200):
+            index.add(f"user{i:04d}x")
+            index.discard(f"user{i:06d}")
+    finally:
+        stop.set()
+        worker.join()
+    assert not errors, errors[0]
+    assert index.search("u42139") == ["user042139"] and len(index) == N_USERS
@@ -0,0 +1,177 @@
+"""
+Microbenchmarks for the data layer: session and credential store, credential
+table rendering, completion and tool command assembly, on synthetic workspaces
+of 1k/10k/100k credentials and 10/100/1000 targets.
+
+Needs pytest-benchmark (`pip install -e .[bench]`). Save a run as JSON and
+compare it against an earlier commit's run:
+
+    pytest -c benchmarks/pytest.ini benchmarks/bench_data_layer.py --benchmark-autosave
+    pytest -c benchmarks/pytest.ini benchmarks/bench_data_layer.py --benchmark-compare --benchmark-compare-fail=median:20%
+
+or write one file with --benchmark-json=out.json. Skip the largest sizes with -k "not 100000".
+"""
+import io
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import write_workspace
+
+CRED_SIZES = (1_000, 10_000, 100_000)
+TARGET_SIZES = (10, 100, 1_000)
+RENDER_SIZES = (1_000, 10_000)  # a 100k-row table takes minutes per round and says nothing new
+
+_ids = itertools.count()
+
+
+@pytest.fixture
+def session_with(workspace_factory):
+    """Build a workspace and return the (fresh) session with the middle credential selected."""
+    def build(n_creds, n_targets=1):
+        workspace_factory(n_creds, n_targets)
+        from seerAD.core.session import session
+        if n_creds:
+            session.current_credential_index = n_creds // 2
+        return session
+    return build
+
+
+def _rounds(n_creds):
+    # Saves rewrite the whole credentials.json; keep the big sizes to a handful of rounds
+    return 5 if n_creds >= 100_000 else 20
+
+
+# === Session and credential store ===
+@pytest.mark.parametrize("n_targets", TARGET_SIZES)
+def test_session_load(benchmark, n_targets):
+    write_workspace(0, n_targets)
+    from seerAD.core.session import Session
+
+    session = benchmark(Session)
+    assert len(session.targets) == n_targets
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_credentials_load(benchmark, workspace_factory, n_creds):
+    workspace_factory(n_creds)
+    from seerAD.core.creds import CredentialManager
+
+    mgr = benchmark.pedantic(CredentialManager, args=("t0",), rounds=_rounds(n_creds), iterations=1)
+    assert len(mgr.credentials) == n_creds
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_add_credential(benchmark, workspace_factory, n_creds):
+    workspace_factory(n_creds)
+    from seerAD.core.creds import CredentialManager
+
+    mgr = CredentialManager("t0")
+    added = benchmark.pedantic(lambda: mgr.add_credential(username=f"new{next(_ids)}", password="x"),
+                               rounds=_rounds(n_creds), iterations=1)
+    assert added
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_update_credential(benchmark, workspace_factory, n_creds):
+    workspace_factory(n_creds)
+    from seerAD.core.creds import CredentialManager
+
+    mgr = CredentialManager("t0")
+    username = f"user{n_creds // 2:06d}"
+    updated = benchmark.pedantic(lambda: mgr.update_credential(username, password=f"p{next(_ids)}"),
+                                 rounds=_rounds(n_creds), iterations=1)
+    assert updated
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_current_credential(benchmark, session_with, n_creds):
+    session = session_with(n_creds)
+    cred = benchmark(lambda: session.current_credential)
+    assert cred["username"] == f"user{n_creds // 2:06d}"
+
+
+# === Rendering and completion ===
+@pytest.mark.parametrize("n_creds", RENDER_SIZES)
+def test_display_credentials(benchmark, session_with, monkeypatch, n_creds):
+    from rich.console import Console
+    import seerAD.cli.creds as creds_cli
+
+    session = session_with(n_creds)
+    creds = session.get_credentials()
+
+    def render():
+        monkeypatch.setattr(creds_cli, "console", Console(file=io.StringIO(), width=200, force_terminal=True))
+        creds_cli.display_credentials(creds)
+        return creds_cli.console.file.getvalue()
+
+    output = benchmark.pedantic(render, rounds=2 if n_creds >= 10_000 else 10, iterations=1)
+    assert "user000000" in output
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_complete_username(benchmark, session_with, n_creds):
+    from prompt_toolkit.completion import CompleteEvent
+    from prompt_toolkit.document import Document
+    from seerAD.shell import SeerCompleter
+
+    session_with(n_creds)
+    completer = SeerCompleter(os.getcwd)
+    document, event = Document("creds use user0004"), CompleteEvent(completion_requested=True)
+    list(completer.get_completions(document, event))  # build the index outside the timing
+
+    results = benchmark(lambda: list(completer.get_completions(document, event)))
+    assert results
+
+
+@pytest.mark.parametrize("n_targets", TARGET_SIZES)
+def test_complete_target(benchmark, session_with, n_targets):
+    from prompt_toolkit.completion import CompleteEvent
+    from prompt_toolkit.document import Document
+    from seerAD.shell import SeerCompleter
+
+    session_with(0, n_targets)
+    completer = SeerCompleter(os.getcwd)
+    document, event = Document("target switch t5"), CompleteEvent(completion_requested=True)
+    list(completer.get_completions(document, event))
+
+    results = benchmark(lambda: list(completer.get_completions(document, event)))
+    assert results
+
+
+# === Command assembly ===
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_impacket_command(benchmark, session_with, n_creds):
+    """What run_impacket does before spawning the tool: identity, resolve_flags, argv."""
+    from seerAD.tool_handler.impacket_helper import IMPACKET_TOOL_CONFIG, resolve_flags
+
+    session = session_with(n_creds)
+    session.update_credential("t0", f"user{n_creds // 2:06d}", ntlm="31d6cfe0d16ae931b73c59d7e0c089c0")
+    config = IMPACKET_TOOL_CONFIG["getuserspns"]
+
+    def assemble():
+        target, cred = session.current_target, session.current_credential
+        return ([config["target"]("ntlm", target, cred)]
+                + resolve_flags(config["auth"]["ntlm"], cred, target)
+                + resolve_flags(config["extra"], cred, target))
+
+    argv = benchmark(assemble)
+    assert ":31d6cfe0d16ae931b73c59d7e0c089c0" in argv
+
+
+@pytest.mark.parametrize("n_creds", CRED_SIZES)
+def test_nxc_command(benchmark, session_with, n_creds):
+    """What run_nxc does before spawning the tool."""
+    from seerAD.tool_handler.nxc_helper import build_auth_args_nxc, build_target_host, get_extra_args
+
+    session = session_with(n_creds)
+
+    def assemble():
+        auth_args, _ = build_auth_args_nxc("password", session.current_credential)
+        return ["nxc", "ldap", build_target_host("password")] + auth_args + get_extra_args("ldap")
+
+    argv = benchmark(assemble)
+    assert argv[4] == f"user{n_creds // 2:06d}"
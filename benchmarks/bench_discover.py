@@ -0,0 +1,73 @@
+"""
+`target discover` (core/discover.py) over a /24 of loopback addresses, against the
+listener stand-ins in fakeservices.py: two DCs, a member server, and a host whose
+LDAP port accepts but never answers.
+
+Run with `pytest benchmarks/bench_discover.py -s`. The budget can be relaxed with
+SEER_DISCOVER_BUDGET_S.
+"""
+import io
+import os
+import time
+
+import pytest
+from rich.console import Console
+
+from fakeservices import FakeNetwork
+
+BUDGET_S = float(os.getenv("SEER_DISCOVER_BUDGET_S", "5"))
+TIMEOUT_S = 0.5
+HOSTS = {
+    "127.0.0.10": {"services": ["kerberos", "ldap", "smb"], "fqdn": "dc01.corp.local", "domain": "corp.local"},
+    "127.0.0.11": {"services": ["kerberos", "ldap", "smb", "winrm"], "fqdn": "dc02.child.corp.local",
+                   "domain": "child.corp.local"},
+    "127.0.0.20": {"services": ["smb", "winrm", "mssql"], "fqdn": "sql01.corp.local", "domain": "corp.local"},
+    "127.0.0.30": {"services": ["kerberos", "silent-ldap"]},
+}
+
+
+@pytest.fixture(scope="module")
+def network():
+    with FakeNetwork(HOSTS) as net:
+        yield net
+
+
+def test_discover_slash24(network):
+    from seerAD.core.discover import discover
+
+    start = time.perf_counter()
+    hosts = discover("127.0.0.0/24", services=network.services, timeout=TIMEOUT_S, concurrency=512)
+    elapsed = time.perf_counter() - start
+    print(f"\n254 hosts x {len(network.services)} ports in {elapsed:.2f}s, {len(hosts)} up")
+
+    found = {h.ip: h for h in hosts}
+    assert list(found) == list(HOSTS)
+    dc01, dc02, sql, silent = (found[ip] for ip in HOSTS)
+    assert (dc01.fqdn, dc01.domain, dc01.netbios, dc01.is_dc) == ("dc01.corp.local", "corp.local", "DC01", True)
+    assert (dc02.hostname, dc02.domain, dc02.netbios_domain) == ("dc02", "child.corp.local", "CHILD")
+    assert dc02.open == ["kerberos", "ldap", "smb", "winrm"]
+    assert (sql.fqdn, sql.domain, sql.is_dc) == ("sql01.corp.local", "corp.local", False)  # from the NTLM challenge
+    assert silent.is_dc and silent.fqdn is None  # rootDSE timed out
+    assert elapsed < BUDGET_S
+
+
+def test_cli_adds_targets_in_one_write(network, workspace_factory, monkeypatch):
+    from seerAD.cli import target as target_cli
+    from seerAD.core import discover as discover_mod
+    from seerAD.core.session import session
+
+    workspace_factory(1, 2)  # t0 (current), t1 at 10.0.0.1
+    session.add_target("dc01", "127.0.0.10", domain="corp.local")  # already known: left alone
+    monkeypatch.setattr(discover_mod, "SERVICES", network.services)
+    output = io.StringIO()
+    monkeypatch.setattr(target_cli, "console", Console(file=output, width=200))
+
+    revision = session.revision
+    target_cli.target_discover("127.0.0.0/24", timeout=TIMEOUT_S, concurrency=512, dry_run=False)
+
+    assert session.revision == revision + 1
+    assert session.targets["dc02"].fqdn == "dc02.child.corp.local"
+    assert session.targets["sql01"].domain == "corp.local"
+    assert session.targets["127-0-0-30"].ip == "127.0.0.30"
+    assert "dc01 (exists)" in output.getvalue()
+    assert session.current_target_label == "t0"
@@ -0,0 +1,137 @@
+"""
+Attack graphs (core/graph.py, `graph import` / `graph path`): import time for a
+synthetic 200k-object BloodHound zip, and the latency of a path query on it.
+
+Run with `pytest benchmarks/bench_graph.py -s`. Budgets can be relaxed with
+SEER_GRAPH_IMPORT_BUDGET_S and SEER_GRAPH_PATH_BUDGET_MS.
+"""
+import io
+import json
+import os
+import time
+import zipfile
+
+from rich.console import Console
+
+IMPORT_BUDGET_S = float(os.getenv("SEER_GRAPH_IMPORT_BUDGET_S", "30"))
+PATH_BUDGET_MS = float(os.getenv("SEER_GRAPH_PATH_BUDGET_MS", "200"))
+
+DOMAIN_SID = "S-1-5-21-1000-2000-3000"
+DA_SID = f"{DOMAIN_SID}-512"
+
+
+def sid(rid):
+    return f"{DOMAIN_SID}-{rid}"
+
+
+def bloodhound_zip(path, n_users=150_000, n_groups=20_000, n_computers=30_000):
+    """
+    A SharpHound-shaped zip. Every user is in two groups, groups nest, computers have
+    local admins and sessions. One path is planted:
+    user000000 -MemberOf-> helpdesk -ForceChangePassword-> svc_backup -MemberOf-> backup ops
+    -AddMember-> DOMAIN ADMINS.
+    """
+    user_rid, group_rid, computer_rid = 100_000, 10_000, 400_000
+    helpdesk, backup_ops, svc_backup = sid(group_rid + 1), sid(group_rid + 2), sid(user_rid + n_users - 1)
+
+    def users():
+        for i in range(n_users):
+            aces = [{"PrincipalSID": sid(group_rid + 3 + i % (n_groups - 3)), "PrincipalType": "Group",
+                     "RightName": "GenericWrite", "IsInherited": False}] if i % 10 == 0 else []
+            if sid(user_rid + i) == svc_backup:
+                aces.append({"PrincipalSID": helpdesk, "PrincipalType": "Group",
+                             "RightName": "ForceChangePassword", "IsInherited": False})
+            yield {"ObjectIdentifier": sid(user_rid + i), "Aces": aces, "AllowedToDelegate": [],
+                   "HasSIDHistory": [], "SPNTargets": [],
+                   "Properties": {"name": f"USER{i:06d}@CORP.LOCAL", "domain": "CORP.LOCAL", "enabled": True,
+                                  "description": None, "samaccountname": f"user{i:06d}"}}
+
+    members = [[] for _ in range(n_groups)]
+    for u in range(n_users - 1):
+        members[3 + u % (n_groups - 3)].append(u)
+        members[3 + u * 7 % (n_groups - 3)].append(u)
+
+    def groups():
+        yield {"ObjectIdentifier": DA_SID, "Properties": {"name": "DOMAIN ADMINS@CORP.LOCAL"},
+               "Members": [{"ObjectIdentifier": sid(500), "ObjectType": "User"}],
+               "Aces": [{"PrincipalSID": backup_ops, "PrincipalType": "Group", "RightName": "AddMember",
+                         "IsInherited": False}]}
+        for g in range(1, n_groups):
+            listed = [{"ObjectIdentifier": sid(user_rid + u), "ObjectType": "User"} for u in members[g]]
+            if g > 3:
+                listed.append({"ObjectIdentifier": sid(group_rid + g // 2 + 3), "ObjectType": "Group"})
+            if g == 1:
+                listed = [{"ObjectIdentifier": sid(user_rid), "ObjectType": "User"}]
+            if g == 2:
+                listed = [{"ObjectIdentifier": svc_backup, "ObjectType": "User"}]
+            yield {"ObjectIdentifier": sid(group_rid + g), "Properties": {"name": f"GROUP{g:05d}@CORP.LOCAL"},
+                   "Members": listed, "Aces": []}
+
+    def computers():
+        for c in range(n_computers):
+            yield {"ObjectIdentifier": sid(computer_rid + c),
+                   "Properties": {"name": f"WS{c:05d}.CORP.LOCAL"},
+                   "LocalAdmins": {"Results": [{"ObjectIdentifier": sid(group_rid + 3 + c % 100), "ObjectType": "Group"}],
+                                   "Collected": True},
+                   "Sessions": {"Results": [{"UserSID": sid(user_rid + c * 5 % n_users),
+                                             "ComputerSID": sid(computer_rid + c)}], "Collected": True},
+                   "Aces": []}
+
+    def domains():
+        yield {"ObjectIdentifier": DOMAIN_SID, "Properties": {"name": "CORP.LOCAL"}, "Links": [],
+               "ChildObjects": [{"ObjectIdentifier": DA_SID, "ObjectType": "Group"}],
+               "Aces": [{"PrincipalSID": sid(group_rid + 5), "PrincipalType": "Group", "RightName": right,
+                         "IsInherited": False} for right in ("GetChanges", "GetChangesAll")]}
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, items in (("users", users()), ("groups", groups()), ("computers", computers()),
+                            ("domains", domains())):
+            with zf.open(f"20240501_{name}.json", "w") as raw:
+                out = io.TextIOWrapper(raw, encoding="utf-8")
+                out.write('{"data": [')
+                for n, item in enumerate(items):
+                    out.write(("," if n else "") + json.dumps(item))
+                out.write(f'], "meta": {{"type": "{name}", "count": 0, "version": 5}}}}')
+                out.flush()
+                out.detach()
+    return n_users + n_groups + n_computers + 1
+
+
+def test_import_and_path(workspace_factory, tmp_path, monkeypatch):
+    from seerAD.cli import graph as graph_cli
+    from seerAD.core.graph import EDGE_TYPES, Graph, graph_dir, import_bloodhound
+    from seerAD.core.session import session
+
+    workspace_factory(1)
+    zip_path = tmp_path / "bloodhound.zip"
+    n_objects = bloodhound_zip(zip_path)
+
+    start = time.perf_counter()
+    graph = import_bloodhound(zip_path)
+    graph.save(graph_dir("t0"))
+    imported = time.perf_counter() - start
+    print(f"\nimport: {n_objects:,} objects, {graph.edge_count:,} edges in {imported:.1f}s")
+    assert len(graph) >= n_objects
+    assert imported < IMPORT_BUDGET_S
+
+    start = time.perf_counter()
+    graph = Graph.load(graph_dir("t0"))
+    source, goals = graph.find("USER000000@CORP.LOCAL"), graph.find("DOMAIN ADMINS")
+    path = graph.shortest_path(source[0], goals)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    steps = [EDGE_TYPES[edge] for _, edge, _ in path]
+    print(f"path: {' -> '.join(steps)} (load + search {elapsed_ms:.0f} ms)")
+    assert [s for s in steps if s != "MemberOf"] == ["ForceChangePassword", "AddMember"]
+    assert elapsed_ms < PATH_BUDGET_MS
+
+    # DCSync needs both GetChanges and GetChangesAll
+    dcsync = [graph.names[s] for s, e, _ in graph.shortest_path(graph.find("GROUP00005")[0], graph.find("CORP.LOCAL"))]
+    assert dcsync == ["GROUP00005@CORP.LOCAL"]
+
+    session.current_credential_index = 0
+    output = io.StringIO()
+    monkeypatch.setattr(graph_cli, "console", Console(file=output, width=250))
+    graph_cli.graph_path(to="DOMAIN ADMINS", source=None, target=None)  # current credential is user000000
+    text = output.getvalue()
+    assert "abuse set_password password USER149999" in text
+    assert "abuse add_groupmember password 'DOMAIN ADMINS' user000000" in text
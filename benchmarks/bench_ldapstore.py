@@ -0,0 +1,124 @@
+"""
+Offline LDAP queries (core/ldapstore.py, `ldap import` / `ldap query`): import time
+for a synthetic 100k-object ldapdomaindump, and the latency of each question on it.
+
+Run with `pytest benchmarks/bench_ldapstore.py -s`. Budgets can be relaxed with
+SEER_LDAP_IMPORT_BUDGET_S and SEER_LDAP_QUERY_BUDGET_MS.
+"""
+import json
+import os
+import time
+
+import pytest
+
+IMPORT_BUDGET_S = float(os.getenv("SEER_LDAP_IMPORT_BUDGET_S", "30"))
+QUERY_BUDGET_MS = float(os.getenv("SEER_LDAP_QUERY_BUDGET_MS", "100"))
+
+DISABLED, NORMAL, TRUSTED_FOR_DELEGATION, DONT_REQ_PREAUTH = 0x2, 0x200, 0x80000, 0x400000
+WORKSTATION, SERVER = 0x1000, 0x2000
+DESCRIPTIONS = ["", "", "", "Sales", "IT support", "Shared mailbox", "Contractor - expires Q3", "Service account"]
+
+
+def ldapdomaindump_dir(path, n_users=90_000, n_computers=9_000, n_groups=1_000):
+    """
+    ldapdomaindump's JSON layout. Users: every 100th has an SPN, every 1000th is
+    AS-REP roastable, every 10th is disabled; user 4242 keeps its password in the
+    description. Computers: every 500th has unconstrained delegation, the first is a DC.
+    """
+    path.mkdir()
+    dn = "DC=corp,DC=local"
+
+    def attrs(i, sam, uac, **extra):
+        pwd = "2015-01-01 00:00:00+00:00" if i % 7 == 0 else "2099-01-01 00:00:00+00:00"
+        return dict({"sAMAccountName": [sam], "userAccountControl": [uac], "pwdLastSet": [pwd],
+                     "lastLogon": ["2024-05-01 10:00:00.123456+00:00"], "objectSid": [f"S-1-5-21-1-2-3-{1000 + i}"],
+                     "cn": [sam], "distinguishedName": [f"CN={sam},CN=Users,{dn}"]}, **extra)
+
+    users = []
+    for i in range(n_users):
+        uac = NORMAL | (DISABLED if i % 10 == 5 else 0) | (DONT_REQ_PREAUTH if i % 1000 == 1 else 0)
+        extra = {"description": [DESCRIPTIONS[i % len(DESCRIPTIONS)]] if DESCRIPTIONS[i % len(DESCRIPTIONS)] else []}
+        if i % 100 == 3:
+            extra["servicePrincipalName"] = [f"MSSQLSvc/sql{i}.corp.local:1433", f"HTTP/web{i}.corp.local"]
+        if i == 4242:
+            extra["description"] = ["temp password: Welcome2024!"]
+        users.append({"attributes": attrs(i, f"user{i:06d}", uac, **extra), "dn": f"CN=user{i:06d},CN=Users,{dn}"})
+    computers = []
+    for c in range(n_computers):
+        uac = (SERVER | TRUSTED_FOR_DELEGATION) if c == 0 else WORKSTATION | (TRUSTED_FOR_DELEGATION if c % 500 == 7 else 0)
+        computers.append({"attributes": attrs(c, f"WS{c:05d}$", uac, servicePrincipalName=[f"HOST/ws{c}.corp.local"]),
+                          "dn": f"CN=WS{c:05d},CN=Computers,{dn}"})
+    groups = [{"attributes": {"sAMAccountName": [f"group{g}"], "cn": [f"group{g}"], "description": ["Team"]},
+               "dn": f"CN=group{g},CN=Users,{dn}"} for g in range(n_groups)]
+    for name, items in (("domain_users", users), ("domain_computers", computers), ("domain_groups", groups)):
+        with open(path / f"{name}.json", "w") as f:
+            json.dump(items, f, indent=4)  # ldapdomaindump pretty-prints
+    return n_users + n_computers + n_groups
+
+
+@pytest.fixture(scope="module")
+def store(workspace_factory_module, tmp_path_factory):
+    from seerAD.core.ldapstore import LdapStore, import_dump, store_dir
+
+    workspace_factory_module(1)
+    dump = tmp_path_factory.mktemp("dump") / "ldapdomaindump"
+    n_objects = ldapdomaindump_dir(dump)
+    start = time.perf_counter()
+    import_dump(dump).save(store_dir("t0"))
+    elapsed = time.perf_counter() - start
+    print(f"\nimport: {n_objects:,} objects in {elapsed:.1f}s")
+    assert elapsed < IMPORT_BUDGET_S
+    return lambda: LdapStore(store_dir("t0"))
+
+
+@pytest.fixture(scope="module")
+def workspace_factory_module():
+    from conftest import reset_session, write_workspace
+
+    def build(n_creds):
+        loot = write_workspace(n_creds)
+        reset_session()
+        return loot
+    yield build
+    reset_session()
+
+
+QUESTIONS = [
+    ("kerberoastable", lambda s: s.kerberoastable(), 900),
+    ("asreproastable", lambda s: s.asreproastable(), 90),
+    ("unconstrained", lambda s: s.unconstrained(), 18),
+    ("stale", lambda s: s.stale(365), 11_572),
+    ("description regex", lambda s: s.description_regex(r"pass(word)?\s*[:=]"), 1),
+    ("description words", lambda s: s.description_words(["shared", "mailbox"]), 9_000),
+    ("spn service", lambda s: s.spn_service("mssqlsvc"), 900),
+    ("flag", lambda s: s.flag("DONT_REQ_PREAUTH"), 90),
+]
+
+
+@pytest.mark.parametrize("name,ask,expected", QUESTIONS, ids=[q[0] for q in QUESTIONS])
+def test_query_latency(store, name, ask, expected):
+    start = time.perf_counter()
+    ldap = store()  # cold: columns and indexes are read from disk by the query itself
+    bits = ask(ldap)
+    rows = ldap.rows(bits, limit=100)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{name}: {bin(bits).count('1')} matches in {elapsed_ms:.1f} ms")
+    assert bin(bits).count("1") == expected
+    assert rows
+    assert elapsed_ms < QUERY_BUDGET_MS
+
+
+def test_text_round_trip(tmp_path):
+    """Descriptions with backslashes, newlines and CRs come back exactly, next to one another on disk."""
+    from seerAD.core.ldapstore import LdapStore, _clean, _unclean, import_dump
+
+    texts = ["\\\\fs01\\new", "line one\nline two", "a\\nb", "trailing\\", "crlf\r\nend\r", "\\\\\\n\\r", ""]
+    assert [_unclean(_clean(t)) for t in texts] == texts
+    dump = tmp_path / "dump"
+    dump.mkdir()
+    users = [{"attributes": {"sAMAccountName": [f"u{i}"], "userAccountControl": [NORMAL], "description": [text]},
+              "dn": f"CN=u{i},CN=Users,DC=corp,DC=local"} for i, text in enumerate(texts)]
+    (dump / "domain_users.json").write_text(json.dumps(users))
+    import_dump(dump).save(tmp_path / "store")
+    store = LdapStore(tmp_path / "store")
+    assert [row["description"] for row in store.rows((1 << len(texts)) - 1)] == texts
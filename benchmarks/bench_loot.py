@@ -0,0 +1,163 @@
+"""
+Indexing throughput and search latency of the tool output archive (core/loot.py).
+
+Run with `pytest benchmarks/bench_loot.py -s`. The search budget can be relaxed
+with SEER_LOOT_SEARCH_BUDGET_MS; the archive size with SEER_LOOT_BENCH_LINES.
+"""
+import io
+import os
+import statistics
+import time
+
+import pytest
+from rich.console import Console
+
+import faketool
+
+SEARCH_BUDGET_MS = float(os.getenv("SEER_LOOT_SEARCH_BUDGET_MS", "50"))
+N_LINES = int(os.getenv("SEER_LOOT_BENCH_LINES", "500000"))
+N_TARGETS, RUNS_PER_TARGET = 5, 10
+MODULES = ("nxc ldap", "nxc smb", "GetADUsers", "bloodyAD get search", "certipy find")
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    """N_LINES of synthetic LDAP-ish output over 5 targets x 10 runs, indexed run by run."""
+    from seerAD.core.loot import LOOT_DB, index_run
+
+    LOOT_DB.unlink(missing_ok=True)
+    out_dir = tmp_path_factory.mktemp("output")
+    per_run = N_LINES // (N_TARGETS * RUNS_PER_TARGET)
+    total, elapsed, i = 0, 0.0, 0
+    for t in range(N_TARGETS):
+        for r in range(RUNS_PER_TARGET):
+            path = out_dir / f"t{t}-{r}.log"
+            with open(path, "w") as f:
+                for _ in range(per_run):
+                    f.write(f"LDAP 10.0.{t}.1 389 DC0{t} user{i:07d} description: Summer{i % 9973}! "
+                            f"memberOf: group{i % 500} objectSid: S-1-5-21-111-222-333-{1000 + i}\n")
+                    i += 1
+            start = time.perf_counter()
+            total += index_run(path, module=MODULES[r % len(MODULES)], target=f"t{t}", cred=f"user{r:02d}")
+            elapsed += time.perf_counter() - start
+    print(f"\nindexed {total} lines in {elapsed:.1f}s ({total / elapsed:,.0f} lines/s), "
+          f"index {LOOT_DB.stat().st_size / 2**20:.0f} MiB")
+    yield total
+    LOOT_DB.unlink(missing_ok=True)
+
+
+QUERIES = [
+    ("user0123456", {}),
+    ("Summer42*", {"target": "t3"}),
+    ("group7 AND description", {"module": "ldap"}),
+    ("S-1-5-21-111-222-333-1500", {}),
+    ("corp.local\\svc_*", {}),  # not FTS syntax: searched as a phrase
+    ("memberOf", {"target": "t1", "module": "GetADUsers", "cred": "user02"}),
+]
+
+
+@pytest.mark.parametrize("query,filters", QUERIES)
+def test_search_latency(archive, query, filters):
+    from seerAD.core.loot import search
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        hits = search(query, limit=50, **filters)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"\n{query!r} {filters}: {len(hits)} hits, median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms")
+    assert max(timings) < SEARCH_BUDGET_MS
+    for hit in hits:
+        for column, value in filters.items():
+            assert value in hit[column]
+
+
+def test_search_finds_exact_line(archive):
+    from seerAD.core.loot import HIT_START, search
+
+    [hit] = search("user0123456")
+    assert f"{HIT_START}user0123456" in hit["snippet"]
+    assert hit["lineno"] == 123456 % (N_LINES // (N_TARGETS * RUNS_PER_TARGET)) + 1
+
+
+def test_run_tool_output_is_indexed(workspace_factory, tmp_path, monkeypatch):
+    """A tool run through run_tool lands in the target's output dir and is searchable right away."""
+    from seerAD.core.loot import LOOT_DB, search
+    from seerAD.tool_handler import helper
+
+    workspace_factory(1)
+    LOOT_DB.unlink(missing_ok=True)
+    bin_dir = faketool.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("SEER_FAKE_LINES", "20")
+    monkeypatch.setattr(helper, "console", Console(file=io.StringIO()))
+
+    assert helper.run_tool(["nxc", "ldap", "10.0.0.0"]) == 0
+    [hit] = search("user000013", target="t0")
+    assert hit["module"] == "nxc"  # no helper around this call
+    assert hit["path"].endswith("-nxc.log.gz") and "/t0/output/" in hit["path"]
+
+    monkeypatch.setenv("SEER_TELEMETRY", "0")  # the module comes from the helper, not its span
+    with helper.tool_module("nxc ldap"):
+        helper.run_tool(["nxc", "ldap", "10.0.0.0"])
+    assert [hit["module"] for hit in search("user000013", target="t0")] == ["nxc ldap", "nxc"]
+    LOOT_DB.unlink(missing_ok=True)
+
+
+def test_index_keeps_no_text(tmp_path):
+    """Only the output file holds the lines: the index returns no text of its own."""
+    from seerAD.core.loot import LOOT_DB, connect, index_run, search
+
+    LOOT_DB.unlink(missing_ok=True)
+    path = tmp_path / "run.log"
+    path.write_text("SMB 10.0.0.1 445 DC01 [+] corp.local\\svc_sql:Winter2026!\n" * 3)
+    index_run(path, module="nxc smb", target="t0", cred="svc_sql")
+    conn = connect()
+    assert conn.execute("SELECT text FROM line_index WHERE line_index MATCH 'Winter2026'").fetchall() == [(None,)] * 3
+    conn.close()
+
+    hits = search("Winter2026", module="smb")
+    assert [hit["lineno"] for hit in hits] == [3, 2, 1]
+    assert "\x02Winter2026\x03!" in hits[0]["snippet"]
+    LOOT_DB.unlink(missing_ok=True)
+
+
+def test_deleted_target_leaves_no_hits(workspace_factory):
+    """Deleting a target drops its runs, indexed lines, facts and services from loot.db."""
+    import gzip
+
+    from seerAD.config import LOOT_DIR
+    from seerAD.core import services
+    from seerAD.core.facts import query_facts, write_facts
+    from seerAD.core.loot import LOOT_DB, connect, index_run, search
+    from seerAD.core.session import session
+
+    workspace_factory(1, 3)
+    LOOT_DB.unlink(missing_ok=True)
+    for label in ("t0", "t1", "t2"):
+        path = LOOT_DIR / label / "output" / "run.log.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(gzip.compress(f"SMB {label} 445 DC01 [+] corp.local\\svc_sql:Winter2026!\n".encode() * 3))
+        index_run(path, module="nxc smb", target=label, cred="svc_sql")
+        write_facts(label, "nxc smb", [{"type": "user", "key": "svc_sql", "user": "svc_sql"}])
+        services.record([(label, "10.0.0.1", 445, "tcp", "open", "microsoft-ds", None)], "probe")
+
+    assert session.delete_target("t1")
+    assert [(hit["target"], hit["lineno"]) for hit in search("Winter2026", target="t0")] == [("t0", 3), ("t0", 2), ("t0", 1)]
+    assert {hit["target"] for hit in search("Winter2026")} == {"t0", "t2"}
+    conn = connect()
+    assert conn.execute("SELECT count(*) FROM line_index WHERE line_index MATCH 'Winter2026'").fetchone() == (6,)
+    conn.close()
+    assert sorted(f["target"] for f in query_facts()) == ["t0", "t2"]
+    assert services.inventory("t1") == {} and 445 in services.inventory("t0")
+
+    # t2's output is already gone, so its lines stay in the index: later runs must not take its run id
+    (LOOT_DIR / "t2" / "output" / "run.log.gz").unlink()
+    assert session.delete_target("t2")
+    for name in ("a", "b"):
+        path = LOOT_DIR / "t0" / "output" / f"{name}.log"
+        path.write_text("nothing to see\n")
+        index_run(path, module="nxc smb", target="t0")
+    assert {hit["target"] for hit in search("Winter2026")} == {"t0"}
+    assert all(hit["snippet"] for hit in search("Winter2026"))
+    LOOT_DB.unlink(missing_ok=True)
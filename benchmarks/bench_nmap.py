@@ -0,0 +1,181 @@
+"""
+`target import` of an nmap XML scan (core/nmap.py): a synthetic ~50 MB `-sV -sC` scan of
+/16 worth of hosts (DCs, member servers, down hosts) is streamed into targets and the
+service inventory.
+
+Run with `pytest benchmarks/bench_nmap.py -s`. The budget can be relaxed with
+SEER_NMAP_IMPORT_BUDGET_S; SEER_NMAP_MB sets the scan size.
+"""
+import io
+import os
+import time
+import tracemalloc
+
+import pytest
+from rich.console import Console
+
+IMPORT_BUDGET_S = float(os.getenv("SEER_NMAP_IMPORT_BUDGET_S", "30"))
+SCAN_MB = float(os.getenv("SEER_NMAP_MB", "50"))
+PEAK_MB = 8
+
+PORT = ('<port protocol="tcp" portid="{port}"><state state="open" reason="syn-ack" reason_ttl="127"/>'
+        '<service name="{name}" product="{product}" {extra}method="probed" conf="10"/>{scripts}</port>\n')
+NTLM_INFO = ('<script id="rdp-ntlm-info" output="&#xa;  Target_Name: CORP&#xa;  NetBIOS_Domain_Name: CORP&#xa;'
+             '  NetBIOS_Computer_Name: {host}&#xa;  DNS_Domain_Name: corp.local&#xa;  DNS_Computer_Name: {host}.corp.local&#xa;'
+             '  Product_Version: 10.0.17763&#xa;  System_Time: 2026-10-19T10:00:00+00:00&#xa;">'
+             '<elem key="Target_Name">CORP</elem><elem key="NetBIOS_Domain_Name">CORP</elem>'
+             '<elem key="NetBIOS_Computer_Name">{host}</elem><elem key="DNS_Domain_Name">corp.local</elem>'
+             '<elem key="DNS_Computer_Name">{host}.corp.local</elem><elem key="DNS_Tree_Name">corp.local</elem>'
+             '<elem key="Product_Version">10.0.17763</elem><elem key="System_Time">2026-10-19T10:00:00+00:00</elem></script>')
+SSL_CERT = ('<script id="ssl-cert" output="Subject: commonName={host}.corp.local&#xa;Not valid before: 2026-01-01T00:00:00'
+            '&#xa;Not valid after:  2027-01-01T00:00:00"><table key="subject"><elem key="commonName">{host}.corp.local</elem>'
+            '</table><table key="pubkey"><elem key="type">rsa</elem><elem key="bits">2048</elem></table>'
+            '<elem key="sig_algo">sha256WithRSAEncryption</elem></script>')
+DC_PORTS = [
+    (53, "domain", "Simple DNS Plus", ""), (88, "kerberos-sec", "Microsoft Windows Kerberos", 'extrainfo="server time: 2026-10-19 10:00:00Z" '),
+    (135, "msrpc", "Microsoft Windows RPC", ""), (139, "netbios-ssn", "Microsoft Windows netbios-ssn", ""),
+    (389, "ldap", "Microsoft Windows Active Directory LDAP", 'extrainfo="Domain: corp.local0., Site: Default-First-Site-Name" '),
+    (445, "microsoft-ds", "", ""), (464, "kpasswd5", "", ""), (593, "ncacn_http", "Microsoft Windows RPC over HTTP", 'version="1.0" '),
+    (636, "ssl/ldap", "Microsoft Windows Active Directory LDAP", 'extrainfo="Domain: corp.local0., Site: Default-First-Site-Name" '),
+    (3268, "ldap", "Microsoft Windows Active Directory LDAP", 'extrainfo="Domain: corp.local0., Site: Default-First-Site-Name" '),
+    (3389, "ms-wbt-server", "Microsoft Terminal Services", ""), (5985, "http", "Microsoft HTTPAPI httpd", 'version="2.0" '),
+]
+MEMBER_PORTS = [(135, "msrpc", "Microsoft Windows RPC", ""), (139, "netbios-ssn", "Microsoft Windows netbios-ssn", ""),
+                (445, "microsoft-ds", "", ""), (1433, "ms-sql-s", "Microsoft SQL Server 2019", 'version="15.00.2000.00" '),
+                (3389, "ms-wbt-server", "Microsoft Terminal Services", ""), (5985, "http", "Microsoft HTTPAPI httpd", 'version="2.0" ')]
+HOSTSCRIPT = ('<hostscript><script id="smb2-time" output="&#xa;  date: 2026-10-19T10:00:00&#xa;  start_date: N/A"><elem key="date">'
+              '2026-10-19T10:00:00</elem><elem key="start_date">N/A</elem></script><script id="smb2-security-mode" output="&#xa;'
+              '  3:1:1: &#xa;    Message signing enabled and required"><table key="3:1:1"><elem>Message signing enabled and required'
+              '</elem></table></script></hostscript>\n')
+
+
+def ip_of(n: int) -> str:
+    return f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256 or 1}"
+
+
+def is_dc(n: int) -> bool:
+    return n % 500 == 0
+
+
+def is_down(n: int) -> bool:
+    return n % 7 == 3 and not is_dc(n)
+
+
+def host_xml(n: int) -> str:
+    ip = ip_of(n)
+    if is_down(n):
+        return (f'<host><status state="down" reason="no-response" reason_ttl="0"/><address addr="{ip}" addrtype="ipv4"/>'
+                '<hostnames></hostnames></host>\n')
+    dc = is_dc(n)
+    name = f"DC{n:05d}" if dc else f"SRV{n:05d}"
+    ports = []
+    for port, svc, product, extra in DC_PORTS if dc else MEMBER_PORTS:
+        scripts = NTLM_INFO.format(host=name) + SSL_CERT.format(host=name) if port == 3389 else ""
+        ports.append(PORT.format(port=port, name=svc, product=product, extra=extra, scripts=scripts))
+    return (f'<host starttime="1760868000" endtime="1760868100"><status state="up" reason="echo-reply" reason_ttl="127"/>\n'
+            f'<address addr="{ip}" addrtype="ipv4"/>\n<hostnames>\n</hostnames>\n<ports><extraports state="filtered" count="988">'
+            f'<extrareasons reason="no-response" count="988" proto="tcp" ports="1-52,54-87"/></extraports>\n'
+            + "".join(ports) + "</ports>\n<os></os>\n" + HOSTSCRIPT
+            + '<times srtt="1000" rttvar="500" to="100000"/>\n</host>\n')
+
+
+def write_scan(path, megabytes: float) -> int:
+    """An nmap -oX file of about `megabytes`; returns the number of hosts written."""
+    limit = int(megabytes * 1024 * 1024)
+    n = written = 0
+    with open(path, "w") as f:
+        written += f.write('<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE nmaprun>\n'
+                           '<nmaprun scanner="nmap" args="nmap -sC -sV -oA corp 10.0.0.0/16" start="1760868000" version="7.94">\n'
+                           '<scaninfo type="syn" protocol="tcp" numservices="1000" services="1-65535"/>\n')
+        while written < limit:
+            n += 1
+            written += f.write(host_xml(n))
+        f.write('<runstats><finished time="1760869000" exit="success"/><hosts up="1" down="0" total="1"/></runstats>\n</nmaprun>\n')
+    return n
+
+
+@pytest.fixture(scope="module")
+def scan(tmp_path_factory):
+    path = tmp_path_factory.mktemp("nmap") / "corp.xml"
+    count = write_scan(path, SCAN_MB)
+    return path, count
+
+
+def test_parse_constant_memory(tmp_path):
+    """Peak Python memory of reading a scan does not grow with its size."""
+    from seerAD.core.nmap import iter_hosts
+
+    path = tmp_path / "small.xml"
+    write_scan(path, 5)
+    tracemalloc.start()
+    hosts = sum(1 for _ in iter_hosts(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n5 MB scan, {hosts} up hosts: peak {peak / 1e6:.2f} MB")
+    assert peak < PEAK_MB * 1e6
+
+
+def test_hosts_are_named(tmp_path):
+    from seerAD.core.nmap import iter_hosts
+
+    path = tmp_path / "tiny.xml"
+    write_scan(path, 2)
+    hosts = {h.ip: h for h in iter_hosts(path)}
+    dc, member = hosts[ip_of(500)], hosts[ip_of(1)]
+    assert (dc.fqdn, dc.domain, dc.netbios, dc.netbios_domain, dc.is_dc) == ("DC00500.corp.local", "corp.local", "DC00500", "CORP", True)
+    assert (member.fqdn, member.domain, member.is_dc) == ("SRV00001.corp.local", "corp.local", False)
+    assert (1433, "tcp", "open", "ms-sql-s", "Microsoft SQL Server 2019 15.00.2000.00") in member.ports
+    assert ip_of(3) not in hosts  # down
+    assert member.seen == 1760868100  # the host's endtime, not the import
+
+
+def test_scan_time_is_kept(tmp_path, workspace_factory):
+    """Imported rows carry the scan's time: an old scan is not fresh, and does not overwrite a newer probe."""
+    from seerAD.cli.target import add_found_hosts
+    from seerAD.core import services
+    from seerAD.core.nmap import iter_hosts
+
+    workspace_factory(1)
+    path = tmp_path / "old.xml"
+    path.write_text('<?xml version="1.0"?>\n<nmaprun scanner="nmap" start="1700000000">\n'
+                    + host_xml(1).replace(' starttime="1760868000" endtime="1760868100"', "")
+                    + host_xml(2)
+                    + host_xml(4).replace(' starttime="1760868000" endtime="1760868100"', "") + "</nmaprun>\n")
+    first, second, third = iter_hosts(path)
+    assert (first.seen, second.seen) == (1700000000, 1760868100)  # no host times: the scan's start
+    assert third.seen == 1700000000  # still known after earlier hosts were cleared from the tree
+
+    services.record([("srv00002", ip_of(2), 445, "tcp", "closed", None, None)], "probe")
+    add_found_hosts([first, second], "nmap")
+    rows = {row["target"]: row for row in services.open_services(port=1433)}
+    assert rows["srv00001"]["updated"] == 1700000000 and rows["srv00002"]["updated"] == 1760868100
+    assert services.inventory("srv00001", max_age=services.SERVICE_TTL) == {}  # stale: probed before use
+    assert services.inventory("srv00002")[445]["state"] == "closed"  # the probe is newer than the scan
+
+
+def test_import_50mb(scan, workspace_factory, monkeypatch):
+    from seerAD.cli import target as target_cli
+    from seerAD.core import services
+    from seerAD.core.session import session
+
+    path, count = scan
+    workspace_factory(1)
+    output = io.StringIO()
+    monkeypatch.setattr(target_cli, "console", Console(file=output, width=200))
+    revision = session.revision
+
+    start = time.perf_counter()
+    target_cli.target_import(str(path), dry_run=False)
+    elapsed = time.perf_counter() - start
+    up = sum(not is_down(n) for n in range(1, count + 1))
+    dcs = sum(is_dc(n) for n in range(1, count + 1))
+    print(f"\n{path.stat().st_size / 1e6:.0f} MB, {count:,} hosts ({up:,} up) imported in {elapsed:.1f}s")
+
+    assert session.revision == revision + 1  # one session write for every target
+    assert len(session.targets) == up + 1
+    assert session.targets["dc00500"].fqdn == "DC00500.corp.local"
+    assert f"Added {up} target(s) ({dcs} DC)" in output.getvalue()
+    sql = services.open_services(name="ms-sql")
+    assert len(sql) == min(1000, up - dcs) and sql[0]["source"] == "nmap" and sql[0]["updated"] == 1760868100
+    assert [r["port"] for r in services.open_services(target="dc00500", port=3268)] == [3268]
+    assert elapsed < IMPORT_BUDGET_S
@@ -0,0 +1,188 @@
+"""
+Tool output parsers (core/parsers.py) and the facts stage (core/facts.py): the records
+each parser makes from real-shaped output, how found credentials are merged into the
+workspace, and the parse rate on the reader thread.
+
+Run with `pytest benchmarks/bench_parsers.py -s`. The rate budget can be relaxed with
+SEER_PARSE_BUDGET_LPS.
+"""
+import os
+import time
+
+import pytest
+
+PARSE_BUDGET_LPS = float(os.getenv("SEER_PARSE_BUDGET_LPS", "50000"))
+NXC = "SMB         10.0.0.1        445    DC01             "
+NT = "31d6cfe0d16ae931b73c59d7e0c089c0"
+LM = "aad3b435b51404eeaad3b435b51404ee"
+
+
+def parse(module, lines):
+    from seerAD.core.parsers import parsers_for
+
+    parsers = parsers_for(module)
+    records = [r for line in lines for parser in parsers for r in parser.feed(line + "\n")]
+    return records + [r for parser in parsers for r in parser.end()]
+
+
+def of_type(records, type_):
+    return {r["key"]: r for r in records if r["type"] == type_}
+
+
+def impacket_table(columns, rows):
+    """Lines of an impacket fixed-width table: header, dashes, rows, then a blank line."""
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(columns)]
+    line = lambda cells: "  ".join(cell.ljust(width) for cell, width in zip(cells, widths))
+    return [line(columns), line("-" * width for width in widths), *map(line, rows), ""]
+
+
+@pytest.mark.parametrize("rest, secret_type, secret, admin", [
+    ("[+] corp.local\\alice:Summer 2024! (Pwn3d!)", "password", "Summer 2024!", True),
+    ("[+] corp.local\\alice:Summer 2024!", "password", "Summer 2024!", None),
+    ("[+] corp.local\\alice:p (x) y", "password", "p (x) y", None),
+    (f"[+] corp.local\\alice:{NT.upper()} (Pwn3d!)", "ntlm", NT, True),
+    (f"[+] corp.local\\alice:{LM}:{NT}", "ntlm", NT, None),
+    ("[+] corp.local\\alice:******** (Pwn3d!)", None, None, True),
+    ("[+] corp.local\\alice: (Guest)", None, None, None),
+    ("[+] corp.local\\alice from ccache", None, None, None),
+])
+def test_nxc_login(rest, secret_type, secret, admin):
+    login, = parse("nxc smb", [NXC + rest])
+    assert login["key"] == "corp.local\\alice|10.0.0.1|smb"
+    assert (login["user"], login["domain"], login["proto"]) == ("alice", "corp.local", "SMB")
+    assert (login.get("secret_type"), login.get("secret"), login.get("admin")) == (secret_type, secret, admin)
+
+
+def test_nxc_shares():
+    shares = of_type(parse("nxc smb", [NXC + line for line in (
+        "[*] Enumerated shares",
+        "Share           Permissions     Remark",
+        "-----           -----------     ------",
+        "ADMIN$                          Remote Admin",
+        "IPC$            READ            Remote IPC",
+        "SYSVOL          READ,WRITE      Logon server share",
+        "[*] Done",
+        "Backup          READ            outside the table",
+    )]), "share")
+    assert list(shares) == ["10.0.0.1|admin$", "10.0.0.1|ipc$", "10.0.0.1|sysvol"]
+    assert "access" not in shares["10.0.0.1|admin$"] and shares["10.0.0.1|admin$"]["remark"] == "Remote Admin"
+    assert (shares["10.0.0.1|sysvol"]["access"], shares["10.0.0.1|sysvol"]["remark"]) == ("READ,WRITE", "Logon server share")
+
+
+def test_nxc_users():
+    users = of_type(parse("nxc smb", [NXC + line for line in (
+        "-Username-                    -Last PW Set-       -BadPW- -Description-",
+        "Administrator                 2024-01-01 10:00:00 0       Built-in account for administering the computer/domain",
+        "krbtgt                        <never>             0       Key Distribution Center Service Account",
+        "svc_sql                       2024-03-04 05:06:07 2",
+    )]), "user")
+    assert list(users) == ["administrator", "krbtgt", "svc_sql"]
+    assert users["krbtgt"]["description"] == "Key Distribution Center Service Account"
+    assert "description" not in users["svc_sql"] and users["svc_sql"]["source"] == "10.0.0.1"
+
+
+def test_impacket_tables():
+    spns = parse("GetUserSPNs", ["Impacket v0.12.0 - Copyright Fortra, LLC and its affiliated companies", ""]
+                 + impacket_table(
+        ["ServicePrincipalName", "Name", "MemberOf", "PasswordLastSet", "LastLogon", "Delegation"],
+        [["MSSQLSvc/sql01.corp.local:1433", "svc_sql", "CN=SQL Admins,CN=Users,DC=corp,DC=local",
+          "2024-01-01 10:00:00.000000", "<never>", ""],
+         ["HTTP/web01.corp.local", "svc web", "", "2024-01-01 10:00:00.000000", "<never>", "unconstrained"]]))
+    assert of_type(spns, "user")["svc_sql"]["spn"] == "MSSQLSvc/sql01.corp.local:1433"
+    assert of_type(spns, "user")["svc web"]["spn"] == "HTTP/web01.corp.local"  # a space inside a column
+    assert of_type(spns, "group") == {"sql admins": {"group": "SQL Admins", "member": "svc_sql",
+                                                     "type": "group", "key": "sql admins"}}
+
+    users = parse("GetADUsers", ["[*] Querying DC01 for information about domain."] + impacket_table(
+        ["Name", "Email", "PasswordLastSet", "LastLogon"],
+        [["Administrator", "", "2024-01-01 10:00:00.000000", "2024-06-01 09:00:00.000000"],
+         ["alice", "alice@corp.local", "2024-02-02 10:00:00.000000", "<never>"]]))
+    assert [(r["user"], r.get("email")) for r in users] == [("Administrator", None), ("alice", "alice@corp.local")]
+
+
+def test_secretsdump():
+    hashes = of_type(parse("secretsdump", [
+        "[*] Dumping Domain Credentials (domain\\uid:rid:lmhash:nthash)",
+        f"Administrator:500:{LM}:{NT.upper()}:::",
+        f"corp.local\\svc_sql:1105:{LM}:8846f7eaee8fb117ad06bdd830b7586c:::",
+        "[*] Kerberos keys grabbed",
+        "corp.local\\svc_sql:aes256-cts-hmac-sha1-96:" + "ab" * 32,
+    ]), "hash")
+    assert list(hashes) == [f"administrator|{NT}", "corp.local\\svc_sql|8846f7eaee8fb117ad06bdd830b7586c"]
+    assert (hashes[f"administrator|{NT}"]["rid"], hashes[f"administrator|{NT}"]["ntlm"]) == (500, NT)
+    assert hashes["corp.local\\svc_sql|8846f7eaee8fb117ad06bdd830b7586c"]["domain"] == "corp.local"
+
+
+def test_bloodyad_blocks():
+    records = parse("bloodyAD", [
+        "distinguishedName: CN=alice,CN=Users,DC=corp,DC=local",
+        "objectClass: top; person; organizationalPerson; user",
+        "objectSid: S-1-5-21-1-2-3-1104",
+        "sAMAccountName: alice",
+        "description: Helpdesk: level 2",
+        "",
+        "distinguishedName: CN=Domain Admins,CN=Users,DC=corp,DC=local",
+        "objectClass: top; group",
+        "objectSid: S-1-5-21-1-2-3-512",
+        "sAMAccountName: Domain Admins",  # the last block has no blank line after it
+    ])
+    assert of_type(records, "user")["alice"]["description"] == "Helpdesk: level 2"
+    assert of_type(records, "group")["domain admins"]["dn"] == "CN=Domain Admins,CN=Users,DC=corp,DC=local"
+    assert {r["sid"]: r["kind"] for r in records if r["type"] == "sid"} == {
+        "S-1-5-21-1-2-3-1104": "user", "S-1-5-21-1-2-3-512": "group"}
+
+
+def test_merge_credentials_only_fills(workspace_factory):
+    """Known users keep what they have; only empty fields are filled, and new users are added."""
+    from seerAD.core.session import session
+
+    workspace_factory(2)
+    found = [{"username": "USER000000", "domain": "corp.local", "password": "other", "ntlm": NT},
+             {"username": "alice", "domain": "corp.local", "password": "Summer 2024!"}]
+    assert session.merge_credentials("t0", found) == (1, 1)
+    known, = session.get_credentials("t0", "user000000")
+    assert (known["username"], known["password"], known["ntlm"]) == ("user000000", "Passw0rd0", NT)
+    assert session.get_credentials("t0", "alice")[0]["password"] == "Summer 2024!"
+    assert session.merge_credentials("t0", found) == (0, 0)  # nothing left to fill
+
+
+def test_found_credentials_are_added(workspace_factory):
+    """The run_tool stage: facts are stored, and logins with a secret and dumped hashes become credentials."""
+    from seerAD.core.facts import FactCollector, query_facts
+    from seerAD.core.loot import LOOT_DB
+    from seerAD.core.session import session
+
+    workspace_factory(1)
+    LOOT_DB.unlink(missing_ok=True)
+    collector = FactCollector("t0", "nxc smb")
+    for line in (f"{NXC}[+] corp.local\\alice:Summer 2024! (Pwn3d!)",
+                 f"{NXC}[+] corp.local\\bob:******** ",
+                 f"{NXC}[+] Dumping SAM hashes",
+                 f"{NXC}svc_sql:1105:{LM}:8846f7eaee8fb117ad06bdd830b7586c:::",
+                 f"{NXC}[+] corp.local\\user000000:Changed1"):
+        collector.feed(line + "\n")
+    collector.close()
+
+    assert (collector.creds_added, collector.creds_updated) == (2, 0)  # user000000 keeps its password
+    creds = {c["username"]: c for c in session.get_credentials("t0")}
+    assert sorted(creds) == ["alice", "svc_sql", "user000000"]
+    assert creds["alice"]["password"] == "Summer 2024!" and creds["svc_sql"]["ntlm"] == "8846f7eaee8fb117ad06bdd830b7586c"
+    assert creds["user000000"]["password"] == "Passw0rd0"
+    logins = {f["key"]: f["data"] for f in query_facts("t0", "valid-login")}
+    assert logins["corp.local\\alice|10.0.0.1|smb"]["admin"] is True and "secret" not in logins["corp.local\\bob|10.0.0.1|smb"]
+    LOOT_DB.unlink(missing_ok=True)
+
+
+def test_parse_rate():
+    from seerAD.core.parsers import parsers_for
+
+    lines = [f"{NXC}[+] corp.local\\user{i:06d}:Passw0rd {i} (Pwn3d!)\n" if i % 10 == 0 else
+             f"{NXC}user{i:06d}                    2024-01-01 10:00:00 0       Synthetic account {i}\n"
+             for i in range(100_000)]
+    parsers = parsers_for("nxc smb")
+    start = time.perf_counter()
+    found = sum(len(parser.feed(line)) for line in lines for parser in parsers)
+    rate = len(lines) / (time.perf_counter() - start)
+    print(f"\nnxc parse rate: {rate:,.0f} lines/s")
+    assert found == len(lines)
+    assert rate > PARSE_BUDGET_LPS
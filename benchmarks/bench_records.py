@@ -0,0 +1,106 @@
+"""
+Record diffs between runs (core/records.py, `enum ... --diff`): the time to split,
+hash and diff 100k-line outputs, and that it grows linearly with the output.
+
+Run with `pytest benchmarks/bench_records.py -s`. The budget for 100k lines can be
+relaxed with SEER_DIFF_BUDGET_S.
+"""
+import io
+import os
+import shutil
+import time
+
+import pytest
+from rich.console import Console
+
+import faketool
+
+DIFF_BUDGET_S = float(os.getenv("SEER_DIFF_BUDGET_S", "2"))
+
+
+def ldap_lines(n, start=0):
+    return [f"LDAP 10.0.0.1 389 DC01 user{i:07d} 2024-05-0{i % 9 + 1} 12:00:00 memberOf: group{i % 500}\n"
+            for i in range(start, start + n)]
+
+
+def diff_run(lines, label="t0"):
+    """One run's worth of lines through the stage, as run_tool would feed it. Returns (stage, seconds)."""
+    from seerAD.core.records import RecordSnapshot
+
+    start = time.perf_counter()
+    stage = RecordSnapshot(label, "GetADUsers", "alice")
+    for line in lines:
+        stage.feed(line)
+    stage.returncode = 0
+    stage.close()
+    return stage, time.perf_counter() - start
+
+
+@pytest.mark.parametrize("n", [100_000])
+def test_diff_is_linear(workspace_factory, n):
+    workspace_factory(1)
+    timings = {}
+    for size in (n, 2 * n):
+        diff_run(ldap_lines(size), label=f"t0-{size}")  # baseline
+        # next run: first 1% gone, 1% new at the end
+        lines = ldap_lines(size - size // 100, start=size // 100) + ldap_lines(size // 100, start=size)
+        stage, timings[size] = diff_run(lines, label=f"t0-{size}")
+        assert (len(stage.added), len(stage.removed)) == (size // 100, size // 100)
+        print(f"\n{size} lines: diff in {timings[size]:.2f}s ({size / timings[size]:,.0f} lines/s)")
+    assert timings[n] < DIFF_BUDGET_S
+    assert timings[2 * n] < 3 * timings[n]
+
+
+def test_volatile_fields_and_blocks(workspace_factory):
+    workspace_factory(1)
+    first = ["\x1b[32m[+]\x1b[0m alice  2024-01-01 10:00:00.123\n",
+             "distinguishedName: CN=bob,DC=corp\n", "permission: WRITE\n", "\n",
+             "distinguishedName: CN=eve,DC=corp\n", "permission: WRITE\n", "\n"]
+    second = ["[+] alice    2024-06-30 23:59:59.999\n",
+              "distinguishedName: CN=bob,DC=corp\n", "permission: CREATE_CHILD; WRITE\n", "\n",
+              "distinguishedName: CN=eve,DC=corp\n", "permission: WRITE\n"]
+    diff_run(first)
+    stage, _ = diff_run(second)
+    assert stage.added == ["distinguishedName: CN=bob,DC=corp\x1fpermission: CREATE_CHILD; WRITE"]
+    assert stage.removed == ["distinguishedName: CN=bob,DC=corp\x1fpermission: WRITE"]
+
+
+def test_enum_diff_end_to_end(workspace_factory, tmp_path, monkeypatch):
+    """`enum ldap password --diff` prints only the new lines of the second run."""
+    from seerAD.cli import enum
+    from seerAD.core.session import session
+    from seerAD.tool_handler import helper
+
+    loot = workspace_factory(1)
+    shutil.rmtree(loot / "t0" / "records", ignore_errors=True)  # earlier benchmarks ran nxc ldap as this user
+    session.current_credential_index = 0
+    from seerAD.core import services
+    services.record([("t0", "10.0.0.0", 389, "tcp", "open", None, None)], "bench")  # no port probe
+    bin_dir = faketool.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    output = io.StringIO()
+    monkeypatch.setattr(helper, "console", Console(file=output, width=200))
+
+    class Ctx:
+        args = ["ldap", "password", "--diff"]
+
+    monkeypatch.setenv("SEER_FAKE_LINES", "100")
+    enum.enum_callback(Ctx)
+    assert "everything is new" in output.getvalue()
+    output.seek(0)
+    output.truncate()
+    monkeypatch.setenv("SEER_FAKE_LINES", "105")
+    enum.enum_callback(Ctx)
+    text = output.getvalue()
+    assert "5 added, 0 removed" in text
+    assert text.count("\n+ ") == 5 and "FAKE nxc argv" not in text
+
+    # Other options are another baseline: they neither show as changes nor replace this one
+    for args, expected in ((["--users", "--groups", "--diff"], "everything is new"), (["--diff"], "0 added, 0 removed"),
+                           (["--groups", "--users", "--diff"], "1 added, 1 removed")):  # only the argv echo differs
+        output.seek(0)
+        output.truncate()
+        Ctx.args = ["ldap", "password"] + args
+        monkeypatch.setenv("SEER_TELEMETRY", "0")
+        enum.enum_callback(Ctx)
+        assert expected in output.getvalue(), args
@@ -0,0 +1,106 @@
+"""
+Port precheck before `enum` runs (core/services.py): a module whose port is closed is
+skipped without starting the tool, from a probe once and from the inventory after that,
+unless `--force` is given.
+
+Run with `pytest benchmarks/bench_services.py -s`. The budgets can be relaxed with
+SEER_PRECHECK_PROBE_MS (first check, probing) and SEER_PRECHECK_CACHED_MS (from the
+inventory).
+"""
+import io
+import os
+import time
+
+import pytest
+from rich.console import Console
+
+from fakeservices import FakeNetwork
+
+PROBE_MS = float(os.getenv("SEER_PRECHECK_PROBE_MS", "300"))
+CACHED_MS = float(os.getenv("SEER_PRECHECK_CACHED_MS", "30"))
+IP = "127.0.0.40"
+
+
+@pytest.fixture
+def precheck(workspace_factory, monkeypatch):
+    """t0 at IP, with only SMB listening; enum's tool handlers replaced by a call log."""
+    from seerAD.cli import enum
+    from seerAD.core.session import session
+
+    with FakeNetwork({IP: {"services": ["smb"], "fqdn": "dc0.corp.local", "domain": "corp.local"}}) as net:
+        workspace_factory(1)
+        session.current_credential_index = 0
+        session.update_current_target(ip=IP)
+        calls = []
+        monkeypatch.setattr(enum, "PORTS", {"mssql": (net.ports["mssql"],), "smb": (net.ports["smb"],)})
+        monkeypatch.setattr(enum, "COMMANDS", {name: (lambda m, a, name=name: calls.append(name))
+                                               for name in ("mssql", "smb")})
+        output = io.StringIO()
+        monkeypatch.setattr(enum, "console", Console(file=output, width=200))
+        yield enum, calls, output
+
+
+def run(enum, *args):
+    class Ctx:
+        pass
+    Ctx.args = list(args)
+    start = time.perf_counter()
+    enum.enum_callback(Ctx)
+    return (time.perf_counter() - start) * 1000
+
+
+def test_closed_port_is_skipped(precheck, monkeypatch):
+    from seerAD.core import services
+
+    enum, calls, output = precheck
+    probed = run(enum, "mssql", "password")
+    assert calls == [] and "Skipping mssql" in output.getvalue() and "--force" in output.getvalue()
+
+    monkeypatch.setattr(services, "probe", lambda *a, **k: pytest.fail("probed again within the TTL"))
+    cached = run(enum, "mssql", "password")
+    assert calls == []
+    print(f"\nclosed port: {probed:.1f} ms probing, {cached:.1f} ms from the inventory")
+    assert probed < PROBE_MS and cached < CACHED_MS
+
+    run(enum, "mssql", "password", "--force")
+    assert calls == ["mssql"]
+
+
+def test_open_port_runs(precheck):
+    enum, calls, output = precheck
+    run(enum, "smb", "password")
+    run(enum, "smb", "password")
+    assert calls == ["smb", "smb"]
+    assert "Skipping" not in output.getvalue()
+
+
+def test_port_option_is_checked(precheck):
+    """`--port N` moves the service: the precheck looks at N, not at the module's usual ports."""
+    enum, calls, output = precheck
+    smb, mssql = enum.PORTS["smb"][0], enum.PORTS["mssql"][0]
+    run(enum, "mssql", "password", "--port", str(smb))  # open, though the default mssql port is closed
+    run(enum, "mssql", "password", f"--port={smb}")
+    assert calls == ["mssql", "mssql"]
+
+    run(enum, "smb", "password", "-port", str(mssql))
+    assert calls == ["mssql", "mssql"] and f"port {mssql} is closed" in output.getvalue()
+
+
+def test_stale_rows_are_probed_again(precheck, monkeypatch):
+    from seerAD.core import services
+    from seerAD.core.session import session
+
+    enum, calls, _ = precheck
+    port = enum.PORTS["mssql"][0]
+    services.record([("t0", IP, port, "tcp", "open", "ms-sql-s", None)], "nmap")
+    seen = []
+    real_probe = services.probe
+    monkeypatch.setattr(services, "probe", lambda ip, ports, timeout: seen.append(list(ports)) or real_probe(ip, ports, timeout))
+
+    assert services.check("t0", IP, [port])[port]["state"] == "open"  # fresh: no probe
+    found = services.check("t0", IP, [port], ttl=0)
+    assert seen == [[port]]
+    assert (found[port]["state"], found[port]["name"], found[port]["source"]) == ("closed", "ms-sql-s", "probe")
+
+    session.update_current_target(ip="127.0.0.41")  # re-pointed: rows of the old IP don't count
+    assert services.inventory("t0", "127.0.0.41") == {}
@@ -0,0 +1,94 @@
+"""
+SID cache (core/sids.py): filling it from parsed output, annotating SIDs in tool
+output from it, and batching DC lookups.
+
+Run with `pytest benchmarks/bench_sids.py -s`. The annotation budget can be relaxed
+with SEER_SID_ANNOTATE_BUDGET_S.
+"""
+import os
+import time
+
+import pytest
+
+ANNOTATE_BUDGET_S = float(os.getenv("SEER_SID_ANNOTATE_BUDGET_S", "2"))
+DOMAIN = "S-1-5-21-111-222-333"
+
+
+@pytest.fixture
+def cache(workspace_factory):
+    """10k users seen by `enum lookupsid`, through the facts writer."""
+    from seerAD.core.facts import write_facts
+    from seerAD.core.loot import LOOT_DB
+    from seerAD.core.parsers import parsers_for
+
+    workspace_factory(1)
+    LOOT_DB.unlink(missing_ok=True)
+    parser = parsers_for("lookupsid")[0]
+    records = parser.feed(f"[*] Domain SID is: {DOMAIN}\n")
+    for rid in range(1000, 11_000):
+        records += parser.feed(f"{rid}: CORP\\user{rid} (SidTypeUser)\n")
+    write_facts("t0", "lookupsid", records)
+    yield
+    LOOT_DB.unlink(missing_ok=True)
+
+
+def test_passive_fill_and_lookup(cache):
+    from seerAD.core.sids import label, lookup
+
+    found = lookup([f"{DOMAIN}-1500", f"{DOMAIN}-512", "S-1-5-32-544", f"{DOMAIN}-99999"])
+    assert label(found[f"{DOMAIN}-1500"]) == "CORP\\user1500"
+    assert found[f"{DOMAIN}-512"]["name"] == "Domain Admins"  # well-known RID, no row needed
+    assert found["S-1-5-32-544"]["name"] == "BUILTIN\\Administrators"
+    assert f"{DOMAIN}-99999" not in found
+
+
+def test_annotate_throughput(cache):
+    from seerAD.core.sids import SidAnnotator
+
+    lines = [f"objectSid: {DOMAIN}-{1000 + i % 20_000}" if i % 4 == 0 else f"description: line {i}"
+             for i in range(200_000)]
+    annotator = SidAnnotator()
+    start = time.perf_counter()
+    out = [annotator.rewrite(line) for line in lines]
+    elapsed = time.perf_counter() - start
+    annotator.close()
+    print(f"\nannotated {len(lines):,} lines in {elapsed:.2f}s ({len(lines) / elapsed:,.0f} lines/s)")
+    assert out[0] == f"objectSid: {DOMAIN}-1000 (CORP\\user1000)"
+    assert out[12_000] == f"objectSid: {DOMAIN}-13000"  # not cached: left alone
+    assert len(annotator.unknown) == 2_500  # every 4th rid of 11000..20999
+    assert elapsed < ANNOTATE_BUDGET_S
+
+
+def test_remote_lookups_are_batched(cache, monkeypatch):
+    """2,500 unknown SIDs cost three LsarLookupSids calls, and land in the cache."""
+    from impacket.dcerpc.v5 import lsad, lsat, transport
+    from seerAD.core import sids
+
+    calls = []
+
+    class Dce:
+        def connect(self): pass
+        def bind(self, uuid): pass
+        def disconnect(self): pass
+
+    class Transport:
+        def set_credentials(self, *args): pass
+        def set_kerberos(self, *args, **kwargs): pass
+        def get_dce_rpc(self): return Dce()
+
+    def lookup_sids(dce, handle, chunk, level):
+        calls.append(len(chunk))
+        return {"ReferencedDomains": {"Domains": [{"Name": "CORP"}]},
+                "TranslatedNames": {"Names": [{"Use": 1, "Name": f"remote{s.rsplit('-', 1)[1]}", "DomainIndex": 0}
+                                              for s in chunk]}}
+
+    monkeypatch.setattr(transport, "DCERPCTransportFactory", lambda binding: Transport())
+    monkeypatch.setattr(lsad, "hLsarOpenPolicy2", lambda dce, access: {"PolicyHandle": b"h"})
+    monkeypatch.setattr(lsat, "hLsarLookupSids", lookup_sids)
+
+    wanted = [f"{DOMAIN}-{rid}" for rid in range(50_000, 52_500)]
+    found = sids.resolve_remote(wanted, {"ip": "10.0.0.1", "domain": "corp.local"},
+                                {"username": "alice", "password": "x"}, "password")
+    assert calls == [1000, 1000, 500]
+    assert len(found) == 2500
+    assert sids.label(sids.lookup([f"{DOMAIN}-51234"])[f"{DOMAIN}-51234"]) == "CORP\\remote51234"
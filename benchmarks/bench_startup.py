@@ -0,0 +1,76 @@
+"""
+Cold start budget for one-shot CLI commands.
+
+Run with `pytest benchmarks/bench_startup.py`. Budgets can be relaxed on slow
+machines with SEER_IMPORT_BUDGET_MS / SEER_COMMAND_BUDGET_MS.
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET_MS = float(os.getenv("SEER_IMPORT_BUDGET_MS", "250"))
+COMMAND_BUDGET_MS = float(os.getenv("SEER_COMMAND_BUDGET_MS", "200"))
+
+# Must only be imported by the commands that use them
+HEAVY_MODULES = ("impacket", "minikerberos", "Crypto", "Cryptodome", "prompt_toolkit", "asyncio", "ntplib")
+
+
+def importtime(module: str):
+    """Return {module: cumulative_us} from `python -X importtime -c 'import <module>'`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative.strip())
+        except ValueError:
+            continue  # header line
+    return times
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    env = os.environ.copy()
+    env["XDG_DATA_HOME"] = str(tmp_path)
+    return env
+
+
+def test_cli_does_not_import_heavy_modules():
+    loaded = importtime("seerAD.cli.main")
+    heavy = sorted(m for m in loaded if m.split(".")[0] in HEAVY_MODULES)
+    assert not heavy, f"heavy modules imported at startup: {heavy}"
+
+
+def test_cli_import_budget():
+    # Best of three to smooth out a cold page cache
+    best = min(importtime("seerAD.cli.main")["seerAD.cli.main"] for _ in range(3)) / 1000
+    print(f"seerAD.cli.main import: {best:.1f} ms")
+    assert best < IMPORT_BUDGET_MS
+
+
+def test_import_has_no_side_effects(workspace, tmp_path):
+    subprocess.run([sys.executable, "-c", "import seerAD.main, seerAD.cli.main"], cwd=ROOT, env=workspace, check=True)
+    assert not any(tmp_path.iterdir()), "importing seerAD created files"
+
+
+@pytest.mark.parametrize("argv", [["version"], ["target", "list"]])
+def test_one_shot_command_budget(workspace, argv):
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "seerAD.main", *argv], cwd=ROOT, env=workspace,
+                       check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"seerAD {' '.join(argv)}: best {min(timings):.1f} ms")
+    assert min(timings) < COMMAND_BUDGET_MS
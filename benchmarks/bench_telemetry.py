@@ -0,0 +1,61 @@
+"""
+Cost of telemetry spans relative to the commands they measure.
+
+Run with `pytest benchmarks/bench_telemetry.py`. SEER_TELEMETRY_OVERHEAD_PCT sets
+the allowed overhead (default 1%).
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+OVERHEAD_PCT = float(os.getenv("SEER_TELEMETRY_OVERHEAD_PCT", "1"))
+ROUNDS = 2000
+
+
+def instrumented_command():
+    """The span tree of a typical `enum` command: command > session/creds load, helper > tool."""
+    from seerAD.core.telemetry import span
+
+    with span("command", command="enum smb"):
+        with span("session.load"):
+            pass
+        with span("creds.load", target="dc01"):
+            pass
+        with span("helper", module="nxc smb", auth="password", target="dc01"):
+            with span("tool", tool="nxc") as record:
+                record["rc"], record["bytes"] = 0, 4096
+
+
+def per_call_us(enabled: bool) -> float:
+    os.environ["SEER_TELEMETRY"] = "1" if enabled else "0"
+    try:
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                instrumented_command()
+            best = min(best, (time.perf_counter() - start) / ROUNDS * 1e6)
+        return best
+    finally:
+        os.environ.pop("SEER_TELEMETRY", None)
+
+
+def test_span_overhead_per_command(tmp_path):
+    overhead_us = max(0.0, per_call_us(True) - per_call_us(False))
+
+    # The cheapest real command: a one-shot `seerAD version`
+    env = dict(os.environ, XDG_DATA_HOME=str(tmp_path), SEER_NO_DAEMON="1")
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "seerAD.main", "version"], cwd=ROOT, env=env,
+                       check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    pct = overhead_us / min(timings) * 100
+    print(f"telemetry: {overhead_us:.1f} us per command ({pct:.3f}% of a one-shot command)")
+    assert pct < OVERHEAD_PCT
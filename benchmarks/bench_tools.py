@@ -0,0 +1,245 @@
+"""
+End-to-end runs of run_nxc / run_impacket / run_bloodyad / run_certipy against
+the stand-in tools in faketool.py: what reaches the tool, per-call overhead,
+output throughput, record/replay, and parallel playbook steps.
+
+Run with `pytest benchmarks/bench_tools.py -s`. Budgets can be relaxed with
+SEER_TOOL_OVERHEAD_MS (seerAD's cost per call on top of the tool itself) and
+SEER_TOOL_LINES_PER_S (output lines shown per second).
+"""
+import io
+import json
+import os
+import statistics
+import subprocess
+import time
+
+import pytest
+from rich.console import Console
+
+import faketool
+
+TOOL_OVERHEAD_MS = float(os.getenv("SEER_TOOL_OVERHEAD_MS", "30"))
+TOOL_LINES_PER_S = float(os.getenv("SEER_TOOL_LINES_PER_S", "2000"))
+HELPER_MODULES = ("helper", "nxc_helper", "impacket_helper", "bloodyad_helper", "certipyad_helper")
+NTLM = "31d6cfe0d16ae931b73c59d7e0c089c0"
+
+
+class Fakes:
+    def __init__(self, bin_dir, log, output):
+        self.bin_dir, self.log, self.output = bin_dir, log, output
+
+    def runs(self):
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def text(self):
+        return self.output.getvalue()
+
+
+@pytest.fixture
+def fakes(tmp_path, monkeypatch, workspace_factory):
+    """Fake tools first on PATH, tool output captured, and user000000 (password + NTLM) selected on t0."""
+    workspace_factory(10)
+    from seerAD.core.session import session
+    session.update_credential("t0", "user000000", ntlm=NTLM)
+    session.current_credential_index = 0
+    from seerAD.core import services
+    services.record([("t0", "10.0.0.0", port, "tcp", "open", None, None) for port in (389, 445)], "bench")
+
+    bin_dir = faketool.install(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("SEER_FAKE_LOG", str(tmp_path / "runs.jsonl"))
+    monkeypatch.setenv("SEER_FAKE_CASSETTES", str(tmp_path / "cassettes"))
+    for name in ("SEER_FAKE_MODE", "SEER_FAKE_LINES", "SEER_FAKE_RATE", "SEER_FAKE_LATENCY", "SEER_FAKE_RC", "SEER_FAKE_SPEED"):
+        monkeypatch.delenv(name, raising=False)
+
+    output = io.StringIO()
+    console = Console(file=output, width=200)
+    for name in HELPER_MODULES:
+        module = __import__(f"seerAD.tool_handler.{name}", fromlist=["console"])
+        monkeypatch.setattr(module, "console", console)
+    return Fakes(bin_dir, tmp_path / "runs.jsonl", output)
+
+
+def run_nxc():
+    from seerAD.tool_handler.nxc_helper import run_nxc
+    run_nxc("smb", "password", ["--shares"])
+
+
+def run_impacket():
+    from seerAD.tool_handler.impacket_helper import run_impacket
+    run_impacket("GetUserSPNs", "ntlm", ["-request"])
+
+
+def run_bloodyad():
+    from seerAD.tool_handler.bloodyad_helper import run_bloodyad
+    run_bloodyad(["get", "object"], "password", ["Administrator"])
+
+
+def run_certipy():
+    from seerAD.tool_handler.certipyad_helper import run_certipy
+    run_certipy("find", "password", ["-vulnerable"])
+
+
+HELPERS = {"nxc": run_nxc, "impacket": run_impacket, "bloodyAD": run_bloodyad, "certipy": run_certipy}
+
+EXPECTED_ARGV = {
+    "nxc": ("nxc", ["smb", "dc0.corp.local", "-u", "user000000", "-p", "Passw0rd0", "--shares"]),
+    "impacket": ("GetUserSPNs.py", ["corp.local/user000000", "-hashes", f":{NTLM}", "-no-pass",
+                                    "-dc-ip", "10.0.0.0", "-dc-host", "dc0.corp.local", "-request"]),
+    "bloodyAD": ("bloodyAD", ["--host", "dc0.corp.local", "-d", "corp.local", "-u", "user000000",
+                              "-p", "Passw0rd0", "get", "object", "Administrator"]),
+    "certipy": ("certipy-ad", ["find", "-u", "user000000@corp.local", "-p", "Passw0rd0",
+                               "-target", "dc0.corp.local", "-dc-ip", "10.0.0.0", "-vulnerable"]),
+}
+
+
+@pytest.mark.parametrize("name", HELPERS)
+def test_argv_reaches_tool(fakes, name):
+    HELPERS[name]()
+    [run] = fakes.runs()
+    assert (run["tool"], run["argv"]) == EXPECTED_ARGV[name]
+    assert f"FAKE {run['tool']} argv" in fakes.text()
+
+
+def test_ticket_env_reaches_tool(fakes, tmp_path):
+    from seerAD.core.session import session
+    from seerAD.tool_handler.nxc_helper import run_nxc
+
+    ccache = tmp_path / "user000000.ccache"
+    ccache.write_bytes(b"")
+    session.update_credential("t0", "user000000", ticket=str(ccache))
+    run_nxc("ldap", "ticket", [])
+    [run] = fakes.runs()
+    assert "--use-kcache" in run["argv"]
+    assert run["env"]["KRB5CCNAME"] == str(ccache)
+
+
+@pytest.mark.parametrize("name", HELPERS)
+def test_helper_overhead(fakes, name):
+    """Wall time of a helper call minus the same tool started directly."""
+    tool, argv = EXPECTED_ARGV[name]
+    direct, through = [], []
+    for _ in range(10):
+        start = time.perf_counter()
+        subprocess.run([str(fakes.bin_dir / tool)] + argv, stdout=subprocess.DEVNULL, check=True)
+        direct.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        HELPERS[name]()
+        through.append(time.perf_counter() - start)
+    overhead = (statistics.median(through) - statistics.median(direct)) * 1000
+    print(f"\n{name}: tool {statistics.median(direct) * 1000:.1f} ms, "
+          f"through seerAD {statistics.median(through) * 1000:.1f} ms (+{overhead:.1f} ms)")
+    assert overhead < TOOL_OVERHEAD_MS
+
+
+def test_output_throughput(fakes, monkeypatch):
+    from seerAD.tool_handler.helper import collect_returncodes
+
+    lines = 20_000
+    monkeypatch.setenv("SEER_FAKE_LINES", str(lines))
+    with collect_returncodes() as codes:
+        start = time.perf_counter()
+        run_nxc()
+        elapsed = time.perf_counter() - start
+    assert codes == [0]
+    size = len(fakes.text())
+    print(f"\n{lines} lines in {elapsed:.2f}s: {lines / elapsed:,.0f} lines/s, {size / elapsed / 2**20:.1f} MiB/s")
+    assert lines / elapsed > TOOL_LINES_PER_S
+
+
+def test_latency_and_rate(fakes, monkeypatch):
+    monkeypatch.setenv("SEER_FAKE_LATENCY", "0.2")
+    monkeypatch.setenv("SEER_FAKE_RATE", "50")
+    monkeypatch.setenv("SEER_FAKE_LINES", "10")
+    start = time.perf_counter()
+    run_nxc()
+    elapsed = time.perf_counter() - start
+    assert 0.4 <= elapsed < 0.4 + TOOL_OVERHEAD_MS / 1000 + 0.2
+
+
+def test_record_and_replay(fakes, monkeypatch):
+    from seerAD.tool_handler.helper import collect_returncodes
+
+    # "Record" a second fake standing in for the real tool: slow, with a failing exit code
+    monkeypatch.setenv("SEER_FAKE_MODE", "record")
+    monkeypatch.setenv("SEER_FAKE_REAL", str(fakes.bin_dir / "bloodyAD"))
+    monkeypatch.setenv("SEER_FAKE_RATE", "20")
+    monkeypatch.setenv("SEER_FAKE_RC", "3")
+    with collect_returncodes() as codes:
+        run_bloodyad()
+    recorded = fakes.text()
+    assert codes == [3] and "distinguishedName" in recorded
+
+    # Replay ignores the synthetic settings and reproduces output and exit code, here without the delays
+    monkeypatch.setenv("SEER_FAKE_MODE", "replay")
+    monkeypatch.setenv("SEER_FAKE_SPEED", "0")
+    monkeypatch.setenv("SEER_FAKE_RC", "0")
+    fakes.output.seek(0)
+    fakes.output.truncate()
+    with collect_returncodes() as codes:
+        start = time.perf_counter()
+        run_bloodyad()
+        elapsed = time.perf_counter() - start
+    assert codes == [3]
+    assert fakes.text() == recorded
+    assert elapsed < 0.4  # the recording took 0.5s of output at 20 lines/s
+
+
+def test_parallel_playbook_steps(fakes, monkeypatch, tmp_path):
+    """Four 0.5s tool runs in a parallel playbook overlap instead of taking 2s."""
+    from seerAD.cli.run import _execute
+    from seerAD.core.playbook import Playbook, PlaybookRunner
+
+    monkeypatch.setenv("SEER_FAKE_LATENCY", "0.5")
+    book = tmp_path / "book.yml"
+    book.write_text("target: t0\ncredential: user000000\nparallel: 4\nsteps:\n" + "".join(
+        f"  - id: s{i}\n    enum: smb\n    auth: password\n" for i in range(4)))
+    start = time.perf_counter()
+    status = PlaybookRunner(Playbook(book), _execute).run()
+    elapsed = time.perf_counter() - start
+
+    assert set(status.values()) == {"ok"}
+    runs = fakes.runs()
+    assert len(runs) == 4
+    assert max(r["start"] for r in runs) < min(r["end"] for r in runs)  # all four were running at once
+    print(f"\n4 parallel steps of 0.5s: {elapsed:.2f}s")
+    assert elapsed < 1.5
+
+
+def test_step_log_is_plain_text_under_a_terminal(fakes, tmp_path):
+    """`seerAD run` started from a terminal: the echo is colored, the step log and its captures are not."""
+    import pty
+    import sys
+    from pathlib import Path
+
+    from seerAD.core.playbook import Playbook
+
+    book = tmp_path / "book.yml"
+    book.write_text("target: t0\ncredential: user000000\nsteps:\n  - id: smb\n    enum: smb\n    auth: password\n"
+                    "    capture:\n      users: '\\\\(user\\d+):'\n")
+    env = {k: v for k, v in os.environ.items() if k not in ("NO_COLOR", "FORCE_COLOR")}
+    master, slave = pty.openpty()
+    proc = subprocess.Popen([sys.executable, "-m", "seerAD.main", "run", str(book)], cwd=Path(__file__).resolve().parent.parent,
+                            stdin=slave, stdout=slave, stderr=slave, env={**env, "TERM": "xterm-256color"})
+    os.close(slave)
+    echoed = b""
+    while True:
+        try:
+            chunk = os.read(master, 65536)
+        except OSError:  # EIO: the child closed the terminal
+            break
+        if not chunk:
+            break
+        echoed += chunk
+    os.close(master)
+    assert proc.wait(timeout=60) == 0, echoed.decode(errors="replace")
+
+    assert b"\x1b[" in echoed  # rich saw a terminal
+    run_dir = Playbook(book).run_dir
+    log = (run_dir / "smb.log").read_text()
+    assert "\x1b" not in log and "[+] corp.local\\user000009:Passw0rd9" in log
+    state = json.loads((run_dir / "state.json").read_text())
+    assert state["steps"]["smb"]["captures"]["users"] == [f"user{i:06d}" for i in range(10)]
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the benchmarks.
+
+The workspace is redirected to a temporary XDG_DATA_HOME before anything from
+seerAD is imported, so benchmarks never touch the user's real loot.
+"""
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+os.environ["XDG_DATA_HOME"] = tempfile.mkdtemp(prefix="seer-bench-")
+
+
+def write_workspace(n_creds: int, n_targets: int = 1, current: str = "t0") -> Path:
+    """Write a synthetic workspace directly as JSON (bypassing the per-call saves) and return LOOT_DIR."""
+    from seerAD.config import LOOT_DIR, ensure_dirs
+
+    ensure_dirs()
+    now = datetime.now(timezone.utc).isoformat()
+    targets = {}
+    for t in range(n_targets):
+        label = f"t{t}"
+        targets[label] = {"ip": f"10.{t // 65536 % 256}.{t // 256 % 256}.{t % 256}", "domain": "corp.local",
+                          "fqdn": f"dc{t}.corp.local", "created_at": now, "updated_at": now}
+        creds = {}
+        for i in range(n_creds if label == current else 0):
+            username = f"user{i:06d}"
+            creds[username] = {"username": username, "domain": "corp.local", "password": f"Passw0rd{i}",
+                               "ntlm": None, "aes128": None, "aes256": None, "ticket": None, "cert": None,
+                               "notes": "", "created_at": now, "updated_at": now}
+        (LOOT_DIR / label).mkdir(parents=True, exist_ok=True)
+        with open(LOOT_DIR / label / "credentials.json", "w") as f:
+            json.dump(creds, f)
+    with open(LOOT_DIR / "session.json", "w") as f:
+        json.dump({"targets": targets, "current_target_label": current, "current_credential_index": None}, f)
+    return LOOT_DIR
+
+
+def reset_session():
+    """Drop the process-wide Session so the next access reloads the workspace from disk."""
+    from seerAD.core.session import LazySession
+    LazySession._instance = None
+
+
+@pytest.fixture
+def workspace_factory():
+    def build(n_creds: int, n_targets: int = 1):
+        loot = write_workspace(n_creds, n_targets)
+        reset_session()
+        return loot
+    yield build
+    reset_session()
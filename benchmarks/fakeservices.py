@@ -0,0 +1,244 @@
+"""
+Local listener stand-ins for the AD ports, so `target discover` and the clock-skew
+estimator can be exercised without a domain controller.
+
+FakeNetwork binds listeners on loopback addresses (127.0.0.x all route to `lo`) on
+one set of high ports, given to discover() as its `services` mapping:
+
+    ldap      answers an anonymous rootDSE search with defaultNamingContext and dnsHostName
+    smb       answers the SMB2 negotiate, then the session setup with an NTLMSSP CHALLENGE
+              naming the host and domain in its target info
+    silent    accepts and never answers (exercises the per-connect timeout)
+    others    accept and close
+
+FakeClock serves the two clocks core/clock.py reads, running ahead of ours:
+
+    ntp       SNTP over UDP, each reply `offset` off (or the next of `ntp_offsets`)
+    kerberos  any AS-REQ over TCP gets a KRB-ERROR (PRINCIPAL_UNKNOWN) with stime/susec
+    silent    either one can be made to swallow requests (exercises the timeouts)
+
+Listeners run on an asyncio loop in a background thread.
+"""
+import asyncio
+import itertools
+import socket
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+from seerAD.core.discover import tlv
+
+PORT_NAMES = ("kerberos", "ldap", "smb", "winrm", "mssql")
+
+
+def free_ports(n: int, host: str = "127.0.0.1") -> List[int]:
+    """n distinct ports, consecutive from a free base (what the OS hands out, then upwards)."""
+    with socket.socket() as s:
+        s.bind((host, 0))
+        base = s.getsockname()[1]
+    return [base + i if base + n < 65535 else base - n + i for i in range(n)]
+
+
+def rootdse_reply(fqdn: str, domain: str) -> bytes:
+    naming = ",".join(f"DC={part}" for part in domain.split("."))
+    attrs = b"".join(tlv(0x30, tlv(0x04, name.encode()) + tlv(0x31, tlv(0x04, value.encode())))
+                     for name, value in (("defaultNamingContext", naming), ("dnsHostName", fqdn)))
+    entry = tlv(0x30, tlv(0x02, b"\x01") + tlv(0x64, tlv(0x04, b"") + tlv(0x30, attrs)))
+    done = tlv(0x30, tlv(0x02, b"\x01") + tlv(0x65, tlv(0x0A, b"\x00") + tlv(0x04, b"") + tlv(0x04, b"")))
+    return entry + done
+
+
+def ntlm_challenge(fqdn: str, domain: str) -> bytes:
+    host = fqdn.split(".", 1)[0].upper()
+    netbios_domain = domain.split(".", 1)[0].upper()
+    info = b"".join(struct.pack("<HH", av_id, len(value.encode("utf-16-le"))) + value.encode("utf-16-le")
+                    for av_id, value in ((2, netbios_domain), (1, host), (4, domain), (3, fqdn)))
+    info += b"\0\0\0\0"
+    return (b"NTLMSSP\0" + struct.pack("<IHHIIQQHHIQ", 2, 0, 0, 56, 0xE2898215, 0x1122334455667788, 0,
+                                         len(info), len(info), 56, 0) + info)
+
+
+def smb2_reply(command: int, body: bytes) -> bytes:
+    header = struct.pack("<4sHHIHHIIQIIQ16s", b"\xfeSMB", 64, 0, 0, command, 1, 1, 0, 0, 0, 0, 0, b"\0" * 16)
+    payload = header + body
+    return struct.pack(">I", len(payload)) + payload
+
+
+class FakeNetwork:
+    """hosts: {ip: {"services": [...], "fqdn": ..., "domain": ...}}; a service named "silent-<svc>" hangs."""
+
+    def __init__(self, hosts: Dict[str, dict]):
+        self.hosts = hosts
+        self.ports = dict(zip(PORT_NAMES, free_ports(len(PORT_NAMES))))
+        self.loop = asyncio.new_event_loop()
+        self.servers = []
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    @property
+    def services(self) -> Dict[str, int]:
+        return dict(self.ports)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(10)
+        return self
+
+    def __exit__(self, *exc):
+        async def stop():
+            for server in self.servers:
+                server.close()
+                await server.wait_closed()
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+    async def _start(self):
+        for ip, spec in self.hosts.items():
+            for service in spec["services"]:
+                name = service.replace("silent-", "")
+                handler = self._handler(service, spec)
+                self.servers.append(await asyncio.start_server(handler, ip, self.ports[name]))
+
+    def _handler(self, service: str, spec: dict):
+        fqdn, domain = spec.get("fqdn", ""), spec.get("domain", "")
+
+        async def close(writer):
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        async def ldap(reader, writer):
+            try:
+                head = await reader.readexactly(2)
+                await reader.readexactly(head[1])
+                writer.write(rootdse_reply(fqdn, domain))
+                await writer.drain()
+            except (asyncio.IncompleteReadError, OSError):
+                pass
+            await close(writer)
+
+        async def smb(reader, writer):
+            try:
+                for command, body in ((0, b"\x41\0" + b"\0" * 63), (1, b"\x09\0" + ntlm_challenge(fqdn, domain))):
+                    size = int.from_bytes((await reader.readexactly(4))[1:], "big")
+                    await reader.readexactly(size)
+                    writer.write(smb2_reply(command, body))
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, OSError):
+                pass
+            await close(writer)
+
+        async def silent(reader, writer):
+            try:
+                await reader.read()
+            except OSError:
+                pass
+            await close(writer)
+
+        async def accept(reader, writer):
+            await close(writer)
+
+        if service.startswith("silent-"):
+            return silent
+        return {"ldap": ldap, "smb": smb}.get(service, accept)
+
+
+NTP_EPOCH_DELTA = 2208988800
+
+
+def ntp_time(ts: float) -> bytes:
+    return struct.pack("!II", int(ts) + NTP_EPOCH_DELTA, int(ts % 1 * (1 << 32)))
+
+
+def der_int(n: int) -> bytes:
+    return tlv(0x02, n.to_bytes(n.bit_length() // 8 + 1, "big"))
+
+
+def krb_error(now: float, realm: str, code: int = 6) -> bytes:
+    """KRB-ERROR as a KDC sends it to an unknown principal, stime/susec from `now`."""
+    stamp = datetime.fromtimestamp(now, timezone.utc)
+    sname = tlv(0x30, tlv(0xA0, der_int(2)) + tlv(0xA1, tlv(0x30, tlv(0x1B, b"krbtgt") + tlv(0x1B, realm.encode()))))
+    body = (tlv(0xA0, der_int(5)) + tlv(0xA1, der_int(30))
+            + tlv(0xA4, tlv(0x18, stamp.strftime("%Y%m%d%H%M%SZ").encode())) + tlv(0xA5, der_int(stamp.microsecond))
+            + tlv(0xA6, der_int(code)) + tlv(0xA9, tlv(0x1B, realm.encode())) + tlv(0xAA, sname))
+    return tlv(0x7E, tlv(0x30, body))
+
+
+class _SNTP(asyncio.DatagramProtocol):
+    def __init__(self, clock: "FakeClock"):
+        self.clock = clock
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.clock.requests["ntp"] += 1
+        if self.clock.silent_ntp or len(data) < 48:
+            return
+        offset = next(self.clock.ntp_offsets)
+        received = time.time() + offset
+        reply = (b"\x1c\x01\x00\xec" + b"\0" * 8 + b"LOCL" + ntp_time(received) + data[40:48]
+                 + ntp_time(received) + ntp_time(time.time() + offset))
+        self.clock.loop.call_later(self.clock.delay, self.transport.sendto, reply, addr)
+
+
+class FakeClock:
+    """
+    SNTP and KDC stand-ins on `ip`, `offset` seconds ahead of the local clock (the KDC
+    `kdc_offset` when given). Replies wait `delay` seconds; `requests` counts what came in.
+    """
+
+    def __init__(self, ip: str = "127.0.0.1", offset: float = 0.0, ntp_offsets: Sequence[float] = (),
+                 kdc_offset: Optional[float] = None, delay: float = 0.0, silent_ntp: bool = False,
+                 silent_kdc: bool = False, realm: str = "CORP.LOCAL"):
+        self.ip, self.realm, self.delay = ip, realm, delay
+        self.ntp_offsets = itertools.cycle(ntp_offsets or [offset])
+        self.kdc_offset = offset if kdc_offset is None else kdc_offset
+        self.silent_ntp, self.silent_kdc = silent_ntp, silent_kdc
+        self.ntp_port, self.kdc_port = free_ports(2, ip)
+        self.requests = {"ntp": 0, "kerberos": 0}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    @property
+    def ports(self) -> Dict[str, int]:
+        """Keyword arguments for clock.measure_skew."""
+        return {"ntp_port": self.ntp_port, "kdc_port": self.kdc_port}
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(10)
+        return self
+
+    def __exit__(self, *exc):
+        async def stop():
+            self.udp.close()
+            self.kdc.close()
+            await self.kdc.wait_closed()
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+    async def _start(self):
+        self.udp, _ = await self.loop.create_datagram_endpoint(lambda: _SNTP(self), local_addr=(self.ip, self.ntp_port))
+        self.kdc = await asyncio.start_server(self._kerberos, self.ip, self.kdc_port)
+
+    async def _kerberos(self, reader, writer):
+        try:
+            size = int.from_bytes(await reader.readexactly(4), "big")
+            await reader.readexactly(size)
+            self.requests["kerberos"] += 1
+            if self.silent_kdc:
+                await reader.read()
+            else:
+                await asyncio.sleep(self.delay)
+                reply = krb_error(time.time() + self.kdc_offset, self.realm)
+                writer.write(len(reply).to_bytes(4, "big") + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        writer.close()
@@ -0,0 +1,170 @@
+"""
+Stand-in for nxc, the impacket example scripts, bloodyAD and certipy-ad, so the
+tool pipeline can be exercised without the tools or a domain controller.
+
+install(bin_dir) writes one wrapper per tool name; put bin_dir first on PATH.
+Each run is controlled by environment variables:
+
+    SEER_FAKE_MODE      synthetic (default), record or replay
+    SEER_FAKE_LINES     synthetic lines to print (default 10)
+    SEER_FAKE_WIDTH     pad or cut synthetic lines to this many characters
+    SEER_FAKE_RATE      lines per second, 0 = as fast as possible (default 0)
+    SEER_FAKE_LATENCY   seconds before the first line (default 0)
+    SEER_FAKE_RC        exit code (default 0)
+    SEER_FAKE_LOG       append one JSON line per run: tool, argv, env, pid, start, end, rc
+    SEER_FAKE_ENV       comma-separated variables to echo and log
+                        (default KRB5CCNAME,FAKETIME,LD_PRELOAD,PYTHONWARNINGS)
+    SEER_FAKE_CASSETTES record/replay directory (default ./cassettes)
+    SEER_FAKE_REAL      record: the real executable (default: next one on PATH)
+    SEER_FAKE_SPEED     replay: 1 = recorded timing, 2 = twice as fast, 0 = no delays (default 1)
+
+Synthetic runs first echo their argv and environment. Record runs the real tool
+with the same argv, passes its output through and saves the lines with their
+timing and the exit code to a cassette keyed by tool and argv; replay plays
+that cassette back.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+IMPACKET_TOOLS = ("GetADComputers", "GetADUsers", "GetNPUsers", "GetUserSPNs", "findDelegation",
+                  "lookupsid", "rpcdump", "samrdump", "netview", "getTGT")
+TOOLS = ("nxc", "bloodyAD", "certipy-ad") + tuple(f"{name}.py" for name in IMPACKET_TOOLS)
+DEFAULT_ENV = "KRB5CCNAME,FAKETIME,LD_PRELOAD,PYTHONWARNINGS"
+
+# Synthetic line per tool family, roughly shaped like the real output
+TEMPLATES = {
+    "nxc": "{proto:<8}{host:<16}445    DC01             [+] corp.local\\user{i:06d}:Passw0rd{i} (synthetic)",
+    "bloodyAD": "distinguishedName: CN=user{i:06d},CN=Users,DC=corp,DC=local",
+    "certipy-ad": "[*] Template {i}: User{i:06d} Enabled: True Client Authentication: True",
+    "impacket": "user{i:06d}              2024-01-01 00:00:00.000000  <never>   Synthetic account {i}",
+}
+
+
+def install(bin_dir, tools=TOOLS) -> Path:
+    """Write an executable wrapper for every tool name into bin_dir and return it."""
+    bin_dir = Path(bin_dir)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name in tools:
+        wrapper = bin_dir / name
+        wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" -S "{Path(__file__).resolve()}" "$0" "$@"\n')
+        wrapper.chmod(wrapper.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bin_dir
+
+
+def cassette_path(tool: str, argv) -> Path:
+    digest = hashlib.sha1(json.dumps([tool] + list(argv)).encode()).hexdigest()[:16]
+    return Path(os.environ.get("SEER_FAKE_CASSETTES", "cassettes")) / f"{tool}-{digest}.json"
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name) or default)
+
+
+def _synthetic(tool, argv, out) -> int:
+    keys = [k for k in os.environ.get("SEER_FAKE_ENV", DEFAULT_ENV).split(",") if k]
+    out.write(f"FAKE {tool} argv: {json.dumps(argv)}\n")
+    out.write(f"FAKE {tool} env: {json.dumps({k: os.environ.get(k) for k in keys})}\n")
+
+    lines = int(_env_float("SEER_FAKE_LINES", 10))
+    width = int(_env_float("SEER_FAKE_WIDTH", 0))
+    rate = _env_float("SEER_FAKE_RATE", 0)
+    family = "impacket" if tool.endswith(".py") else tool
+    template = TEMPLATES.get(family, TEMPLATES["impacket"])
+    fields = {"proto": (argv[0] if argv else "smb").upper(), "host": argv[1] if len(argv) > 1 else "-"}
+
+    time.sleep(_env_float("SEER_FAKE_LATENCY", 0))
+    start = time.monotonic()
+    for i in range(lines):
+        line = template.format(i=i, **fields)
+        out.write((line[:width].ljust(width) if width else line) + "\n")
+        if rate:
+            out.flush()
+            delay = start + (i + 1) / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    return int(_env_float("SEER_FAKE_RC", 0))
+
+
+def _find_real(tool):
+    if os.environ.get("SEER_FAKE_REAL"):
+        return os.environ["SEER_FAKE_REAL"]
+    me = Path(sys.argv[1]).resolve().parent
+    path = os.pathsep.join(p for p in os.environ.get("PATH", "").split(os.pathsep) if p and Path(p).resolve() != me)
+    return shutil.which(tool, path=path)
+
+
+def _record(tool, argv, out) -> int:
+    real = _find_real(tool)
+    if not real:
+        sys.stderr.write(f"FAKE {tool}: no real {tool} on PATH to record\n")
+        return 127
+    env = {k: v for k, v in os.environ.items() if k != "SEER_FAKE_MODE"}
+    process = subprocess.Popen([real] + argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+    events, start = [], time.monotonic()
+    for raw in process.stdout:
+        line = raw.decode(errors="replace")
+        events.append([round(time.monotonic() - start, 6), line])
+        out.write(line)
+        out.flush()
+    rc = process.wait()
+
+    path = cassette_path(tool, argv)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"tool": tool, "argv": argv, "rc": rc, "events": events}, f)
+    return rc
+
+
+def _replay(tool, argv, out) -> int:
+    path = cassette_path(tool, argv)
+    try:
+        with open(path) as f:
+            cassette = json.load(f)
+    except OSError:
+        sys.stderr.write(f"FAKE {tool}: no cassette for this argv ({path})\n")
+        return 127
+    speed = _env_float("SEER_FAKE_SPEED", 1)
+    start = time.monotonic()
+    for offset, line in cassette["events"]:
+        if speed:
+            delay = start + offset / speed - time.monotonic()
+            if delay > 0:
+                out.flush()
+                time.sleep(delay)
+        out.write(line)
+    return cassette["rc"]
+
+
+def main() -> int:
+    tool, argv = os.path.basename(sys.argv[1]), sys.argv[2:]
+    mode = os.environ.get("SEER_FAKE_MODE", "synthetic")
+    run = {"synthetic": _synthetic, "record": _record, "replay": _replay}.get(mode)
+    if run is None:
+        sys.stderr.write(f"FAKE {tool}: unknown SEER_FAKE_MODE {mode!r}\n")
+        return 2
+
+    started = time.time()
+    out = sys.stdout
+    try:
+        rc = run(tool, argv, out)
+        out.flush()
+    except BrokenPipeError:
+        rc = 141
+    if os.environ.get("SEER_FAKE_LOG"):
+        keys = [k for k in os.environ.get("SEER_FAKE_ENV", DEFAULT_ENV).split(",") if k]
+        entry = {"tool": tool, "argv": argv, "env": {k: os.environ.get(k) for k in keys}, "mode": mode,
+                 "pid": os.getpid(), "start": started, "end": time.time(), "rc": rc}
+        with open(os.environ["SEER_FAKE_LOG"], "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 import typer
+from contextlib import nullcontext
 from typing import List, Optional
 from rich.console import Console
 from seerAD.tool_handler.bloodyad_helper import run_bloodyad
 from seerAD.tool_handler.certipyad_helper import run_certipy
-from seerAD.tool_handler.helper import run_command
+from seerAD.tool_handler.helper import annotate_sids, run_command, show_diff
 from seerAD.core.session import session
 
 console = Console()
@@ -65,23 +66,27 @@ def abuse_callback(ctx: typer.Context):
     Handle abuse commands dynamically:
     abuse <command> <auth_method> [args...]
     """
-    if not ctx.args:
+    diff = "--diff" in ctx.args  # show only what changed since the last run
+    sids = "--sids" in ctx.args  # name the SIDs in the output from the SID cache
+    args = [a for a in ctx.args if a not in ("--diff", "--sids")]
+    if not args:
         list_modules()
         return
 
-    module = ctx.args[0]
-    method = ctx.args[1] if len(ctx.args) > 1 else "anon"
-    extra_args = ctx.args[2:] if len(ctx.args) > 2 else []
+    module = args[0]
+    method = args[1] if len(args) > 1 else "anon"
+    extra_args = args[2:] if len(args) > 2 else []
 
     if module not in COMMANDS:
         console.print(f"[red][!] Unknown command: {module}[/]\n")
         list_modules()
         return
     # Ticket fallback logic
-    if method == "anon" and session.current_credential.get("ticket") and len(ctx.args) == 1:
+    if method == "anon" and session.current_credential.get("ticket") and len(args) == 1:
         method = "ticket"
 
     try:
-        run_command(module, method, extra_args, COMMANDS)
+        with show_diff() if diff else nullcontext(), annotate_sids() if sids else nullcontext():
+            run_command(module, method, extra_args, COMMANDS)
     except Exception as e:
         console.print(f"[red][!] Error: {e}[/]")
\ No newline at end of file
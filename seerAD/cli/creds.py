@@ -1,4 +1,4 @@
-import typer, os, shutil, subprocess
+import typer, os, subprocess
 from pathlib import Path
 from typing import Optional, List
 from rich.console import Console
@@ -42,6 +42,20 @@ def display_credentials(creds: List[dict]):
 
     console.print(table)
 
+FILE_DIRS = {"ticket": "tickets", "cert": "certs"}
+
+def _keep_file(field: str, value: Optional[str], username: str) -> Optional[str]:
+    """A ticket/cert path given by the user is copied into the target's loot dir (a private, writable copy)."""
+    if field not in FILE_DIRS or not value or not Path(value).is_file():
+        return value
+    from seerAD.core import blobs
+    src = Path(value)
+    suffix = src.suffix or (".ccache" if field == "ticket" else ".pfx")
+    dest = LOOT_DIR / session.current_target_label / FILE_DIRS[field] / f"{username}{suffix}"
+    if src.resolve() == dest.resolve():
+        return value
+    return str(blobs.keep_private(src, dest, keep_source=True))
+
 @creds_app.command("add")
 def creds_add(
     username: str = typer.Argument(...),
@@ -76,8 +90,8 @@ def creds_add(
         ntlm=ntlm,
         aes128=aes128,
         aes256=aes256,
-        ticket=ticket,
-        cert=cert,
+        ticket=_keep_file("ticket", ticket, username),
+        cert=_keep_file("cert", cert, username),
         notes=notes
     )
 
@@ -152,7 +166,7 @@ def creds_set(
         console.print("[red]Invalid field. Allowed: password, ntlm, aes128, aes256, ticket, cert, domain, notes[/]")
         return
 
-    clean_value = None if value.strip() == "" else value
+    clean_value = None if value.strip() == "" else _keep_file(field, value, cred["username"])
     updated = session.update_credential(session.current_target_label, cred["username"], **{field: clean_value})
     if updated:
         console.print(f"[green]✔ Updated {field}[/]")
@@ -252,20 +266,13 @@ def fetch_creds():
 
         if success:
             result_path = Path(result)
-            cwd_path = Path.cwd() / result_path.name
-
-            try:
-                shutil.copy(result_path, cwd_path)
-                session.update_credential(session.current_target_label, username, ticket=str(result_path))
-                console.print(f"[green]✔ Ticket saved:[/] {result_path}")
-                console.print(f"[green]✔ Credential updated with ticket path[/]")
-                console.print(f"[green]✔ Ticket also copied to:[/] {cwd_path}")
-
-                if result_path.exists():
-                    os.environ["KRB5CCNAME"] = str(result_path)
-                    console.print(f"[✔] KRB5CCNAME set to: {result_path}")
-            except Exception as e:
-                console.print(f"[red]✘ Failed to copy or update credential:[/] {e}")
+            session.update_credential(session.current_target_label, username, ticket=str(result_path))
+            console.print(f"[green]✔ Ticket saved:[/] {result_path}")
+            console.print(f"[green]✔ Credential updated with ticket path[/]")
+
+            if result_path.exists():
+                os.environ["KRB5CCNAME"] = str(result_path)
+                console.print(f"[✔] KRB5CCNAME set to: {result_path}")
         else:
             console.print(f"[red]Ticket fetch failed:[/] {result}")
     
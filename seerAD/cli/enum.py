@@ -1,9 +1,11 @@
+import time
 import typer
+from contextlib import nullcontext
 from typing import List, Optional
 from rich.console import Console
 from seerAD.tool_handler.impacket_helper import run_impacket
 from seerAD.tool_handler.nxc_helper import run_nxc
-from seerAD.tool_handler.helper import run_command
+from seerAD.tool_handler.helper import annotate_sids, run_command, show_diff
 from seerAD.core.session import session
 
 console = Console()
@@ -34,6 +36,47 @@ COMMANDS = {
     "ftp":              lambda m, a: run_nxc("ftp", m, a),
 }
 
+# Ports a module needs (any one of them), checked against the service inventory before it runs
+PORTS = {
+    "adcomputers": (389, 636), "adusers": (389, 636), "userspns": (389, 636), "finddelegation": (389, 636),
+    "npusers": (88,), "gettgt": (88,),
+    "lookupsid": (445,), "samrdump": (445,), "netview": (445,), "rpcdump": (135,),
+    "smb": (445,), "ldap": (389, 636), "ssh": (22,), "mssql": (1433,), "winrm": (5985, 5986),
+    "wmi": (135,), "rdp": (3389,), "vnc": (5900,), "nfs": (2049,), "ftp": (21,),
+}
+
+def _port_arg(args: List[str]) -> Optional[int]:
+    """The port given to the tool (nxc --port N, impacket -port N), if any."""
+    for i, arg in enumerate(args):
+        name, eq, value = arg.partition("=")
+        if name not in ("--port", "-port"):
+            continue
+        if not eq:
+            value = args[i + 1] if i + 1 < len(args) else ""
+        return int(value) if value.isdigit() else None
+    return None
+
+def port_check(module: str, args: List[str] = ()) -> bool:
+    """False, with a note, when none of the module's ports (or the port in args) is open on the current target."""
+    port = _port_arg(args)
+    ports = (port,) if port and module in PORTS else PORTS.get(module)
+    target = session.current_target or {}
+    if not ports or not target.get("ip"):
+        return True
+    from seerAD.core import services
+    try:
+        found = services.check(session.current_target_label, target["ip"], ports)
+    except Exception:
+        return True  # the check must never be what stops a run
+    if not found or any(e["state"] == "open" for e in found.values()):
+        return True
+    newest = max(found.values(), key=lambda e: e["updated"])
+    age = time.time() - newest["updated"]
+    seen = f"{newest['source']}, " + ("just now" if age < 60 else f"{age / 60:.0f}m ago")
+    console.print(f"[yellow]✘ Skipping {module}: port {'/'.join(map(str, ports))} is {newest['state']} on {target['ip']} "
+                  f"({seen}). Add --force to run it anyway.[/]")
+    return False
+
 def list_modules():
     """List available enumeration modules"""
     console.print("[cyan bold]Available Enum Modules:[/]")
@@ -44,21 +87,28 @@ def list_modules():
 def enum_callback(ctx: typer.Context):
     """Handle enum commands dynamically
     enum <command> <auth_method> [args...]"""
-    if not ctx.args:
+    diff = "--diff" in ctx.args  # show only what changed since the last run
+    sids = "--sids" in ctx.args  # name the SIDs in the output from the SID cache
+    force = "--force" in ctx.args  # run even when the module's port looks closed
+    args = [a for a in ctx.args if a not in ("--diff", "--sids", "--force")]
+    if not args:
         list_modules()
         return
-    module = ctx.args[0]
-    method = ctx.args[1] if len(ctx.args) > 1 else "anon"
-    extra_args = ctx.args[2:] if len(ctx.args) > 2 else []
+    module = args[0]
+    method = args[1] if len(args) > 1 else "anon"
+    extra_args = args[2:] if len(args) > 2 else []
     if module not in COMMANDS:
         console.print(f"[red][!] Unknown command: {module}[/]\n")
         console.print(list_modules())
         return
     # Ticket fallback logic
-    if method == "anon" and session.current_credential.get("ticket") and len(ctx.args) == 1:
+    if method == "anon" and session.current_credential.get("ticket") and len(args) == 1:
         method = "ticket"
+    if not force and not port_check(module, extra_args):
+        return
     try:
-        run_command(module, method, extra_args, COMMANDS)
+        with show_diff() if diff else nullcontext(), annotate_sids() if sids else nullcontext():
+            run_command(module, method, extra_args, COMMANDS)
     except Exception as e:
         console.print(f"[red][!] Error: {e}[/]")
         return
\ No newline at end of file
@@ -0,0 +1,109 @@
+import time
+import typer
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table, box
+
+console = Console()
+graph_app = typer.Typer(help="Import BloodHound data and find attack paths")
+
+AUTH_ORDER = ("ticket", "password", "ntlm", "aes256", "aes128")
+
+def _target_label(target: Optional[str]) -> str:
+    from seerAD.core.session import session
+
+    label = target or session.current_target_label
+    if not label:
+        console.print("[red]✘ No target selected. Use 'target switch <label>' or pass --target.[/]")
+        raise typer.Exit(1)
+    return label
+
+def _auth(cred: dict) -> str:
+    return next((m for m in AUTH_ORDER if cred.get(m)), "<auth>")
+
+@graph_app.command("import")
+def graph_import(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="BloodHound zip (SharpHound / bloodhound-python)"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Store the graph for this target (default: current)"),
+):
+    """Stream a BloodHound zip into a compact on-disk graph."""
+    from seerAD.core import sids
+    from seerAD.core.graph import graph_dir, import_bloodhound
+
+    label = _target_label(target)
+    start = time.perf_counter()
+    try:
+        graph = import_bloodhound(path)
+    except Exception as e:
+        console.print(f"[red]✘ Could not import {path}: {e}[/]")
+        raise typer.Exit(1)
+    graph.save(graph_dir(label), source=str(path.resolve()))
+    sids.remember(graph.sid_entries(), "bloodhound")
+    elapsed = time.perf_counter() - start
+    console.print(f"[green]✔ Imported {len(graph):,} objects and {graph.edge_count:,} edges for '{label}' in {elapsed:.1f}s.[/]")
+
+@graph_app.command("path")
+def graph_path(
+    to: str = typer.Option("DOMAIN ADMINS", "--to", help="Target object: name, name without @DOMAIN, or SID"),
+    source: Optional[str] = typer.Option(None, "--from", help="Start object (default: the current credential)"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Use this target's graph (default: current)"),
+):
+    """Shortest attack path, with the abuse command for each step."""
+    from seerAD.core.graph import EDGE_TYPES, Graph, KINDS, abuse_hint, account_name, graph_dir
+    from seerAD.core.session import session
+
+    label = _target_label(target)
+    directory = graph_dir(label)
+    if not (directory / "meta.json").exists():
+        console.print(f"[yellow]No graph for '{label}'. Run 'graph import <bloodhound.zip>' first.[/]")
+        raise typer.Exit(1)
+    start = time.perf_counter()
+    try:
+        graph = Graph.load(directory)
+    except ValueError as e:
+        console.print(f"[red]✘ {e}[/]")
+        raise typer.Exit(1)
+    loaded = time.perf_counter()
+
+    cred = session.current_credential or {}
+    defaulted = not source
+    if defaulted:
+        if not cred.get("username"):
+            console.print("[red]✘ No current credential. Use 'creds use <username>' or pass --from.[/]")
+            raise typer.Exit(1)
+        domain = cred.get("domain") or (session.current_target or {}).get("domain") or ""
+        source = f"{cred['username']}@{domain}" if domain else cred["username"]
+    sources, goals = graph.find(source), graph.find(to)
+    for query, found in ((source, sources), (to, goals)):
+        if not found:
+            console.print(f"[red]✘ '{escape(query)}' is not in the graph.[/]")
+            raise typer.Exit(1)
+
+    path = graph.shortest_path(sources[0], goals)
+    elapsed = (time.perf_counter() - loaded) * 1000
+    timing = f"[dim]Loaded {len(graph):,} objects in {(loaded - start) * 1000:.0f} ms, searched in {elapsed:.1f} ms.[/]"
+    if path is None:
+        console.print(f"[yellow]No path from {escape(graph.names[sources[0]])} to {escape(to)}.[/]")
+        console.print(timing)
+        return
+    if not path:
+        console.print(f"[green]✔ {escape(graph.names[sources[0]])} already is {escape(to)}.[/]")
+        return
+
+    me = cred["username"] if defaulted else account_name(graph.names[sources[0]], graph.kinds[sources[0]])
+    auth = _auth(cred)
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["#", "From", "Edge", "To", "Abuse"]:
+        table.add_column(col, style="cyan", overflow="fold" if col == "Abuse" else None)
+    for step, (src, edge, dst) in enumerate(path, 1):
+        name = EDGE_TYPES[edge]
+        hint = abuse_hint(name, account_name(graph.names[dst], graph.kinds[dst]), graph.kinds[dst], me, auth)
+        table.add_row(str(step), escape(graph.names[src]), name,
+                      f"{escape(graph.names[dst])} [dim]({KINDS[graph.kinds[dst]]})[/]", escape(hint) or "[dim]-[/]")
+    console.print(table)
+    console.print(timing)
+
+# Attach to main app
+app = graph_app
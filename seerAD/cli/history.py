@@ -0,0 +1,48 @@
+import re
+import typer
+from typing import Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table, box
+
+console = Console()
+history_app = typer.Typer(help="Shell command history")
+
+@history_app.command("search")
+def history_search(
+    pattern: str = typer.Argument(..., help="Regular expression matched against commands"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Only commands run against this target"),
+    cred: Optional[str] = typer.Option(None, "--cred", "-c", help="Only commands run as this credential"),
+    limit: int = typer.Option(50, "--limit", "-n", help="Maximum number of results"),
+):
+    """Search the interactive shell history, newest first."""
+    from seerAD.core.history import get_history
+
+    try:
+        results = get_history().search(pattern, target=target, cred=cred, limit=limit)
+    except re.error as e:
+        console.print(f"[red]✘ Invalid regex:[/] {e}")
+        return
+
+    if not results:
+        console.print("[yellow]No matching commands.[/]")
+        return
+
+    regex = re.compile(pattern)
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Time", "Target", "Credential", "Command"]:
+        table.add_column(col, style="cyan")
+    for entry in results:
+        cmd = entry.get("cmd", "")
+        m = regex.search(cmd)
+        highlighted = escape(cmd[:m.start()]) + f"[bold yellow]{escape(m.group(0))}[/]" + escape(cmd[m.end():])
+        table.add_row(
+            (entry.get("ts") or "-")[:19].replace("T", " "),
+            entry.get("target") or "-",
+            entry.get("cred") or "-",
+            highlighted,
+        )
+    console.print(table)
+
+# Attach to main app
+app = history_app
@@ -0,0 +1,129 @@
+import time
+import typer
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table, box
+
+console = Console()
+ldap_app = typer.Typer(help="Query an imported ldapdomaindump offline")
+
+QUESTIONS = {
+    "kerberoastable": "Enabled users with an SPN",
+    "asreproastable": "Enabled accounts with DONT_REQ_PREAUTH",
+    "unconstrained": "Unconstrained delegation (domain controllers excluded)",
+    "constrained": "Constrained delegation / protocol transition",
+    "stale": "Users whose password is older than --days",
+    "description": "Descriptions matching --regex, or containing every --word",
+    "spn": "Accounts with an SPN of --service (e.g. mssqlsvc)",
+    "flag": "Accounts with userAccountControl --flag (e.g. PASSWD_NOTREQD)",
+}
+HINTS = {
+    "kerberoastable": "Roast them with 'enum userspns <auth> -request'.",
+    "asreproastable": "Roast them with 'enum npusers <auth> -request'.",
+}
+
+def _target_label(target: Optional[str]) -> str:
+    from seerAD.core.session import session
+
+    label = target or session.current_target_label
+    if not label:
+        console.print("[red]✘ No target selected. Use 'target switch <label>' or pass --target.[/]")
+        raise typer.Exit(1)
+    return label
+
+def _date(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d") if epoch else "never"
+
+@ldap_app.command("import")
+def ldap_import(
+    path: Path = typer.Argument(..., exists=True, file_okay=False, help="ldapdomaindump output dir (with the .json files)"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Store the data for this target (default: current)"),
+):
+    """Load users, computers and groups from an ldapdomaindump into an indexed local store."""
+    from seerAD.core.ldapstore import import_dump, store_dir
+
+    label = _target_label(target)
+    start = time.perf_counter()
+    try:
+        store = import_dump(path).save(store_dir(label), source=str(path.resolve()))
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[red]✘ Could not import {path}: {e}[/]")
+        raise typer.Exit(1)
+    counts = ", ".join(f"{n:,} {kind}s" for kind, n in store.meta["counts"].items())
+    console.print(f"[green]✔ Imported {counts} for '{label}' in {time.perf_counter() - start:.1f}s.[/]")
+
+@ldap_app.command("query")
+def ldap_query(
+    question: str = typer.Argument(..., help=", ".join(QUESTIONS)),
+    regex: Optional[str] = typer.Option(None, "--regex", "-r", help="description: regular expression (case-insensitive)"),
+    word: Optional[List[str]] = typer.Option(None, "--word", "-w", help="description: whole word (repeatable)"),
+    service: Optional[str] = typer.Option(None, "--service", "-s", help="spn: service class"),
+    flag: Optional[str] = typer.Option(None, "--flag", "-f", help="flag: userAccountControl flag name"),
+    days: int = typer.Option(365, "--days", "-d", help="stale: password age in days"),
+    disabled: bool = typer.Option(False, "--disabled", help="Include disabled accounts"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Query this target's data (default: current)"),
+    limit: int = typer.Option(100, "--limit", "-n", help="Maximum number of rows shown"),
+):
+    """Answer common recon questions from the imported LDAP data, without touching the DC."""
+    from seerAD.core.ldapstore import LdapStore, UAC_FLAGS, store_dir
+
+    if question not in QUESTIONS:
+        raise typer.BadParameter(f"one of {', '.join(QUESTIONS)}", param_hint="QUESTION")
+    label = _target_label(target)
+    directory = store_dir(label)
+    if not (directory / "meta.json").exists():
+        console.print(f"[yellow]No LDAP data for '{label}'. Run 'ldap import <ldapdomaindump dir>' first.[/]")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    try:
+        store = LdapStore(directory)
+        if question == "description":
+            if not regex and not word:
+                raise typer.BadParameter("give --regex or --word", param_hint="description")
+            bits = store.description_regex(regex, disabled) if regex else store.description_words(word, disabled)
+            if regex and word:
+                bits &= store.description_words(word, disabled)
+        elif question == "spn":
+            if not service:
+                raise typer.BadParameter("give --service", param_hint="spn")
+            bits = store.spn_service(service, disabled)
+        elif question == "flag":
+            if not flag or flag.upper() not in UAC_FLAGS:
+                raise typer.BadParameter(f"one of {', '.join(UAC_FLAGS)}", param_hint="--flag")
+            bits = store.flag(flag, disabled)
+        elif question == "stale":
+            bits = store.stale(days, disabled)
+        else:
+            bits = getattr(store, question)(disabled)
+        total = bin(bits).count("1")
+        rows = store.rows(bits, limit)
+    except ValueError as e:  # re.error is a ValueError too
+        console.print(f"[red]✘ {e}[/]")
+        raise typer.Exit(1)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if not rows:
+        console.print(f"[yellow]No matches ({QUESTIONS[question].lower()}).[/]")
+        return
+    detail = {"kerberoastable": "SPNs", "spn": "SPNs", "stale": "Password set", "flag": "Flags",
+              "unconstrained": "Flags", "constrained": "Flags", "asreproastable": "Flags"}.get(question, "Description")
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta", title=QUESTIONS[question])
+    for col in ["Account", "Kind", detail, "Last logon"]:
+        table.add_column(col, style="cyan", overflow="fold" if col == detail else None)
+    for row in rows:
+        value = {"SPNs": ", ".join(row["spns"]), "Password set": _date(row["pwd_last_set"]),
+                 "Flags": ", ".join(f for f in row["flags"] if f != "NORMAL_ACCOUNT"),
+                 "Description": row["description"]}[detail]
+        table.add_row(escape(row["sam"]), row["kind"], escape(value), _date(row["last_logon"]))
+    console.print(table)
+    shown = f"{len(rows)} of {total}" if total > len(rows) else str(total)
+    console.print(f"[dim]{shown} match(es) out of {len(store):,} objects in {elapsed:.1f} ms.[/]")
+    if question in HINTS:
+        console.print(f"[dim]{HINTS[question]}[/]")
+
+# Attach to main app
+app = ldap_app
@@ -0,0 +1,136 @@
+import re
+import time
+import typer
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table, box
+from seerAD.config import LOOT_DIR
+
+console = Console()
+loot_app = typer.Typer(help="Search captured tool output and the facts parsed from it")
+
+SINCE_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def _since(value: Optional[str]) -> Optional[float]:
+    """'90m', '2h', '3d' -> epoch seconds that long ago."""
+    if not value:
+        return None
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([mhd])", value.strip().lower())
+    if not m:
+        raise typer.BadParameter("use a number with m, h or d (e.g. 2h)", param_hint="--since")
+    return time.time() - float(m.group(1)) * SINCE_UNITS[m.group(2)]
+
+def _relative(path: str) -> str:
+    try:
+        return str(Path(path).relative_to(LOOT_DIR))
+    except ValueError:
+        return path
+
+def _highlight(snippet: str) -> str:
+    from seerAD.core.loot import HIT_START, HIT_END
+    parts = re.split(f"({HIT_START}|{HIT_END})", snippet)
+    out, inside = [], False
+    for part in parts:
+        if part == HIT_START:
+            inside = True
+        elif part == HIT_END:
+            inside = False
+        elif part:
+            out.append(f"[bold yellow]{escape(part)}[/]" if inside else escape(part))
+    return "".join(out)
+
+@loot_app.command("search")
+def loot_search(
+    query: str = typer.Argument(..., help='Words, "phrases", prefix* and AND/OR/NOT'),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Only output from this target"),
+    module: Optional[str] = typer.Option(None, "--module", "-m", help="Only this module (e.g. ldap, GetUserSPNs)"),
+    cred: Optional[str] = typer.Option(None, "--cred", "-c", help="Only output captured as this credential"),
+    since: Optional[str] = typer.Option(None, "--since", "-s", help="Only the last 90m / 2h / 3d"),
+    limit: int = typer.Option(50, "--limit", "-n", help="Maximum number of results"),
+):
+    """Search the output of every tool run, newest first."""
+    from seerAD.core.loot import search
+
+    start = time.perf_counter()
+    hits = search(query, target=target, module=module, cred=cred, since=_since(since), limit=limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not hits:
+        console.print("[yellow]No matches.[/]")
+        return
+
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Time", "Target", "Module", "Credential", "Line", "Output"]:
+        table.add_column(col, style="cyan", overflow="fold" if col == "Line" else None)
+    for hit in hits:
+        table.add_row(
+            datetime.fromtimestamp(hit["ts"]).strftime("%m-%d %H:%M"),
+            hit["target"] or "-",
+            hit["module"] or "-",
+            hit["cred"] or "-",
+            _highlight(hit["snippet"]),
+            f"[dim]{_relative(hit['path'])}:{hit['lineno']}[/]",
+        )
+    console.print(table)
+    console.print(f"[dim]{len(hits)} hit(s) in {elapsed:.1f} ms. Output files are under {LOOT_DIR}[/]")
+
+@loot_app.command("list")
+def loot_list(
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Only runs against this target"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum number of runs"),
+):
+    """List recent tool runs and where their output is stored."""
+    from seerAD.core.loot import recent_runs
+
+    runs = recent_runs(target=target, limit=limit)
+    if not runs:
+        console.print("[yellow]No tool output captured yet.[/]")
+        return
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Time", "Target", "Module", "Credential", "Exit", "Lines", "File"]:
+        table.add_column(col, style="cyan", overflow="fold" if col == "File" else None)
+    for run in runs:
+        table.add_row(
+            datetime.fromtimestamp(run["ts"]).strftime("%m-%d %H:%M"),
+            run["target"] or "-",
+            run["module"] or "-",
+            run["cred"] or "-",
+            "-" if run["rc"] is None else str(run["rc"]),
+            str(run["line_count"] or 0),
+            _relative(run["path"]),
+        )
+    console.print(table)
+
+FACT_TYPES = ("user", "group", "share", "sid", "valid-login", "hash")
+FACT_FIELDS = ("type", "key", "target", "module")  # shown in their own columns
+
+@loot_app.command("facts")
+def loot_facts(
+    type_: Optional[str] = typer.Option(None, "--type", "-T", help="user, group, share, sid, valid-login or hash"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Only facts about this target (default: current)"),
+    match: Optional[str] = typer.Option(None, "--match", "-m", help="Only facts whose key contains this"),
+    limit: int = typer.Option(100, "--limit", "-n", help="Maximum number of facts"),
+):
+    """List users, groups, shares, SIDs, valid logins and hashes parsed from tool output."""
+    from seerAD.core.facts import query_facts
+    from seerAD.core.session import session
+
+    if type_ and type_ not in FACT_TYPES:
+        raise typer.BadParameter(f"one of {', '.join(FACT_TYPES)}", param_hint="--type")
+    facts = query_facts(target=target or session.current_target_label, type_=type_, match=match, limit=limit)
+    if not facts:
+        console.print("[yellow]No facts recorded yet. They are parsed from the output of enum/abuse runs.[/]")
+        return
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Type", "Key", "Details", "Module", "Last seen"]:
+        table.add_column(col, style="cyan", overflow="fold" if col == "Details" else None)
+    for fact in facts:
+        details = "  ".join(f"{k}={v}" for k, v in fact["data"].items() if k not in FACT_FIELDS)
+        table.add_row(fact["type"], escape(fact["key"]), escape(details), fact["module"] or "-",
+                      datetime.fromtimestamp(fact["last_seen"]).strftime("%m-%d %H:%M"))
+    console.print(table)
+
+# Attach to main app
+app = loot_app
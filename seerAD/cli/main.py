@@ -11,6 +11,25 @@ app = typer.Typer(
     add_completion=False,
 )
 
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", envvar="SEER_PROFILE",
+                                 help="Profile the command; see 'profile last'"),
+):
+    if not profile or ctx.resilient_parsing or ctx.invoked_subcommand in ("profile", "serve"):
+        return
+    from seerAD.core.profiler import Profiler
+
+    profiler = Profiler(ctx.invoked_subcommand or "command")
+
+    def save():
+        pstats_file, folded_file = profiler.stop()
+        console.print(f"[dim]Profile saved: {pstats_file} (+ {folded_file.suffix})[/]")
+
+    profiler.start()
+    ctx.call_on_close(save)
+
 @app.command("version")
 def version():
     """Show the SeerAD version."""
@@ -30,12 +49,32 @@ from seerAD.cli import reset as reset_cmd
 from seerAD.cli import target as target_cmd
 from seerAD.cli import creds as creds_cmd
 from seerAD.cli import timewrap as timewrap_cmd
+from seerAD.cli import roast as roast_cmd
+from seerAD.cli import history as history_cmd
+from seerAD.cli import run as run_cmd
+from seerAD.cli import serve as serve_cmd
+from seerAD.cli import stats as stats_cmd
+from seerAD.cli import profile as profile_cmd
+from seerAD.cli import loot as loot_cmd
+from seerAD.cli import graph as graph_cmd
+from seerAD.cli import ldap as ldap_cmd
+from seerAD.cli import sid as sid_cmd
 # from seerAD.cli import smart as smart_cmd
 
 # Register CLI commands
 app.command("reset")(reset_cmd.reset_session)
+app.command("run")(run_cmd.run_playbook)
+app.command("serve")(serve_cmd.serve)
+app.command("stats")(stats_cmd.stats)
 app.add_typer(target_cmd.app, name="target", help="Manage targets")
 app.add_typer(creds_cmd.app, name="creds", help="Manage credentials")
 app.add_typer(timewrap_cmd.app, name="timewrap", help="Time management commands")
+app.add_typer(roast_cmd.app, name="roast", help="Roast hash management")
+app.add_typer(history_cmd.app, name="history", help="Search shell history")
+app.add_typer(profile_cmd.app, name="profile", help="Inspect command profiles")
+app.add_typer(loot_cmd.app, name="loot", help="Search captured tool output")
+app.add_typer(graph_cmd.app, name="graph", help="BloodHound attack paths")
+app.add_typer(ldap_cmd.app, name="ldap", help="Offline LDAP queries over an ldapdomaindump")
+app.add_typer(sid_cmd.app, name="sid", help="Resolve SIDs to names")
 
 # app.command("smart")(smart_cmd.app)
\ No newline at end of file
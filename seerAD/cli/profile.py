@@ -0,0 +1,58 @@
+import sys
+import typer
+from rich.console import Console
+from rich.table import Table, box
+
+console = Console()
+profile_app = typer.Typer(help="Inspect command profiles (seerAD --profile <command>)")
+
+SORT_KEYS = {"cumulative": 3, "tottime": 2, "calls": 1}  # index into a pstats entry
+
+def _location(filename: str, line: int) -> str:
+    """Path from the package root ('seerAD/cli/target.py:43', 'rich/console.py:1620')."""
+    if filename == "~":  # built-in
+        return ""
+    stdlib = "python{}.{}/".format(*sys.version_info[:2])
+    for marker in ("site-packages/", "dist-packages/", "/seerAD/", stdlib):
+        if marker in filename:
+            filename = filename.rsplit(marker, 1)[1]
+            if marker == "/seerAD/":
+                filename = "seerAD/" + filename
+            break
+    return f"{filename}:{line}" if line else filename
+
+@profile_app.command("last")
+def profile_last(
+    limit: int = typer.Option(25, "--limit", "-n", help="Number of functions to show"),
+    sort: str = typer.Option("cumulative", "--sort", "-s", help="cumulative, tottime or calls"),
+):
+    """Show the hotspots of the most recent profiled command."""
+    import pstats
+    from seerAD.core.profiler import last_profile
+
+    if sort not in SORT_KEYS:
+        console.print(f"[red]✘ Unknown sort key:[/] {sort} (use {', '.join(SORT_KEYS)})")
+        return
+    path = last_profile()
+    if path is None:
+        console.print("[yellow]No profiles yet. Run a command with --profile or SEER_PROFILE=1.[/]")
+        return
+
+    stats = pstats.Stats(str(path)).stats
+    rows = sorted(stats.items(), key=lambda item: -item[1][SORT_KEYS[sort]])[:limit]
+    table = Table(title=f"{path.stem} ({sort})", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Calls", "Own", "Cumulative", "Function"]:
+        table.add_column(col, style="cyan", justify="left" if col == "Function" else "right")
+    for (filename, line, func), (prim_calls, calls, own, cumulative, _) in rows:
+        table.add_row(
+            str(calls) if calls == prim_calls else f"{calls}/{prim_calls}",
+            f"{own:.3f}s",
+            f"{cumulative:.3f}s",
+            f"{func} [dim]{_location(filename, line)}[/]",
+        )
+    console.print(table)
+    console.print(f"[dim]pstats: {path}[/]")
+    console.print(f"[dim]flamegraph: {path.with_suffix('.folded')}[/]")
+
+# Attach to main app
+app = profile_app
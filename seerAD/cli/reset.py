@@ -27,6 +27,8 @@ def reset_session(
 
         session_file = LOOT_DIR / "session.json"
         session_file.unlink(missing_ok=True)
+        for index_file in LOOT_DIR.glob("loot.db*"):  # output search index (+ WAL files)
+            index_file.unlink(missing_ok=True)
 
         session.reset()
 
@@ -0,0 +1,96 @@
+import typer
+from pathlib import Path
+from typing import Optional, List
+from rich.console import Console
+from rich.table import Table, box
+
+from seerAD.core.session import session
+from seerAD.core.roast import RoastStore
+from seerAD.config import LOOT_DIR
+
+console = Console()
+roast_app = typer.Typer(help="Kerberoast / AS-REP roast hash management")
+
+@roast_app.command("list")
+def roast_list():
+    """List captured roast hashes for the current target."""
+    if not session.current_target_label:
+        console.print("[red]No active target.[/]")
+        return
+
+    entries = RoastStore(session.current_target_label).get_all()
+    if not entries:
+        console.print("[yellow]No roast hashes captured. Run 'enum userspns' or 'enum npusers' first.[/]")
+        return
+
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["User", "Type", "SPN", "Etype", "Mode", "Cracked"]:
+        table.add_column(col, style="cyan")
+    for e in sorted(entries, key=lambda e: (e["kind"], e["user"].lower())):
+        table.add_row(
+            e["user"],
+            "kerberoast" if e["kind"] == "tgs" else "asreproast",
+            e["spn"] or "-",
+            str(e["etype"]),
+            str(e.get("mode") or "-"),
+            f"[bold green]{e['cracked']}[/]" if e.get("cracked") else "✘",
+        )
+    console.print(table)
+
+@roast_app.command("export")
+def roast_export(
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Output directory (default: loot dir of the target)"),
+    mode: Optional[List[int]] = typer.Option(None, "--mode", "-m", help="Only export these hashcat modes"),
+    all_: bool = typer.Option(False, "--all", "-a", help="Include hashes that are already cracked"),
+):
+    """Export hashes into one file per hashcat mode."""
+    if not session.current_target_label:
+        console.print("[red]No active target.[/]")
+        return
+
+    out_dir = out or LOOT_DIR / session.current_target_label / "roast"
+    written = RoastStore(session.current_target_label).export(out_dir, modes=mode, include_cracked=all_)
+    if not written:
+        console.print("[yellow]No hashes to export.[/]")
+        return
+
+    for m, (path, count) in sorted(written.items()):
+        console.print(f"[green]✔ {count} hash(es) → {path}[/]")
+        console.print(f"  [dim]hashcat -m {m} {path} <wordlist>[/]")
+
+@roast_app.command("import")
+def roast_import(
+    potfile: Path = typer.Argument(..., help="hashcat potfile or '--show' output (hash:password)"),
+):
+    """Import cracked hashes and map them onto credentials."""
+    if not session.current_target_label:
+        console.print("[red]No active target.[/]")
+        return
+
+    if not potfile.exists():
+        console.print(f"[red]✘ File not found:[/] {potfile}")
+        return
+
+    label = session.current_target_label
+    store = RoastStore(label)
+    with open(potfile, errors="replace") as f:
+        cracked = store.match_cracked(f)
+
+    if not cracked:
+        console.print("[yellow]No cracked hashes matched this target.[/]")
+        return
+    store.save()
+
+    for entry, password in cracked:
+        username = entry["user"]
+        domain = entry["realm"].lower()
+        note = "cracked kerberoast" if entry["kind"] == "tgs" else "cracked asreproast"
+        if session.get_credentials(label, username=username):
+            session.update_credential(label, username, password=password)
+            console.print(f"[green]✔ Updated password for:[/] {username}")
+        else:
+            session.add_credential(label, username=username, domain=domain, password=password, notes=note)
+            console.print(f"[green]✔ Credential added for:[/] {username}")
+
+# Attach to main app
+app = roast_app
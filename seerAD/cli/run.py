@@ -0,0 +1,64 @@
+import typer
+from pathlib import Path
+from typing import List, Optional
+from rich.console import Console
+from rich.table import Table, box
+
+console = Console()
+
+STATUS_STYLE = {"ok": "green", "failed": "red", "skipped": "yellow"}
+
+def _execute(argv: List[str]):
+    from seerAD.cli.main import app
+    app(args=argv, prog_name="seerAD", standalone_mode=False)
+
+def run_playbook(
+    playbook: Path = typer.Argument(..., help="Playbook YAML file"),
+    parallel: Optional[int] = typer.Option(None, "--parallel", "-j", help="Steps to run at once (default: playbook's 'parallel' or 4)"),
+    resume: bool = typer.Option(False, "--resume", "-r", help="Skip steps that already succeeded in the last run"),
+):
+    """
+    Run a playbook of seerAD commands as a dependency graph in one process.
+    """
+    from seerAD.core.playbook import Playbook, PlaybookError, PlaybookRunner
+
+    if not playbook.exists():
+        console.print(f"[red]✘ File not found:[/] {playbook}")
+        raise typer.Exit(1)
+    try:
+        book = Playbook(playbook)
+    except PlaybookError as e:
+        console.print(f"[red]✘ {e}[/]")
+        raise typer.Exit(1)
+
+    def on_event(event, step, result):
+        if event == "start":
+            console.print(f"[blue]→ {step.id}[/]")
+        elif event == "cached":
+            console.print(f"[dim]✔ {step.id} (done in previous run)[/]")
+        elif event == "ok":
+            console.print(f"[green]✔ {step.id}[/]")
+        elif event == "failed":
+            console.print(f"[red]✘ {step.id}: {result.get('error')}[/]")
+        elif event == "skipped":
+            console.print(f"[yellow]↷ {step.id} skipped (dependency failed)[/]")
+
+    runner = PlaybookRunner(book, _execute, parallel=parallel, resume=resume)
+    try:
+        status = runner.run(on_event)
+    except PlaybookError as e:
+        console.print(f"[red]✘ {e}[/]")
+        raise typer.Exit(1)
+
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["Step", "Status", "Log"]:
+        table.add_column(col, style="cyan")
+    for sid in book.order:
+        st = status.get(sid, "skipped")
+        entry = runner.state.get(sid, {})
+        table.add_row(sid, f"[{STATUS_STYLE[st]}]{st}[/]", entry.get("file", "-"))
+    console.print(table)
+
+    if any(st != "ok" for st in status.values()):
+        console.print(f"[yellow]Fix the failing step and re-run with --resume to continue.[/]")
+        raise typer.Exit(1)
@@ -0,0 +1,29 @@
+import typer
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+
+console = Console()
+
+def serve(
+    socket: Optional[Path] = typer.Option(None, "--socket", "-s", help="Socket path (default: <data dir>/seer.sock, or $SEER_SOCKET)"),
+):
+    """
+    Keep seerAD resident so one-shot commands skip startup and session loading.
+
+    While it runs, `seerAD <command>` is forwarded over the socket automatically
+    (set SEER_NO_DAEMON=1 to bypass it). Stop it with Ctrl-C.
+    """
+    from seerAD.core.daemon import serve as serve_forever
+
+    def ready(path):
+        console.print(f"[green]✔ Listening on[/] {path}")
+        console.print("[dim]One-shot seerAD commands now run through this daemon. Ctrl-C to stop.[/]")
+
+    try:
+        serve_forever(str(socket) if socket else None, on_ready=ready)
+    except RuntimeError as e:
+        console.print(f"[red]✘ {e}[/]")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        console.print("[blue][*] Daemon stopped[/]")
@@ -0,0 +1,74 @@
+import typer
+from datetime import datetime
+from typing import List, Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table, box
+
+console = Console()
+sid_app = typer.Typer(help="Resolve SIDs to names from the SID cache or the DC")
+
+AUTH_ORDER = ("ticket", "password", "ntlm", "aes256", "aes128")
+
+@sid_app.command("resolve")
+def sid_resolve(
+    sids: List[str] = typer.Argument(..., help="SIDs (S-1-5-21-...)"),
+    method: Optional[str] = typer.Option(None, "--auth", "-a", help="Auth method for the DC lookup (default: first available)"),
+    offline: bool = typer.Option(False, "--offline", help="Only answer from the cache"),
+):
+    """Name SIDs from the cache; ask the DC for the rest in one LSARPC call."""
+    from seerAD.core.session import session
+    from seerAD.core.sids import SID_RE, label, lookup, resolve_remote
+
+    wanted = [s.upper() for s in sids]
+    bad = [s for s in wanted if not SID_RE.fullmatch(s)]
+    if bad:
+        raise typer.BadParameter(f"not a SID: {', '.join(bad)}", param_hint="SIDS")
+    found = lookup(wanted)
+    missing = [s for s in dict.fromkeys(wanted) if s not in found]
+    if missing and not offline:
+        cred, target = session.current_credential or {}, session.current_target or {}
+        method = method or next((m for m in AUTH_ORDER if cred.get(m)), None)
+        if not method or not cred.get(method) or not target.get("ip"):
+            console.print("[yellow]No target or usable credential selected; showing cached names only.[/]")
+        else:
+            console.print(f"[cyan]Looking up {len(missing)} SID(s) on {target.get('fqdn') or target['ip']}...[/]")
+            try:
+                found.update(resolve_remote(missing, target, cred, method))
+            except Exception as e:
+                console.print(f"[red]✘ LSARPC lookup failed: {e}[/]")
+
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["SID", "Name", "Kind", "Source"]:
+        table.add_column(col, style="cyan")
+    for sid in dict.fromkeys(wanted):
+        entry = found.get(sid)
+        if entry:
+            table.add_row(sid, escape(label(entry)), entry.get("kind") or "-", entry.get("source") or "-")
+        else:
+            table.add_row(sid, "[dim]unknown[/]", "-", "-")
+    console.print(table)
+
+@sid_app.command("list")
+def sid_list(
+    domain: Optional[str] = typer.Option(None, "--domain", "-d", help="Domain SID or domain name"),
+    match: Optional[str] = typer.Option(None, "--match", "-m", help="Only names or SIDs containing this"),
+    limit: int = typer.Option(100, "--limit", "-n", help="Maximum number of entries"),
+):
+    """List cached SIDs, most recently seen first."""
+    from seerAD.core.sids import label, list_sids
+
+    entries = list_sids(domain=domain, match=match, limit=limit)
+    if not entries:
+        console.print("[yellow]No SIDs cached yet. They are collected from tool output, 'graph import' and 'sid resolve'.[/]")
+        return
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    for col in ["SID", "Name", "Kind", "Source", "Updated"]:
+        table.add_column(col, style="cyan")
+    for entry in entries:
+        table.add_row(entry["sid"], escape(label(entry)), entry["kind"] or "-", entry["source"] or "-",
+                      datetime.fromtimestamp(entry["updated"]).strftime("%m-%d %H:%M"))
+    console.print(table)
+
+# Attach to main app
+app = sid_app
@@ -0,0 +1,55 @@
+import time
+import typer
+from typing import Optional
+from rich.console import Console
+from rich.table import Table, box
+
+console = Console()
+
+def _duration(ms: float) -> str:
+    return f"{ms:.1f}ms" if ms < 1000 else f"{ms / 1000:.2f}s"
+
+def _size(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+def _summary_table(title: str, summary: dict, show_bytes: bool) -> Table:
+    table = Table(title=title, box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    columns = ["Name", "Count", "Failed", "p50", "p95", "p99", "Max"] + (["Output"] if show_bytes else [])
+    for col in columns:
+        table.add_column(col, style="cyan", justify="left" if col == "Name" else "right")
+    for name, row in sorted(summary.items(), key=lambda item: -item[1]["p95"]):
+        cells = [name, str(row["count"]), str(row["failed"]) if row["failed"] else "-"]
+        cells += [_duration(row[p]) for p in ("p50", "p95", "p99", "max")]
+        if show_bytes:
+            cells.append(_size(row["bytes"]))
+        table.add_row(*cells)
+    return table
+
+def stats(
+    span: str = typer.Option("tool", "--span", "-s", help="Span to break down by module and target (tool, helper, command, ...)"),
+    days: Optional[float] = typer.Option(None, "--days", "-d", help="Only the last N days"),
+):
+    """Show where time goes: p50/p95/p99 per span, and per module and target."""
+    from seerAD.core.telemetry import load_records, summarize, enabled
+
+    since = time.time() - days * 86400 if days else None
+    records = list(load_records(since))
+    if not records:
+        console.print("[yellow]No telemetry recorded yet.[/]")
+        if not enabled():
+            console.print("[dim]Recording is off (SEER_TELEMETRY=0).[/]")
+        return
+
+    console.print(_summary_table("Spans", summarize(records, "span"), show_bytes=False))
+    selected = [r for r in records if r.get("span") == span]
+    if not selected:
+        console.print(f"[yellow]No '{span}' spans recorded.[/]")
+        return
+    # Commands have no module; group them by command name instead
+    by_module = summarize(selected, lambda r: r.get("module") or r.get("command"))
+    console.print(_summary_table(f"'{span}' by module", by_module, show_bytes=True))
+    console.print(_summary_table(f"'{span}' by target", summarize(selected, "target"), show_bytes=True))
@@ -79,6 +79,125 @@ def target_add(
         session.switch_target(label)
         console.print(f"[yellow]Updated '{label}' as current target[/]")
 
+SHOWN_HOSTS = 50
+
+def add_found_hosts(hosts: list, source: str, dry_run: bool = False) -> None:
+    """
+    Show found hosts (DCs first); unless dry_run, add the new ones as targets in one
+    session write and record every host's ports in the service inventory.
+    """
+    from seerAD.core.discover import label_for
+
+    known = {t.ip: label for label, t in session.targets.items()}
+    taken = set(session.targets)
+    labels, entries, dcs = {}, {}, []
+    for host in hosts:
+        if host.ip in known:
+            labels[host.ip] = known[host.ip]
+            continue
+        label = labels[host.ip] = label_for(host, taken)
+        taken.add(label)
+        entries[label] = {"ip": host.ip, "domain": host.domain, "fqdn": host.fqdn}
+        if host.is_dc:
+            dcs.append(label)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    for col in ["Label", "IP", "Open", "FQDN", "Domain", "DC"]:
+        table.add_column(col, style="cyan")
+    for host in sorted(hosts, key=lambda h: not h.is_dc)[:SHOWN_HOSTS]:
+        label = labels[host.ip]
+        table.add_row(label if label in entries else f"[dim]{label} (exists)[/]", host.ip, ", ".join(host.open),
+                      host.fqdn or "-", host.domain or "-", "[green]yes[/]" if host.is_dc else "")
+    console.print(table)
+    if len(hosts) > SHOWN_HOSTS:
+        console.print(f"[dim]... and {len(hosts) - SHOWN_HOSTS} more host(s).[/]")
+    if dry_run:
+        return
+
+    from seerAD.core import services
+    services.record(((labels[host.ip], host.ip) + port + (host.seen,) for host in hosts for port in host.ports), source)
+    if not entries:
+        return
+    added = session.add_targets(entries)
+    console.print(f"[green]✔ Added {len(added)} target(s) ({len(dcs)} DC).[/]")
+    if not session.current_target_label:
+        first = (dcs or added)[0]
+        session.switch_target(first)
+        console.print(f"[yellow]Updated '{first}' as current target[/]")
+
+@target_app.command("discover")
+def target_discover(
+    cidr: str = typer.Argument(..., help="Network to scan, e.g. 10.10.10.0/24"),
+    timeout: float = typer.Option(1.0, "--timeout", help="Seconds per connection attempt"),
+    concurrency: int = typer.Option(512, "--concurrency", "-c", help="Connections in flight"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what was found without adding targets"),
+):
+    """Find AD hosts (Kerberos, LDAP, SMB, WinRM, MSSQL) and add them as targets."""
+    import time
+    from seerAD.core.discover import SERVICES, discover
+
+    start = time.perf_counter()
+    try:
+        hosts = discover(cidr, timeout=timeout, concurrency=concurrency)
+    except ValueError as e:
+        console.print(f"[red]✘ {e}[/]")
+        return
+    elapsed = time.perf_counter() - start
+    if not hosts:
+        console.print(f"[yellow]No host in {cidr} answered on {', '.join(map(str, SERVICES.values()))} ({elapsed:.1f}s).[/]")
+        return
+    console.print(f"[dim]{len(hosts)} host(s) found in {elapsed:.1f}s.[/]")
+    add_found_hosts(hosts, "discover", dry_run)
+
+@target_app.command("import")
+def target_import(
+    path: str = typer.Argument(..., help="nmap XML output (-oX / -oA)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what was found without adding targets"),
+):
+    """Add the hosts of an nmap scan as targets, and their ports to the service inventory."""
+    import time
+    from pathlib import Path
+    from xml.etree.ElementTree import ParseError
+    from seerAD.core.nmap import iter_hosts
+
+    if not Path(path).is_file():
+        console.print(f"[red]✘ File not found:[/] {path}")
+        return
+    start = time.perf_counter()
+    try:
+        hosts = [host for host in iter_hosts(path) if host.open]
+    except ParseError as e:
+        console.print(f"[red]✘ Not an nmap XML file ({e}).[/]")
+        return
+    elapsed = time.perf_counter() - start
+    if not hosts:
+        console.print(f"[yellow]No host with an open port in {path}.[/]")
+        return
+    console.print(f"[dim]{len(hosts)} host(s) with open ports read in {elapsed:.1f}s.[/]")
+    add_found_hosts(hosts, "nmap", dry_run)
+
+@target_app.command("services")
+def target_services(
+    label: Optional[str] = typer.Argument(None, help="Target label (default: all targets)"),
+    name: Optional[str] = typer.Option(None, "--name", "-n", help="Only services whose name contains this"),
+    port: Optional[int] = typer.Option(None, "--port", "-p", help="Only this port"),
+):
+    """List open services from the service inventory."""
+    from datetime import datetime
+    from seerAD.core.services import open_services
+
+    rows = open_services(target=label, name=name, port=port)
+    if not rows:
+        console.print("[yellow]No open services known. They come from 'target discover', 'target import' and enum port checks.[/]")
+        return
+    table = Table(show_header=True, header_style="bold magenta")
+    for col in ["Target", "IP", "Port", "Service", "Product", "Source", "Seen"]:
+        table.add_column(col, style="cyan")
+    for row in rows:
+        table.add_row(row["target"], row["ip"], f"{row['port']}/{row['proto']}", row["name"] or "-",
+                      row["product"] or "-", row["source"], datetime.fromtimestamp(row["updated"]).strftime("%m-%d %H:%M"))
+    console.print(table)
+
 @target_app.command("set")
 def target_set(
     key: str = typer.Argument(..., help="Attribute to set (ip, domain, fqdn)"),
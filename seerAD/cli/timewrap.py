@@ -1,6 +1,3 @@
-import os
-import sys
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -8,41 +5,24 @@ from typing import Optional
 import typer
 from rich.console import Console
 
-from seerAD.config import LOOT_DIR
 from seerAD.core.session import session
-from seerAD.core.utils import get_faketime_offset 
+from seerAD.core.utils import get_faketime_offset
+from seerAD.core.timewrap import (
+    FAKETIME_LIB, LEGACY_TIMEWRAP_FILE, get_timewrap, set_timewrap, clear_timewrap
+)
 
 console = Console()
 timewrap_app = typer.Typer(help="Time synchronization for Kerberos operations")
 
-TIMEWRAP_FILE = LOOT_DIR / "timewrap.json"
-
-def save_timewrap_config(dc_ip: str, offset: str):
-    data = {
-        "dc_ip": dc_ip,
-        "offset": offset,
-        "set_at": datetime.utcnow().isoformat()
-    }
-    with open(TIMEWRAP_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-
-
-def clear_env_vars():
-    os.environ.pop("LD_PRELOAD", None)
-    os.environ.pop("FAKETIME", None)
-
-
-def reset():
-    clear_env_vars()
-    if TIMEWRAP_FILE.exists():
-        TIMEWRAP_FILE.unlink()
-    console.print("✔ Timewrap reset to system time", style="green")
 
 @timewrap_app.command("set")
-def set_time(dc_ip: Optional[str] = typer.Argument(None, help="DC IP to sync time from")):
+def set_time(
+    dc_ip: Optional[str] = typer.Argument(None, help="DC IP to sync time from"),
+    refresh: bool = typer.Option(False, "--refresh", "-r", help="Ignore the cached skew measurement"),
+):
     """
-    Set timewrap using skew from DC.
-    Creates/updates timewrap file and restarts the application.
+    Set timewrap for the current target using skew from DC.
+    Tools run against this target are started under libfaketime; the shell itself is untouched.
     """
 
     if not session.current_target_label:
@@ -54,67 +34,84 @@ def set_time(dc_ip: Optional[str] = typer.Argument(None, help="DC IP to sync tim
         if not dc_ip:
             console.print("[red]No DC IP provided or found in current target.[/]")
             return
-    
-    if os.getenv("LD_PRELOAD") and "libfaketime" in os.getenv("LD_PRELOAD", ""):
-        console.print("[yellow]Already under faketime. Reset it first.[/]")
-        return
-    
 
     console.print(f"[blue]Fetching time from DC {dc_ip}...[/]")
-    offset = get_faketime_offset(dc_ip)
+    offset = get_faketime_offset(dc_ip, realm=session.current_target.get("domain"), refresh=refresh)
 
     if offset is None:
         console.print("[red]✘ Failed to fetch or calculate time offset from DC[/]")
         return
 
-    # Save the new configuration
-    save_timewrap_config(dc_ip, offset)
-    console.print(f"[green]✓ Timewrap offset set:[/] {offset}")
-    
-    # Restart the application to apply the new time settings
-    console.print("[yellow]Restarting with new time settings...[/]")
-    os.execv(sys.executable, [sys.executable] + sys.argv)
+    set_timewrap(session.current_target_label, dc_ip, offset)
+    console.print(f"[green]✓ Timewrap offset set for {session.current_target_label}:[/] {offset}")
+    if not Path(FAKETIME_LIB).exists():
+        console.print(f"[yellow]Warning: {FAKETIME_LIB} not found. Install libfaketime for external tools.[/]")
 
 
 @timewrap_app.command("reset")
-def reset_time():
+def reset_time(
+    all_targets: bool = typer.Option(False, "--all", "-a", help="Reset timewrap for every target"),
+):
     """
-    Reset timewrap to use real system time.
-    Cleans up environment, removes timewrap file, and restarts the application.
+    Reset timewrap to use real system time for the current target.
     """
-    if TIMEWRAP_FILE.exists() or "LD_PRELOAD" in os.environ:
-        # Clear environment variables
-        clear_env_vars()
-        
-        # Remove the timewrap file if it exists
-        if TIMEWRAP_FILE.exists():
-            try:
-                TIMEWRAP_FILE.unlink()
-                console.print("[green]✓ Removed timewrap configuration[/]")
-            except Exception as e:
-                console.print(f"[yellow]Warning: Could not remove timewrap file: {e}[/]")
-        
-        # Restart the application
-        console.print("[yellow]Restarting with system time...[/]")
-        os.execv(sys.executable, [sys.executable] + sys.argv)
+    labels = list(session.targets) if all_targets else [session.current_target_label]
+    cleared = [label for label in labels if label and clear_timewrap(label)]
+
+    # Configuration from older versions applied to the whole shell
+    if LEGACY_TIMEWRAP_FILE.exists():
+        LEGACY_TIMEWRAP_FILE.unlink()
+        cleared.append("global")
+
+    if cleared:
+        console.print(f"[green]✓ Removed timewrap configuration:[/] {', '.join(cleared)}")
     else:
         console.print("[yellow]No active timewrap to reset.[/]")
 
 
+def print_skew(skew: dict):
+    from seerAD.core.clock import describe_offset
+
+    low, high = skew["offset"] - skew["error"], skew["offset"] + skew["error"]
+    age = datetime.now().timestamp() - skew.get("measured_at", 0)
+    console.print(f"  Skew    : {describe_offset(skew['offset'])} ± {skew['error'] * 1000:.0f} ms")
+    console.print(f"  Interval: [{low:+.3f}s, {high:+.3f}s]")
+    console.print(f"  Samples : {skew['samples']} ({', '.join(skew['sources'])}), measured {age:.0f}s ago")
+
 @timewrap_app.command("status")
-def timewrap_status():
+def timewrap_status(
+    refresh: bool = typer.Option(False, "--refresh", "-r", help="Take a fresh skew measurement from the DC"),
+):
     """
-    Show current timewrap status.
+    Show current timewrap status and the measured DC clock skew.
     """
-    if TIMEWRAP_FILE.exists():
-        with open(TIMEWRAP_FILE, "r") as f:
-            data = json.load(f)
-        console.print("[green]✔ Timewrap is active:[/]")
+    data = get_timewrap(session.current_target_label)
+    if data:
+        console.print(f"[green]✔ Timewrap is active for {session.current_target_label}:[/]")
         console.print(f"  DC IP   : {data.get('dc_ip')}")
         console.print(f"  Offset  : {data.get('offset')}")
         console.print(f"  Set At  : {data.get('set_at')}")
     else:
-        console.print("[yellow]No timewrap is currently set[/]")
+        console.print("[yellow]No timewrap is set for the current target[/]")
+
+    target = session.current_target or {}
+    dc_ip = target.get("ip")
+    if not dc_ip:
+        return
+
+    from seerAD.core.clock import get_cached_skew, get_skew
+
+    try:
+        skew = get_skew(dc_ip, realm=target.get("domain"), refresh=True) if refresh else get_cached_skew(dc_ip)
+    except Exception as e:
+        console.print(f"[red]✘ Skew measurement failed:[/] {e}")
+        return
+
+    if skew:
+        console.print(f"[blue]Measured skew for DC {dc_ip}:[/]")
+        print_skew(skew)
+    else:
+        console.print(f"[dim]No recent skew measurement for {dc_ip}. Use 'timewrap status --refresh'.[/]")
 
 # Expose as app
 app = timewrap_app
@@ -19,8 +19,9 @@ DATA_DIR = USER_DATA_DIR
 LOOT_DIR = USER_DATA_DIR / "loot"
 LOGS_DIR = USER_DATA_DIR / "logs"
 
-# Make sure directories exist
-for d in [DATA_DIR, LOOT_DIR, LOGS_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
+def ensure_dirs():
+    """Create the data directories. Called when the workspace is first used, not at import."""
+    for d in [DATA_DIR, LOOT_DIR, LOGS_DIR]:
+        d.mkdir(parents=True, exist_ok=True)
 
 VERSION = "0.1.2"
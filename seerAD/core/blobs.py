@@ -0,0 +1,170 @@
+"""
+Content-addressed store for tool output under LOOT_DIR/.blobs/.
+
+Every output file (and record snapshot) is stored once, gzip-compressed and named by
+the sha256 of its content, and appears in the target dirs as hard links: LOOT_DIR/
+<target>/output/….log.gz is the same inode as .blobs/ab/ab12….gz, so the same output
+kept for ten targets takes the space of one. The link count is the reference count:
+an object whose only link is the store's own is garbage. Only content that is never
+written again may go in the store (objects are read-only, but not to root).
+
+Tickets and certificates are not: tools rewrite a ccache in place (KRB5CCNAME), so
+each target keeps its own private copy (`keep_private`).
+
+Deleting a target renames its dir into LOOT_DIR/.trash/ and leaves the rmtree and the
+object sweep to a detached `python -m seerAD.core.blobs` process.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Tuple
+
+from seerAD.config import LOOT_DIR
+
+BLOB_DIR = LOOT_DIR / ".blobs"
+TRASH_DIR = LOOT_DIR / ".trash"
+GRACE_SECONDS = 300  # unreferenced objects younger than this may be about to be linked
+CHUNK = 1 << 20
+
+
+def _object_path(digest: str, compress: bool) -> Path:
+    return BLOB_DIR / digest[:2] / (digest + (".gz" if compress else ""))
+
+
+def put(src: Path, compress: bool = False) -> Path:
+    """Store the content of `src` and return its object path. Hashing and writing is one pass."""
+    BLOB_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = BLOB_DIR / f".{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    try:
+        with open(src, "rb") as f, open(tmp, "wb") as raw:
+            out = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) if compress else raw
+            for chunk in iter(lambda: f.read(CHUNK), b""):
+                digest.update(chunk)
+                out.write(chunk)
+            if compress:
+                out.close()
+        obj = _object_path(digest.hexdigest(), compress)
+        if obj.exists():
+            os.utime(obj)  # restarts the grace period before the link below is made
+            tmp.unlink()
+        else:
+            obj.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444)  # shared by every link: never written in place
+            os.replace(tmp, obj)
+        return obj
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def link(obj: Path, dest: Path) -> Path:
+    """Point `dest` at `obj`, atomically replacing whatever was there. Copies if hard links fail."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if os.path.samefile(obj, dest):
+            return dest  # rename() between two links of one inode is a no-op that leaves tmp behind
+    except OSError:
+        pass
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}")
+    try:
+        os.link(obj, tmp)
+    except OSError:
+        shutil.copyfile(obj, tmp)
+    os.replace(tmp, dest)
+    return dest
+
+
+def store(src: Path, dest: Path, compress: bool = False, keep_source: bool = False) -> Path:
+    """
+    Keep `src` at `dest` (+ '.gz' when compressed) as a link into the store and
+    return that path. `src` is removed unless `keep_source` (or it is `dest` itself).
+    """
+    src, dest = Path(src), Path(dest)
+    if compress and dest.suffix != ".gz":
+        dest = dest.with_name(dest.name + ".gz")
+    link(put(src, compress), dest)
+    if not keep_source and src != dest:
+        src.unlink(missing_ok=True)
+    return dest
+
+
+def keep_private(src: Path, dest: Path, keep_source: bool = False) -> Path:
+    """
+    Copy `src` to `dest` as a file of its own (0600, atomically replacing whatever was
+    there, including an older hard link into the store) and return `dest`.
+    """
+    src, dest = Path(src), Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}")
+    try:
+        shutil.copyfile(src, tmp)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if not keep_source and src != dest:
+        src.unlink(missing_ok=True)
+    return dest
+
+
+def refcount(path: Path) -> int:
+    """Named links to the object behind `path` (an object or any of its links)."""
+    return os.stat(path).st_nlink - 1
+
+
+def discard(path: Path) -> bool:
+    """Move a dir out of the way in O(1); collect_garbage() deletes it later."""
+    if not path.exists():
+        return False
+    TRASH_DIR.mkdir(parents=True, exist_ok=True)
+    os.replace(path, TRASH_DIR / f"{path.name}-{uuid.uuid4().hex[:8]}")
+    return True
+
+
+def collect_garbage(grace: float = GRACE_SECONDS) -> Tuple[int, int]:
+    """Empty the trash, then delete unreferenced objects. Returns (objects removed, bytes freed)."""
+    if TRASH_DIR.exists():
+        for entry in TRASH_DIR.iterdir():
+            shutil.rmtree(entry, ignore_errors=True)
+    removed = freed = 0
+    if not BLOB_DIR.exists():
+        return removed, freed
+    cutoff = time.time() - grace
+    for shard in BLOB_DIR.iterdir():
+        if not shard.is_dir():
+            continue
+        for obj in shard.iterdir():
+            try:
+                st = obj.stat()
+                if st.st_nlink == 1 and st.st_mtime < cutoff:
+                    obj.unlink()
+                    removed += 1
+                    freed += st.st_size
+            except OSError:
+                continue
+        try:
+            shard.rmdir()  # only succeeds once empty
+        except OSError:
+            pass
+    return removed, freed
+
+
+def collect_in_background():
+    """Run collect_garbage() in a detached process so the caller returns at once."""
+    try:
+        subprocess.Popen([sys.executable, "-m", "seerAD.core.blobs"], stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        pass  # the next delete retries; nothing is lost but disk space
+
+
+if __name__ == "__main__":
+    collect_garbage()
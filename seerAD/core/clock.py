@@ -0,0 +1,212 @@
+import asyncio
+import json
+import secrets
+import statistics
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any
+
+from seerAD.config import LOOT_DIR
+
+SKEW_CACHE_FILE = LOOT_DIR / "skew_cache.json"
+SKEW_CACHE_TTL = 15 * 60  # seconds
+
+NTP_PORT = 123
+KDC_PORT = 88
+NTP_EPOCH_DELTA = 2208988800  # seconds between 1900-01-01 and 1970-01-01
+
+
+def _to_ntp(ts: float) -> bytes:
+    sec = int(ts) + NTP_EPOCH_DELTA
+    frac = int((ts % 1) * (1 << 32))
+    return struct.pack("!II", sec, frac)
+
+
+def _from_ntp(data: bytes) -> float:
+    sec, frac = struct.unpack("!II", data)
+    return sec - NTP_EPOCH_DELTA + frac / (1 << 32)
+
+
+class _NTPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, future):
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result((data, time.time()))
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def ntp_sample(host: str, timeout: float = 2.0, port: int = NTP_PORT) -> Dict[str, Any]:
+    """Send one SNTP request and return {'offset', 'delay'} in seconds."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _NTPProtocol(future), remote_addr=(host, port))
+    try:
+        t1 = time.time()
+        # LI=0, VN=3, Mode=3 (client); our transmit time goes in the transmit timestamp field
+        transport.sendto(b"\x1b" + b"\x00" * 39 + _to_ntp(t1))
+        data, t4 = await asyncio.wait_for(future, timeout)
+    finally:
+        transport.close()
+
+    if len(data) < 48:
+        raise ValueError("Short NTP response")
+    t2 = _from_ntp(data[32:40])  # server receive
+    t3 = _from_ntp(data[40:48])  # server transmit
+    return {
+        "source": "ntp",
+        "offset": ((t2 - t1) + (t3 - t4)) / 2,
+        "delay": (t4 - t1) - (t3 - t2),
+    }
+
+
+def _build_probe_asreq(realm: str) -> bytes:
+    """AS-REQ for a random principal without pre-auth; any KRB-ERROR reply carries stime/susec."""
+    from minikerberos.protocol.asn1_structs import AS_REQ, KDC_REQ_BODY, PrincipalName, KDCOptions, krb5_pvno
+    from minikerberos.protocol.constants import NAME_TYPE, MESSAGE_TYPE
+
+    now = datetime.now(timezone.utc)
+    body = {
+        "kdc-options": KDCOptions(set(["forwardable", "renewable", "proxiable"])),
+        "cname": PrincipalName({"name-type": NAME_TYPE.PRINCIPAL.value, "name-string": [f"seer{secrets.token_hex(4)}"]}),
+        "realm": realm.upper(),
+        "sname": PrincipalName({"name-type": NAME_TYPE.SRV_INST.value, "name-string": ["krbtgt", realm.upper()]}),
+        "till": (now + timedelta(days=1)).replace(microsecond=0),
+        "nonce": secrets.randbits(31),
+        "etype": [23, 17, 18],
+    }
+    return AS_REQ({
+        "pvno": krb5_pvno,
+        "msg-type": MESSAGE_TYPE.KRB_AS_REQ.value,
+        "req-body": KDC_REQ_BODY(body),
+    }).dump()
+
+
+async def kerberos_sample(host: str, realm: Optional[str] = None, timeout: float = 2.0, port: int = KDC_PORT) -> Dict[str, Any]:
+    """Send a throwaway AS-REQ over TCP and read the KDC clock from the KRB-ERROR (stime/susec)."""
+    from minikerberos.protocol.asn1_structs import KRB_ERROR
+
+    req = _build_probe_asreq(realm or "WORKGROUP")
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        t1 = time.time()
+        writer.write(len(req).to_bytes(4, "big") + req)
+        await writer.drain()
+        length = int.from_bytes(await asyncio.wait_for(reader.readexactly(4), timeout), "big")
+        data = await asyncio.wait_for(reader.readexactly(length), timeout)
+        t4 = time.time()
+    finally:
+        writer.close()
+
+    err = KRB_ERROR.load(data).native
+    server_time = err["stime"].replace(tzinfo=timezone.utc).timestamp() + (err.get("susec") or 0) / 1e6
+    return {
+        "source": "kerberos",
+        "offset": server_time - (t1 + t4) / 2,
+        "delay": t4 - t1,
+        "error_code": err.get("error-code"),
+    }
+
+
+async def _collect(host: str, realm: Optional[str], ntp_samples: int, timeout: float, ntp_port: int, kdc_port: int):
+    tasks = [ntp_sample(host, timeout, ntp_port) for _ in range(ntp_samples)]
+    tasks.append(kerberos_sample(host, realm, timeout, kdc_port))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    samples = [r for r in results if isinstance(r, dict)]
+    errors = [str(r) or type(r).__name__ for r in results if isinstance(r, BaseException)]
+    return samples, errors
+
+
+def summarize_samples(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median offset plus a confidence half-width derived from RTT and sample spread."""
+    offsets = [s["offset"] for s in samples]
+    median = statistics.median(offsets)
+    # A single exchange bounds the true offset to +/- delay/2; the spread (MAD) covers outliers.
+    rtt_bound = min(max(s["delay"], 0.0) for s in samples) / 2
+    mad = statistics.median(abs(o - median) for o in offsets) * 1.4826 if len(offsets) > 1 else 0.0
+    return {
+        "offset": median,
+        "error": max(rtt_bound, mad),
+        "samples": len(samples),
+        "sources": sorted({s["source"] for s in samples}),
+    }
+
+
+def measure_skew(host: str, realm: Optional[str] = None, ntp_samples: int = 4, timeout: float = 2.0,
+                 ntp_port: int = NTP_PORT, kdc_port: int = KDC_PORT) -> Dict[str, Any]:
+    """
+    Fire several NTP queries and one Kerberos AS-REQ concurrently and combine them.
+    Raises RuntimeError if no sample came back.
+    """
+    samples, errors = asyncio.run(_collect(host, realm, ntp_samples, timeout, ntp_port, kdc_port))
+    if not samples:
+        raise RuntimeError("; ".join(sorted(set(errors))) or "no samples")
+    result = summarize_samples(samples)
+    result["measured_at"] = time.time()
+    return result
+
+
+# === Per-DC cache ===
+def _load_cache() -> Dict[str, Any]:
+    if not SKEW_CACHE_FILE.exists():
+        return {}
+    try:
+        with open(SKEW_CACHE_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_cache(cache: Dict[str, Any]):
+    SKEW_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SKEW_CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2)
+
+
+def get_cached_skew(host: str, ttl: float = SKEW_CACHE_TTL) -> Optional[Dict[str, Any]]:
+    entry = _load_cache().get(host)
+    if entry and time.time() - entry.get("measured_at", 0) <= ttl:
+        return entry
+    return None
+
+
+def get_skew(host: str, realm: Optional[str] = None, refresh: bool = False, ttl: float = SKEW_CACHE_TTL) -> Dict[str, Any]:
+    """Cached measure_skew: reuse a measurement of this DC younger than ttl seconds."""
+    if not refresh:
+        cached = get_cached_skew(host, ttl)
+        if cached:
+            return dict(cached, cached=True)
+    result = measure_skew(host, realm)
+    cache = _load_cache()
+    cache[host] = result
+    _save_cache(cache)
+    return dict(result, cached=False)
+
+
+def all_cached_skews() -> Dict[str, Any]: return _load_cache()
+
+
+def describe_offset(offset: float) -> str:
+    """Human readable offset, e.g. '+7h59m03.512s'."""
+    sign = '+' if offset >= 0 else '-'
+    rest = abs(offset)
+    hours, rest = divmod(rest, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{sign}{int(hours)}h{int(minutes):02d}m{seconds:06.3f}s"
+    if minutes:
+        return f"{sign}{int(minutes)}m{seconds:06.3f}s"
+    return f"{sign}{seconds:.3f}s"
+
+
+def format_offset_as_faketime(offset: float) -> str:
+    """
+    Converts float seconds offset to a libfaketime relative offset like '+28740.512'
+    (libfaketime reads fractional seconds when no unit suffix is given).
+    """
+    return f"{offset:+.3f}"
@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Dict, Optional, Any, List
 from datetime import datetime, timezone
 from seerAD.config import LOOT_DIR
+from seerAD.core.telemetry import span
 
 class Credential:
     def __init__(self, username, domain=None, password=None, ntlm=None, aes128=None, aes256=None, ticket=None, cert=None, notes=None, created_at=None, updated_at=None):
@@ -42,31 +43,45 @@ class CredentialManager:
 
     def _key(self, username): return username.lower()
 
-    def _load(self):
-        if not self.credentials_file.exists():
-            return
+    def _file_mtime(self):
         try:
-            with open(self.credentials_file) as f:
-                data = json.load(f)
-            if isinstance(data, list):  # old format
-                self.credentials = {
-                    self._key(c.get("username", "")): Credential.from_dict(c)
-                    for c in data if c.get("username")
-                }
-                self._save()
-            else:
-                self.credentials = {
-                    self._key(u): Credential.from_dict(c)
-                    for u, c in data.items()
-                }
-        except Exception as e:
-            self.credentials = {}
+            return self.credentials_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def is_stale(self) -> bool:
+        """True if credentials.json was changed by someone else since we loaded or saved it."""
+        return self._file_mtime() != self._mtime
+
+    def _load(self):
+        with span("creds.load", target=self.target_label):
+            self._mtime = self._file_mtime()
+            if not self.credentials_file.exists():
+                return
+            try:
+                with open(self.credentials_file) as f:
+                    data = json.load(f)
+                if isinstance(data, list):  # old format
+                    self.credentials = {
+                        self._key(c.get("username", "")): Credential.from_dict(c)
+                        for c in data if c.get("username")
+                    }
+                    self._save()
+                else:
+                    self.credentials = {
+                        self._key(u): Credential.from_dict(c)
+                        for u, c in data.items()
+                    }
+            except Exception as e:
+                self.credentials = {}
 
     def _save(self):
-        self.credentials_file.parent.mkdir(parents=True, exist_ok=True)
-        data = {u: c.to_dict() for u, c in self.credentials.items()}
-        with open(self.credentials_file, "w") as f:
-            json.dump(data, f, indent=2)
+        with span("creds.save", target=self.target_label):
+            self.credentials_file.parent.mkdir(parents=True, exist_ok=True)
+            data = {u: c.to_dict() for u, c in self.credentials.items()}
+            with open(self.credentials_file, "w") as f:
+                json.dump(data, f, indent=2)
+            self._mtime = self._file_mtime()
 
     def add_credential(self, **kwargs):
         k = self._key(kwargs.get("username"))
@@ -83,6 +98,21 @@ class CredentialManager:
             return True
         return False
 
+    def merge_credentials(self, entries):
+        """Add new users and fill empty fields of known ones, never overwriting. One save. Returns (added, updated)."""
+        added = updated = 0
+        for entry in entries:
+            k = self._key(entry.get("username"))
+            cred = self.credentials.get(k)
+            if cred is None:
+                self.credentials[k] = Credential(**entry)
+                added += 1
+            elif cred.update(**{f: v for f, v in entry.items() if v and not getattr(cred, f, None)}):
+                updated += 1
+        if added or updated:
+            self._save()
+        return added, updated
+
     def delete_credential(self, username):
         k = self._key(username)
         if k in self.credentials:
@@ -0,0 +1,308 @@
+"""
+`seerAD serve`: keep imports, the session and caches resident behind a Unix socket.
+
+One-shot `seerAD ...` calls find the socket and hand over argv, cwd, env and
+their stdin/stdout/stderr file descriptors. The daemon forks a warm worker per
+command, which writes straight to the caller's terminal and reports the exit code.
+
+The client half runs on every invocation, so this module only imports builtins
+at the top; the server imports what it needs inside serve().
+"""
+import os
+import sys
+
+# Must match seerAD.config.DATA_DIR on Linux (computed here without importing pathlib/platform)
+def socket_path() -> str:
+    if os.environ.get("SEER_SOCKET"):
+        return os.environ["SEER_SOCKET"]
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "seerAD", "seer.sock")
+
+
+def _frame(payload: bytes) -> bytes:
+    return len(payload).to_bytes(4, "big") + payload
+
+
+# === Client ===
+def forward(argv):
+    """
+    Run argv in a listening daemon. Returns its exit code, or None if there is no
+    daemon (or SEER_NO_DAEMON is set) and the command should run in this process.
+    """
+    if os.environ.get("SEER_NO_DAEMON") or not hasattr(os, "fork"):
+        return None
+    path = socket_path()
+    if not os.path.exists(path):
+        return None
+
+    import _socket
+    import marshal
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None  # stale socket: run locally
+
+    request = _frame(marshal.dumps({"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}))
+    fds = b"".join(fd.to_bytes(4, sys.byteorder) for fd in (0, 1, 2))
+    try:
+        sent = sock.sendmsg([request], [(_socket.SOL_SOCKET, _socket.SCM_RIGHTS, fds)])
+        if sent < len(request):
+            sock.sendall(request[sent:])
+        reply = b""
+        while len(reply) < 4:
+            try:
+                chunk = sock.recv(4 - len(reply))
+            except KeyboardInterrupt:
+                sock.sendall(b"i")  # the worker interrupts itself and its tools
+                continue
+            if not chunk:
+                sys.stderr.write("seerAD: lost connection to the daemon\n")
+                return 1
+            reply += chunk
+        return int.from_bytes(reply, "big", signed=True)
+    finally:
+        sock.close()
+
+
+# === Server ===
+PRELOAD_MODULES = (
+    "seerAD.core.utils",
+    "seerAD.core.clock",
+    "seerAD.core.playbook",
+    "Crypto.Cipher.AES",
+    "Crypto.Hash.MD4",
+    "minikerberos.aioclient",
+    "minikerberos.common.ccache",
+    "yaml",
+    "rich._emoji_codes",
+    "typer._click.decorators",
+)
+
+
+def _recv_request(conn):
+    import array
+    import marshal
+    import socket
+
+    fds = array.array("i")
+    data, ancdata, _, _ = conn.recvmsg(65536, socket.CMSG_LEN(3 * fds.itemsize))
+    for level, kind, cdata in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(cdata[:len(cdata) - (len(cdata) % fds.itemsize)])
+    while len(data) < 4 or len(data) < 4 + int.from_bytes(data[:4], "big"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            raise ConnectionError("client went away")
+        data += chunk
+    return marshal.loads(data[4:4 + int.from_bytes(data[:4], "big")]), list(fds)
+
+
+def _console_modules():
+    """seerAD modules with a module-level rich console (looked up once, in the parent)."""
+    from rich.console import Console
+
+    return [module for name, module in list(sys.modules.items())
+            if name.startswith("seerAD") and isinstance(getattr(module, "console", None), Console)]
+
+
+def _reset_consoles(modules):
+    """Rich consoles detect terminal, colors and width at creation; redo that for the client's terminal."""
+    from rich.console import Console
+    import rich
+
+    console = Console()  # consoles keep no state between prints, so one can serve every module
+    rich._console = console
+    for module in modules:
+        module.console = console
+
+
+def _warm_up():
+    """Render once in the parent so workers inherit rich's compiled highlighter regexes."""
+    import io
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table("user", "domain")
+    table.add_row("alice", "corp.local")
+    console = Console(file=io.StringIO(), force_terminal=True, width=80)
+    console.print(table)
+    console.print("[green]✔ 10.0.0.1 /tmp/x 'alice' 1.5 True None[/]")
+
+
+def _worker(listener, ready_fd, command, consoles):
+    """
+    Forked spare: wait for the next client, tell the parent (so it forks the next
+    spare), then become the client's command and exit. Never returns.
+    """
+    import signal
+    import threading
+
+    code = 1
+    conn = None
+    finished = threading.Event()
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        # New session without a controlling terminal: the client's tty can be read without
+        # job-control stops, and the client's Ctrl-C is forwarded to this group only
+        os.setsid()
+
+        conn = _accept(listener)
+        listener.close()
+        os.write(ready_fd, b".")
+        os.close(ready_fd)
+
+        request, fds = _recv_request(conn)
+        for target_fd, fd in zip((0, 1, 2), fds):
+            os.dup2(fd, target_fd)
+            os.close(fd)
+        sys.stdin = os.fdopen(0, "r", closefd=False)
+        sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+        sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+
+        os.chdir(request["cwd"])
+        env = request["env"]
+        for key in [k for k in os.environ if k not in env]:
+            del os.environ[key]
+        for key, value in env.items():
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+        sys.argv = ["seerAD"] + request["argv"]
+
+        from seerAD.core.session import session
+        session.refresh()  # this worker was forked before the command arrived
+        session._ensure_workspace()
+        _reset_consoles(consoles)
+
+        def watch():
+            # Any byte (or EOF) from the client means Ctrl-C there
+            try:
+                conn.recv(1)
+            except OSError:
+                pass
+            if not finished.is_set():
+                os.killpg(0, signal.SIGINT)
+        threading.Thread(target=watch, daemon=True).start()
+
+        from seerAD.main import run_local
+        try:
+            run_local(command)
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException as e:
+        if conn is not None:
+            try:
+                sys.stderr.write(f"seerAD daemon worker: {e}\n")
+            except Exception:
+                pass
+    finally:
+        finished.set()
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if conn is not None:
+                conn.sendall(int(code).to_bytes(4, "big", signed=True))
+        except Exception:
+            pass
+        os._exit(code if 0 <= code < 256 else 1)
+
+
+def _accept(listener):
+    """Next connection from our own user; others are dropped."""
+    import socket
+    import struct
+
+    while True:
+        conn, _ = listener.accept()
+        _, uid, _ = struct.unpack("3i", conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+        if uid == os.getuid():
+            return conn
+        conn.close()
+
+
+def serve(path=None, on_ready=lambda path: None):
+    """Listen on the socket until SIGINT/SIGTERM. Raises RuntimeError if a daemon is already listening."""
+    import gc
+    import importlib
+    import signal
+    import socket
+    import time
+
+    import typer
+    from seerAD.core.session import session
+
+    path = path or socket_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            raise RuntimeError(f"a daemon is already listening on {path}")
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)  # left behind by a daemon that died
+        finally:
+            probe.close()
+
+    # Warm everything a command might need before the first fork
+    from seerAD.cli.main import app  # all CLI modules and tool registries
+    command = typer.main.get_command(app)  # typer rebuilds this on every call otherwise
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    _warm_up()
+    consoles = _console_modules()
+    session.refresh()
+    session.get_usernames()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # socket is 0600: only our user may run commands through it
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(128)
+
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # workers are reaped by the kernel
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    on_ready(path)
+    spare = None
+    try:
+        # Keep one forked worker waiting in accept(), so a command never waits for fork()
+        while True:
+            # Pick up what other processes wrote since the last command before forking
+            session.refresh()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Workers should not copy pages just because the cyclic GC walked over them
+            gc.freeze()
+            ready_r, ready_w = os.pipe()
+            spare = os.fork()
+            if spare == 0:
+                os.close(ready_r)
+                _worker(listener, ready_w, command, consoles)
+            os.close(ready_w)
+            try:
+                took_client = os.read(ready_r, 1)
+            finally:
+                os.close(ready_r)
+            spare = None  # it belongs to its client now
+            if not took_client:
+                time.sleep(0.1)  # the spare died before accepting; don't spin
+    finally:
+        if spare:
+            try:
+                os.kill(spare, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        listener.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
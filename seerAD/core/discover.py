@@ -0,0 +1,276 @@
+"""
+Network discovery for `target discover <CIDR>`.
+
+Every host is probed with plain asyncio TCP connects to the AD ports; a semaphore caps
+the connects in flight and each one has its own timeout, so a /24 takes about one
+timeout's worth of wall time. Hosts with LDAP open get an anonymous rootDSE search
+(defaultNamingContext, dnsHostName); hosts with SMB open get an SMB2 negotiate and an
+NTLMSSP NEGOTIATE, whose CHALLENGE names the host and domain. Both are a couple of
+hand-built packets: no LDAP or SMB library is loaded.
+
+asyncio is imported by the command that runs a discovery, not at startup.
+"""
+import ipaddress
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SERVICES = {"kerberos": 88, "ldap": 389, "smb": 445, "winrm": 5985, "mssql": 1433}
+DC_SERVICES = ("kerberos", "ldap")
+ROOTDSE_ATTRS = ("defaultNamingContext", "dnsHostName", "rootDomainNamingContext", "ldapServiceName")
+MAX_HOSTS = 65536
+
+Port = Tuple[int, str, str, Optional[str], Optional[str]]  # port, proto, state, service, product
+
+
+@dataclass
+class Host:
+    ip: str
+    open: List[str] = field(default_factory=list)
+    fqdn: Optional[str] = None
+    domain: Optional[str] = None
+    netbios: Optional[str] = None
+    netbios_domain: Optional[str] = None
+    ports: List[Port] = field(default_factory=list)
+    seen: Optional[float] = None  # when the ports were seen (epoch seconds); None: just now
+
+    @property
+    def is_dc(self) -> bool:
+        return all(s in self.open for s in DC_SERVICES)
+
+    @property
+    def hostname(self) -> Optional[str]:
+        if self.fqdn:
+            return self.fqdn.split(".", 1)[0]
+        return self.netbios
+
+
+def hosts_in(cidr: str) -> List[str]:
+    """Host addresses of a CIDR (or a single IP). Refuses ranges over MAX_HOSTS."""
+    net = ipaddress.ip_network(cidr, strict=False)
+    if net.num_addresses > MAX_HOSTS:
+        raise ValueError(f"{cidr} has {net.num_addresses} addresses; split it into ranges of at most {MAX_HOSTS}")
+    hosts = list(net.hosts()) or [net.network_address]
+    return [str(ip) for ip in hosts]
+
+
+def dn_to_domain(dn: str) -> Optional[str]:
+    parts = [p.strip()[3:] for p in dn.split(",") if p.strip().upper().startswith("DC=")]
+    return ".".join(parts).lower() or None
+
+
+# -- BER (LDAP, SPNEGO) -------------------------------------------------------
+
+def tlv(tag: int, value: bytes) -> bytes:
+    n = len(value)
+    if n < 0x80:
+        return bytes([tag, n]) + value
+    length = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes([tag, 0x80 | len(length)]) + length + value
+
+
+def read_tlv(data: bytes, pos: int):
+    """(tag, value start, value end) of the element at `pos`."""
+    tag, n = data[pos], data[pos + 1]
+    pos += 2
+    if n & 0x80:
+        size = n & 0x7F
+        n = int.from_bytes(data[pos:pos + size], "big")
+        pos += size
+    return tag, pos, pos + n
+
+
+def children(data: bytes, start: int, end: int):
+    while start < end:
+        tag, vstart, vend = read_tlv(data, start)
+        yield tag, vstart, vend
+        start = vend
+
+
+def rootdse_request(message_id: int = 1) -> bytes:
+    search = (tlv(0x04, b"") + tlv(0x0A, b"\x00") + tlv(0x0A, b"\x00") + tlv(0x02, b"\x00") + tlv(0x02, b"\x00")
+              + tlv(0x01, b"\x00") + tlv(0x87, b"objectClass")
+              + tlv(0x30, b"".join(tlv(0x04, a.encode()) for a in ROOTDSE_ATTRS)))
+    return tlv(0x30, tlv(0x02, bytes([message_id])) + tlv(0x63, search))
+
+
+def parse_rootdse(message: bytes) -> Dict[str, str]:
+    """Attributes of a SearchResultEntry message (first value of each)."""
+    out: Dict[str, str] = {}
+    _, start, end = read_tlv(message, 0)
+    for tag, vstart, vend in children(message, start, end):
+        if tag != 0x64:  # SearchResultEntry
+            continue
+        parts = list(children(message, vstart, vend))
+        if len(parts) < 2:
+            return out
+        _, astart, aend = parts[1]
+        for _, pstart, pend in children(message, astart, aend):
+            (_, nstart, nend), (_, sstart, send) = list(children(message, pstart, pend))[:2]
+            values = [message[a:b] for _, a, b in children(message, sstart, send)]
+            if values:
+                out[message[nstart:nend].decode(errors="replace")] = values[0].decode(errors="replace")
+    return out
+
+
+# -- SMB2 / NTLMSSP -----------------------------------------------------------
+
+NTLMSSP_OID = b"\x2b\x06\x01\x04\x01\x82\x37\x02\x02\x0a"
+SPNEGO_OID = b"\x2b\x06\x01\x05\x05\x02"
+NTLM_FLAGS = 0xE0888205  # unicode, request target, NTLM, always sign, ESS, target info, 128, key exch, 56
+AV_NAMES = {1: "netbios", 2: "netbios_domain", 3: "fqdn", 4: "domain"}
+
+
+def smb2_packet(command: int, message_id: int, body: bytes) -> bytes:
+    header = struct.pack("<4sHHIHHIIQIIQ16s", b"\xfeSMB", 64, 0, 0, command, 1, 0, 0, message_id, 0, 0, 0, b"\0" * 16)
+    payload = header + body
+    return struct.pack(">I", len(payload)) + payload
+
+
+def smb2_negotiate() -> bytes:
+    body = struct.pack("<HHHHI16sQ", 36, 2, 1, 0, 0, os.urandom(16), 0) + struct.pack("<HH", 0x0202, 0x0210)
+    return smb2_packet(0, 0, body)
+
+
+def smb2_session_setup() -> bytes:
+    ntlm = b"NTLMSSP\0" + struct.pack("<II", 1, NTLM_FLAGS) + b"\0" * 16
+    token = tlv(0x60, tlv(0x06, SPNEGO_OID) + tlv(0xA0, tlv(0x30, tlv(0xA0, tlv(0x30, tlv(0x06, NTLMSSP_OID)))
+                                                          + tlv(0xA2, tlv(0x04, ntlm)))))
+    body = struct.pack("<HBBIIHHQ", 25, 0, 1, 0, 0, 64 + 24, len(token), 0) + token
+    return smb2_packet(1, 1, body)
+
+
+def parse_challenge(data: bytes) -> Dict[str, str]:
+    """Host and domain names from the target info of an NTLMSSP CHALLENGE anywhere in `data`."""
+    pos = data.find(b"NTLMSSP\0\x02\0\0\0")
+    if pos < 0 or len(data) < pos + 48:
+        return {}
+    length, _, offset = struct.unpack_from("<HHI", data, pos + 40)
+    info = data[pos + offset:pos + offset + length]
+    out, i = {}, 0
+    while i + 4 <= len(info):
+        av_id, av_len = struct.unpack_from("<HH", info, i)
+        if av_id == 0:
+            break
+        if av_id in AV_NAMES:
+            out[AV_NAMES[av_id]] = info[i + 4:i + 4 + av_len].decode("utf-16-le", errors="replace")
+        i += 4 + av_len
+    return out
+
+
+# -- probing ------------------------------------------------------------------
+
+async def _read_netbios(reader) -> bytes:
+    header = await reader.readexactly(4)
+    return await reader.readexactly(int.from_bytes(header[1:], "big"))
+
+
+async def _read_ber(reader) -> bytes:
+    head = await reader.readexactly(2)
+    if head[1] & 0x80:
+        size = await reader.readexactly(head[1] & 0x7F)
+        return head + size + await reader.readexactly(int.from_bytes(size, "big"))
+    return head + await reader.readexactly(head[1])
+
+
+async def _exchange(ip: str, port: int, timeout: float, talk):
+    import asyncio
+
+    async def run():
+        reader, writer = await asyncio.open_connection(ip, port)
+        try:
+            return await talk(reader, writer)
+        finally:
+            writer.close()
+    try:
+        return await asyncio.wait_for(run(), timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError, struct.error):
+        return None
+
+
+async def is_open(ip: str, port: int, timeout: float) -> bool:
+    async def nothing(reader, writer):
+        return True
+    return bool(await _exchange(ip, port, timeout, nothing))
+
+
+async def ldap_rootdse(ip: str, port: int, timeout: float) -> Dict[str, str]:
+    async def talk(reader, writer):
+        writer.write(rootdse_request())
+        await writer.drain()
+        found: Dict[str, str] = {}
+        while True:
+            message = await _read_ber(reader)
+            found.update(parse_rootdse(message))
+            ops = [tag for tag, _, _ in children(message, *read_tlv(message, 0)[1:])]
+            if 0x65 in ops:  # SearchResultDone
+                return found
+    return await _exchange(ip, port, timeout, talk) or {}
+
+
+async def smb_names(ip: str, port: int, timeout: float) -> Dict[str, str]:
+    async def talk(reader, writer):
+        writer.write(smb2_negotiate())
+        await writer.drain()
+        reply = await _read_netbios(reader)
+        if reply[:4] != b"\xfeSMB":
+            return {}
+        writer.write(smb2_session_setup())
+        await writer.drain()
+        return parse_challenge(await _read_netbios(reader))
+    return await _exchange(ip, port, timeout, talk) or {}
+
+
+async def probe_host(ip: str, services: Dict[str, int], timeout: float, limit) -> Host:
+    import asyncio
+
+    async def check(name: str, port: int):
+        async with limit:
+            return name, await is_open(ip, port, timeout)
+
+    host = Host(ip)
+    results = await asyncio.gather(*(check(name, port) for name, port in services.items()))
+    host.open = [name for name, up in results if up]
+    host.ports = [(services[name], "tcp", "open" if up else "closed", name, None) for name, up in results]
+    if "ldap" in host.open:
+        async with limit:
+            dse = await ldap_rootdse(ip, services["ldap"], timeout)
+        host.fqdn = dse.get("dnsHostName") or None
+        host.domain = dn_to_domain(dse.get("defaultNamingContext", "")) or dn_to_domain(dse.get("rootDomainNamingContext", ""))
+    if "smb" in host.open:
+        async with limit:
+            names = await smb_names(ip, services["smb"], timeout)
+        host.fqdn = host.fqdn or names.get("fqdn")
+        host.domain = host.domain or (names.get("domain") or "").lower() or None
+        host.netbios, host.netbios_domain = names.get("netbios"), names.get("netbios_domain")
+    return host
+
+
+async def discover_async(ips: List[str], services: Dict[str, int], timeout: float, concurrency: int) -> List[Host]:
+    import asyncio
+
+    limit = asyncio.Semaphore(concurrency)
+    hosts = await asyncio.gather(*(probe_host(ip, services, timeout, limit) for ip in ips))
+    return [h for h in hosts if h.open]
+
+
+def discover(cidr: str, services: Optional[Dict[str, int]] = None, timeout: float = 1.0,
+             concurrency: int = 512) -> List[Host]:
+    """Hosts of `cidr` with at least one of `services` open, in address order."""
+    import asyncio
+
+    return asyncio.run(discover_async(hosts_in(cidr), services or SERVICES, timeout, concurrency))
+
+
+def label_for(host: Host, taken) -> str:
+    """dc01, or dc01-<last octet> when taken; the IP with dashes when the host has no name."""
+    base = (host.hostname or host.ip.replace(".", "-").replace(":", "-")).lower()
+    if base not in taken:
+        return base
+    candidate = f"{base}-{host.ip.replace(':', '.').rsplit('.', 1)[-1]}"
+    n = 2
+    while candidate in taken:
+        candidate = f"{base}-{n}"
+        n += 1
+    return candidate
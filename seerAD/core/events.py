@@ -0,0 +1,51 @@
+"""
+In-process session event bus.
+
+Emitters publish what changed; the interactive prompt (and anything else that
+caches session-derived state) subscribes instead of re-reading the session on
+every redraw. Callbacks run synchronously in the emitting thread and must be cheap.
+"""
+import threading
+from typing import Any, Callable, Dict, List
+
+TARGET_SWITCHED = "target_switched"
+CREDENTIAL_CHANGED = "credential_changed"
+TIMEWRAP_CHANGED = "timewrap_changed"
+CWD_CHANGED = "cwd_changed"
+# Membership changes, for indexes kept up to date entry by entry (shell completion)
+TARGETS_ADDED = "targets_added"  # labels=[...]
+TARGET_DELETED = "target_deleted"  # label=...
+CREDENTIALS_ADDED = "credentials_added"  # label=..., usernames=[...]
+CREDENTIAL_DELETED = "credential_deleted"  # label=..., username=...
+SESSION_RELOADED = "session_reloaded"  # another process changed the files: anything may differ
+
+Callback = Callable[..., Any]
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callback]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event: str, callback: Callback):
+        with self._lock:
+            self._subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event: str, callback: Callback):
+        with self._lock:
+            callbacks = self._subscribers.get(event, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def emit(self, event: str, **data):
+        with self._lock:
+            callbacks = list(self._subscribers.get(event, ()))
+        for callback in callbacks:
+            try:
+                callback(event, **data)
+            except Exception as e:
+                # A broken subscriber must never break the command that emitted
+                print(f"[!] Error in {event} handler: {e}")
+
+
+bus = EventBus()
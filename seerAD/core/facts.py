@@ -0,0 +1,156 @@
+"""
+Facts parsed out of tool output (core/parsers.py), kept per target in the `facts`
+table of LOOT_DIR/loot.db: one row per (target, type, key), its fields merged as
+later runs add to them.
+
+FactCollector is the run_tool stage. It only runs regexes on the reader thread; the
+records go to a writer thread in batches, which upserts them. New credentials (valid
+logins with a secret, dumped NT hashes) are merged into the workspace once, when the
+run ends, so a 20k-line dump costs one credentials.json save rather than one per batch.
+"""
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from seerAD.core import sids
+from seerAD.core.loot import LOOT_DB, connect
+from seerAD.core.parsers import Record, parsers_for
+
+BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    target TEXT,
+    type TEXT,
+    key TEXT,
+    data TEXT,
+    module TEXT,
+    first_seen REAL,
+    last_seen REAL,
+    PRIMARY KEY (target, type, key)
+);
+"""
+
+
+def _connect():
+    conn = connect()
+    conn.executescript(SCHEMA + sids.SCHEMA)
+    return conn
+
+
+def write_facts(target: str, module: str, records: List[Record]) -> int:
+    """
+    Upsert records; fields of a known fact are merged (json_patch). SIDs they name go
+    to the SID cache in the same transaction. Returns the number of rows written.
+    """
+    now = time.time()
+    rows = [(target, r["type"], r["key"], json.dumps(r), module, now, now) for r in records]
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany("""
+                INSERT INTO facts (target, type, key, data, module, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (target, type, key) DO UPDATE SET
+                    data = json_patch(facts.data, excluded.data), module = excluded.module, last_seen = excluded.last_seen
+            """, rows)
+            sids.remember(sids.from_records(records), module, conn)
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def query_facts(target: Optional[str] = None, type_: Optional[str] = None, match: Optional[str] = None,
+                limit: int = 100) -> List[Dict[str, Any]]:
+    """Most recently seen facts first, optionally of one target / type, or whose key contains `match`."""
+    if not LOOT_DB.exists():
+        return []
+    import sqlite3
+
+    where, params = [], []
+    for column, value in (("target", target), ("type", type_)):
+        if value:
+            where.append(f"{column} = ?")
+            params.append(value)
+    if match:
+        where.append("key LIKE ?")
+        params.append(f"%{match.lower()}%")
+    sql = "SELECT * FROM facts" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY last_seen DESC LIMIT ?"
+    conn = _connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    finally:
+        conn.close()
+    return [dict(row, data=json.loads(row["data"])) for row in rows]
+
+
+def credentials_from(records: List[Record]) -> List[Dict[str, Any]]:
+    """Credential fields for every record that carries a usable secret."""
+    found = []
+    for r in records:
+        if r["type"] == "valid-login" and r.get("secret_type"):
+            found.append({"username": r["user"], "domain": r.get("domain"), r["secret_type"]: r["secret"]})
+        elif r["type"] == "hash":
+            found.append({"username": r["user"], "domain": r.get("domain"), "ntlm": r["ntlm"]})
+    return found
+
+
+class FactCollector:
+    """run_tool output stage: parse lines into facts and store them off the output path."""
+
+    def __init__(self, target_label: Optional[str], module: str):
+        self.target_label = target_label
+        self.module = module
+        self.parsers = parsers_for(module) if target_label else []
+        self.found = 0
+        self.creds_added = 0
+        self.creds_updated = 0
+        self._pending: List[Record] = []
+        self._creds: List[Dict[str, Any]] = []
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+
+    def feed(self, line: str):
+        for parser in self.parsers:
+            records = parser.feed(line)
+            if records:
+                self._pending.extend(records)
+        if len(self._pending) >= BATCH:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        if self._writer is None:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, name="seer-facts", daemon=True)
+            self._writer.start()
+        self.found += len(self._pending)
+        self._queue.put(self._pending)
+        self._pending = []
+
+    def _write_loop(self):
+        from seerAD.core.session import session
+
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    if self._creds:
+                        self.creds_added, self.creds_updated = session.merge_credentials(self.target_label, self._creds)
+                    return
+                write_facts(self.target_label, self.module, batch)
+                self._creds.extend(credentials_from(batch))
+            except Exception:
+                pass  # like indexing, parsing must never break a command
+
+    def close(self):
+        for parser in self.parsers:
+            self._pending.extend(parser.end())
+        self._flush()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+
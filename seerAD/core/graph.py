@@ -0,0 +1,351 @@
+"""
+Attack graph built from a BloodHound collection (SharpHound / bloodhound-python zip).
+
+The JSON files in the zip are streamed object by object (core/jsonstream.py). Every
+object gets an integer id; membership, ACL, session and local-rights edges are
+collected into flat arrays and turned into a CSR adjacency list: `offsets[n]` ..
+`offsets[n + 1]` index the `targets` / `types` arrays, so a node's out-edges are
+one contiguous slice. The arrays are written to LOOT_DIR/<target>/graph/ as raw
+machine-format files and read back with one array.frombytes() each, so a path
+query loads a 200k-object domain in milliseconds.
+
+Paths are found with a 0-1 BFS (Dijkstra with weights 0 and 1): MemberOf edges
+are free, every other edge is one action, so the answer is the path with the
+fewest things to do.
+"""
+import io
+import json
+import time
+import zipfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from seerAD.config import LOOT_DIR
+from seerAD.core.jsonstream import iter_items
+
+KINDS = ["unknown", "user", "group", "computer", "domain", "gpo", "ou", "container"]
+FILE_KINDS = {"users": 1, "groups": 2, "computers": 3, "domains": 4, "gpos": 5, "ous": 6, "containers": 7}
+
+EDGE_TYPES = [
+    "MemberOf", "GenericAll", "GenericWrite", "WriteOwner", "WriteDacl", "Owns", "AddMember", "AddSelf",
+    "ForceChangePassword", "AllExtendedRights", "AddKeyCredentialLink", "AddAllowedToAct", "AllowedToAct",
+    "AllowedToDelegate", "WriteAccountRestrictions", "WriteSPN", "ReadLAPSPassword", "SyncLAPSPassword",
+    "ReadGMSAPassword", "DCSync", "AdminTo", "CanRDP", "CanPSRemote", "ExecuteDCOM", "HasSession",
+    "HasSIDHistory", "Contains", "GPLink",
+]
+EDGE_IDS = {name: i for i, name in enumerate(EDGE_TYPES)}
+# computer property lists -> edge from each listed principal to the computer
+COMPUTER_RIGHTS = {"LocalAdmins": "AdminTo", "RemoteDesktopUsers": "CanRDP", "PSRemoteUsers": "CanPSRemote",
+                   "DcomUsers": "ExecuteDCOM", "AllowedToAct": "AllowedToAct"}
+
+GRAPH_FILES = ("offsets", "targets", "types", "kinds")
+
+
+def graph_dir(label: str) -> Path:
+    return LOOT_DIR / label / "graph"
+
+
+def _results(value) -> list:
+    """SharpHound v5+ wraps computer lists in {"Results": [...]}; older versions do not."""
+    if isinstance(value, dict):
+        return value.get("Results") or []
+    return value or []
+
+
+def _file_kind(name: str) -> int:
+    stem = Path(name).stem.lower()
+    for suffix, kind in FILE_KINDS.items():
+        if stem.endswith(suffix):
+            return kind
+    return 0
+
+
+class GraphBuilder:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.kinds = bytearray()
+        self.src, self.dst, self.types = array("i"), array("i"), array("B")
+        self._get_changes: set = set()
+        self._get_changes_all: set = set()
+
+    def node(self, sid: str, kind: int = 0, name: Optional[str] = None) -> int:
+        sid = sid.upper()
+        i = self.ids.get(sid)
+        if i is None:
+            i = self.ids[sid] = len(self.names)
+            self.names.append(name or sid)
+            self.kinds.append(kind)
+        else:
+            if kind and not self.kinds[i]:
+                self.kinds[i] = kind
+            if name:
+                self.names[i] = name
+        return i
+
+    def edge(self, src: int, dst: int, edge: str):
+        t = EDGE_IDS.get(edge)
+        if t is not None:
+            self.src.append(src)
+            self.dst.append(dst)
+            self.types.append(t)
+
+    def add(self, obj: Dict[str, Any], kind: int):
+        sid = obj.get("ObjectIdentifier")
+        if not sid:
+            return
+        name = (obj.get("Properties") or {}).get("name")
+        me = self.node(sid, kind, name)
+        for ace in obj.get("Aces") or []:
+            principal, right = ace.get("PrincipalSID"), ace.get("RightName")
+            if not principal or not right:
+                continue
+            who = self.node(principal, _kind(ace.get("PrincipalType")))
+            if right == "GetChanges":
+                self._get_changes.add((who, me))
+            elif right == "GetChangesAll":
+                self._get_changes_all.add((who, me))
+            else:
+                self.edge(who, me, right)
+        for member in obj.get("Members") or []:
+            if member.get("ObjectIdentifier"):
+                self.edge(self.node(member["ObjectIdentifier"], _kind(member.get("ObjectType"))), me, "MemberOf")
+        for prop, edge in COMPUTER_RIGHTS.items():
+            for entry in _results(obj.get(prop)):
+                if entry.get("ObjectIdentifier"):
+                    self.edge(self.node(entry["ObjectIdentifier"], _kind(entry.get("ObjectType"))), me, edge)
+        for session in _results(obj.get("Sessions")):
+            if session.get("UserSID"):
+                self.edge(me, self.node(session["UserSID"], 1), "HasSession")
+        for entry in obj.get("AllowedToDelegate") or []:
+            target = entry.get("ObjectIdentifier") if isinstance(entry, dict) else None
+            if target:
+                self.edge(me, self.node(target, _kind(entry.get("ObjectType"))), "AllowedToDelegate")
+        for entry in obj.get("HasSIDHistory") or []:
+            if isinstance(entry, dict) and entry.get("ObjectIdentifier"):
+                self.edge(me, self.node(entry["ObjectIdentifier"], _kind(entry.get("ObjectType"))), "HasSIDHistory")
+        for child in obj.get("ChildObjects") or []:
+            if child.get("ObjectIdentifier"):
+                self.edge(me, self.node(child["ObjectIdentifier"], _kind(child.get("ObjectType"))), "Contains")
+        for link in obj.get("Links") or []:
+            if link.get("GUID"):
+                self.edge(self.node(link["GUID"], 5), me, "GPLink")
+
+    def finish(self) -> "Graph":
+        for pair in self._get_changes & self._get_changes_all:
+            self.edge(pair[0], pair[1], "DCSync")
+        n, m = len(self.names), len(self.src)
+        offsets = array("i", bytes(4 * (n + 1)))
+        for s in self.src:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = array("i", offsets[:n])
+        targets, types = array("i", bytes(4 * m)), array("B", bytes(m))
+        for s, d, t in zip(self.src, self.dst, self.types):
+            p = fill[s]
+            targets[p], types[p] = d, t
+            fill[s] = p + 1
+        sids = [""] * n
+        for sid, i in self.ids.items():
+            sids[i] = sid
+        return Graph(self.names, sids, bytes(self.kinds), offsets, targets, types)
+
+
+def _kind(object_type: Optional[str]) -> int:
+    object_type = (object_type or "").lower()
+    return KINDS.index(object_type) if object_type in KINDS else 0
+
+
+class Graph:
+    def __init__(self, names: List[str], sids: Optional[List[str]], kinds: bytes, offsets: array, targets: array,
+                 types: array, meta: Optional[Dict[str, Any]] = None, directory: Optional[Path] = None):
+        self.names, self._sids, self.kinds = names, sids, kinds
+        self.offsets, self.targets, self.types = offsets, targets, types
+        self.meta = meta or {}
+        self.directory = directory
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @property
+    def sids(self) -> List[str]:
+        """Read on first use: most queries name their objects."""
+        if self._sids is None:
+            self._sids = (self.directory / "sids.txt").read_text(encoding="utf-8").split("\n")
+        return self._sids
+
+    def save(self, out_dir: Path, **meta):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / "offsets").write_bytes(self.offsets.tobytes())
+        (out_dir / "targets").write_bytes(self.targets.tobytes())
+        (out_dir / "types").write_bytes(self.types.tobytes())
+        (out_dir / "kinds").write_bytes(self.kinds)
+        (out_dir / "names.txt").write_text("\n".join(n.replace("\n", " ") for n in self.names), encoding="utf-8")
+        (out_dir / "sids.txt").write_text("\n".join(self.sids), encoding="utf-8")
+        domains = [self.names[i] for i, kind in enumerate(self.kinds) if kind == KINDS.index("domain")]
+        self.meta = dict(meta, nodes=len(self), edges=self.edge_count, domains=domains,
+                         itemsize=self.offsets.itemsize, edge_types=EDGE_TYPES, imported_at=time.time())
+        (out_dir / "meta.json").write_text(json.dumps(self.meta, indent=2))
+        self.directory = out_dir
+
+    @classmethod
+    def load(cls, in_dir: Path) -> "Graph":
+        meta = json.loads((in_dir / "meta.json").read_text())
+        if meta.get("edge_types") != EDGE_TYPES or meta.get("itemsize") != array("i").itemsize:
+            raise ValueError("graph was imported by another seerAD version; run 'graph import' again")
+        arrays = {}
+        for name, code in (("offsets", "i"), ("targets", "i"), ("types", "B")):
+            arrays[name] = array(code)
+            arrays[name].frombytes((in_dir / name).read_bytes())
+        names = (in_dir / "names.txt").read_text(encoding="utf-8").split("\n")
+        return cls(names, None, (in_dir / "kinds").read_bytes(), arrays["offsets"], arrays["targets"],
+                   arrays["types"], meta, in_dir)
+
+    def find(self, query: str) -> List[int]:
+        """
+        Nodes named `query`, `query@<an imported domain>`, or with SID `query`. BloodHound
+        upper-cases names, so these are list.index() lookups; other spellings fall back to a scan.
+        """
+        q = query.upper()
+        for candidate in [q] + [f"{q}@{domain}" for domain in self.meta.get("domains", [])]:
+            try:
+                return [self.names.index(candidate)]
+            except ValueError:
+                pass
+        if q.startswith("S-1-"):
+            try:
+                return [self.sids.index(q)]
+            except ValueError:
+                return []
+        found = [i for i, name in enumerate(self.names) if name.upper() == q]
+        return found or [i for i, name in enumerate(self.names) if name.upper().split("@", 1)[0] == q]
+
+    def shortest_path(self, source: int, goals: Iterable[int]) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Fewest non-MemberOf edges from `source` to any goal, as [(from, edge type, to), ...].
+        Cost levels are expanded one at a time: everything reachable through MemberOf at cost k,
+        then the nodes one action further become cost k + 1. The first goal reached is optimal.
+        """
+        goals = set(goals)
+        n = len(self)
+        seen, queued = bytearray(n), bytearray(n)
+        parent, via = array("i", [-1]) * n, bytearray(n)
+        offsets, targets, types = self.offsets, self.targets, self.types
+        member_of = EDGE_IDS["MemberOf"]
+        level = [source]
+        seen[source] = 1
+        while level:
+            for u in level:
+                if u in goals:
+                    return self._walk_back(source, u, parent, via)
+            nxt = []
+            i = 0
+            while i < len(level):  # grows while MemberOf edges are followed
+                u = level[i]
+                i += 1
+                for p in range(offsets[u], offsets[u + 1]):
+                    v = targets[p]
+                    if seen[v]:
+                        continue
+                    t = types[p]
+                    if t == member_of:
+                        seen[v], parent[v], via[v] = 1, u, t
+                        if v in goals:
+                            return self._walk_back(source, v, parent, via)
+                        level.append(v)
+                    elif not queued[v]:
+                        queued[v], parent[v], via[v] = 1, u, t
+                        nxt.append(v)
+            level = [v for v in nxt if not seen[v]]
+            for v in level:
+                seen[v] = 1
+        return None
+
+    def sid_entries(self) -> Iterable[Tuple[str, str, Optional[str], str]]:
+        """(sid, account, domain, kind) of every named node, for the SID cache (core/sids.py)."""
+        for sid, name, kind in zip(self.sids, self.names, self.kinds):
+            if sid.startswith("S-1-") and name != sid:
+                domain = name.rsplit("@", 1)[1] if "@" in name else None
+                yield sid, account_name(name, kind), domain, KINDS[kind]
+
+    @staticmethod
+    def _walk_back(source: int, node: int, parent: array, via: bytearray) -> List[Tuple[int, int, int]]:
+        path = []
+        while node != source:
+            path.append((parent[node], via[node], node))
+            node = parent[node]
+        return path[::-1]
+
+
+def import_bloodhound(zip_path: Path) -> Graph:
+    """Stream every *.json member of a BloodHound zip into a Graph."""
+    builder = GraphBuilder()
+    with zipfile.ZipFile(zip_path) as zf:
+        members = [m for m in zf.namelist() if m.lower().endswith(".json")]
+        # domains and groups first: their names are the ones queries ask for
+        members.sort(key=lambda m: (_file_kind(m) not in (4, 2), m))
+        for member in members:
+            header: Dict[str, Any] = {}
+            kind = _file_kind(member)
+            with zf.open(member) as raw:
+                text = io.TextIOWrapper(raw, encoding="utf-8-sig")
+                for obj in iter_items(text, key="data", header=header):
+                    if isinstance(obj, dict):
+                        builder.add(obj, kind)
+    return builder.finish()
+
+
+def account_name(name: str, kind: int) -> str:
+    """sAMAccountName from a BloodHound name: ALICE@CORP.LOCAL -> alice, DC01.CORP.LOCAL -> DC01$."""
+    if KINDS[kind] == "computer" and "@" not in name:
+        return name.split(".", 1)[0] + "$"
+    return name.split("@", 1)[0]
+
+
+def abuse_hint(edge: str, target: str, target_kind: int, me: str, auth: str) -> str:
+    """The seerAD command that exercises an edge, or what to do by hand."""
+    kind = KINDS[target_kind]
+    quoted = f"'{target}'" if " " in target else target
+    if edge == "MemberOf":
+        return ""
+    if edge in ("AddMember", "AddSelf") or (edge in ("GenericAll", "GenericWrite") and kind == "group"):
+        return f"abuse add_groupmember {auth} {quoted} {me}"
+    if edge in ("WriteDacl", "Owns"):
+        return f"abuse add_genericall {auth} {quoted} {me}"
+    if edge == "WriteOwner":
+        return f"abuse set_owner {auth} {quoted} {me}"
+    if edge == "ForceChangePassword" or (edge == "AllExtendedRights" and kind == "user"):
+        return f"abuse set_password {auth} {quoted} <new password>"
+    if edge == "AddKeyCredentialLink" or (edge in ("GenericAll", "GenericWrite") and kind == "user"):
+        return f"abuse add_shadowcreds {auth} {quoted}"
+    if edge in ("AddAllowedToAct", "WriteAccountRestrictions") or (edge in ("GenericAll", "GenericWrite") and kind == "computer"):
+        return f"abuse add_rbcd {auth} {quoted} <your machine account>"
+    if edge == "GenericAll" and kind in ("ou", "container", "domain"):
+        return f"abuse add_genericall {auth} {quoted} {me}"
+    if edge == "WriteSPN":
+        return f"abuse set_object {auth} {quoted} servicePrincipalName -v <spn>  (then enum userspns)"
+    if edge in ("ReadLAPSPassword", "SyncLAPSPassword") or (edge == "AllExtendedRights" and kind == "computer"):
+        return f"abuse get_search {auth} --filter '(sAMAccountName={target})' --attr ms-Mcs-AdmPwd"
+    if edge == "ReadGMSAPassword":
+        return f"abuse get_object {auth} {quoted} --attr msDS-ManagedPassword"
+    if edge == "DCSync" or (edge == "AllExtendedRights" and kind == "domain"):
+        return "secretsdump.py -just-dc (DCSync)"
+    if edge == "AdminTo":
+        return f"enum smb {auth} --sam / --lsa"
+    if edge == "CanPSRemote":
+        return f"enum winrm {auth} -x <command>"
+    if edge == "CanRDP":
+        return f"enum rdp {auth}"
+    if edge == "AllowedToDelegate":
+        return "getST.py -spn <allowed spn> -impersonate Administrator"
+    if edge == "AllowedToAct":
+        return "getST.py -spn cifs/<target> -impersonate Administrator (RBCD)"
+    if edge == "HasSession":
+        return "dump credentials on the host (enum smb --lsa)"
+    return ""
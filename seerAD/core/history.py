@@ -0,0 +1,167 @@
+"""
+Append-only command history for the interactive shell.
+
+Each entry is one JSON line tagged with the target and credential that were
+active when it ran. Appends are a single write; the file is compacted back to
+max_size entries only once it grows past twice that.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+
+from prompt_toolkit.history import History
+
+from seerAD.config import DATA_DIR
+
+HISTORY_FILE = DATA_DIR / "history.jsonl"
+LEGACY_HISTORY_FILE = DATA_DIR / "history"  # prompt_toolkit FileHistory format
+
+_active: Optional["SeerHistory"] = None
+
+
+def _legacy_entries(path: Path) -> List[str]:
+    """Commands from a prompt_toolkit FileHistory file ('# timestamp' + '+line' blocks)."""
+    entries, lines = [], []
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.decode("utf-8", errors="replace")
+            if line.startswith("+"):
+                lines.append(line[1:])
+            elif lines:
+                entries.append("".join(lines)[:-1])
+                lines = []
+    if lines:
+        entries.append("".join(lines)[:-1])
+    return entries
+
+
+class SeerHistory(History):
+    """
+    prompt_toolkit History backed by a JSONL file, with an in-memory index by target.
+    Wrap in ThreadedHistory to load it in the background.
+    """
+
+    def __init__(self, filename: Path = HISTORY_FILE, max_size: int = 1000,
+                 context: Optional[Callable[[], Tuple[Optional[str], Optional[str]]]] = None):
+        super().__init__()
+        self.filename = Path(filename)
+        self.max_size = max_size
+        self.context = context  # returns (target, credential) for new entries
+        self.entries: List[Dict[str, Any]] = []  # oldest first
+        self._by_target: Dict[str, List[int]] = {}
+        self._lines = 0  # entries in the file, including ones not yet compacted away
+        self._index_loaded = False
+        self._lock = threading.Lock()
+
+    # === Loading / indexing ===
+    def _read(self):
+        if not self.filename.exists():
+            if LEGACY_HISTORY_FILE.exists() and self.filename == HISTORY_FILE:
+                self._migrate_legacy()
+            else:
+                return
+        entries = []
+        with open(self.filename, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # torn write from a crash
+        self._lines = len(entries)
+        self.entries = entries[-self.max_size:]
+        self._reindex()
+
+    def _migrate_legacy(self):
+        commands = _legacy_entries(LEGACY_HISTORY_FILE)[-self.max_size:]
+        self._write_all([{"cmd": c, "target": None, "cred": None, "ts": None} for c in commands])
+
+    def _reindex(self):
+        self._by_target = {}
+        for i, entry in enumerate(self.entries):
+            if entry.get("target"):
+                self._by_target.setdefault(entry["target"], []).append(i)
+
+    def ensure_loaded(self):
+        with self._lock:
+            if not self._index_loaded:
+                self._read()
+                self._index_loaded = True
+
+    def load_history_strings(self) -> Iterable[str]:
+        self.ensure_loaded()
+        with self._lock:
+            commands = [e.get("cmd", "") for e in self.entries]
+        yield from reversed(commands)
+
+    # === Storing ===
+    def store_string(self, string: str) -> None:
+        target, cred = self.context() if self.context else (None, None)
+        entry = {
+            "cmd": string,
+            "target": target,
+            "cred": cred,
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.ensure_loaded()
+        with self._lock:
+            self.filename.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.filename, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._lines += 1
+
+            self.entries.append(entry)
+            if target:
+                self._by_target.setdefault(target, []).append(len(self.entries) - 1)
+
+            if self._lines > 2 * self.max_size:
+                self._compact()
+
+    def _write_all(self, entries: List[Dict[str, Any]]):
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.filename.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, self.filename)
+
+    def _compact(self):
+        self.entries = self.entries[-self.max_size:]
+        self._write_all(self.entries)
+        self._lines = len(self.entries)
+        self._reindex()
+
+    # === Search ===
+    def search(self, pattern: str, target: Optional[str] = None, cred: Optional[str] = None,
+               limit: int = 50) -> List[Dict[str, Any]]:
+        """Entries whose command matches the regex, newest first. Raises re.error on a bad pattern."""
+        regex = re.compile(pattern)
+        self.ensure_loaded()
+        with self._lock:
+            positions = self._by_target.get(target, []) if target else range(len(self.entries))
+            results = []
+            for i in reversed(positions):
+                entry = self.entries[i]
+                if cred and (entry.get("cred") or "").lower() != cred.lower():
+                    continue
+                if regex.search(entry.get("cmd", "")):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+        return results
+
+
+def set_active_history(history: SeerHistory):
+    """Register the shell's history so in-process commands search its index instead of rereading the file."""
+    global _active
+    _active = history
+
+
+def get_history() -> SeerHistory:
+    global _active
+    if _active is None:
+        _active = SeerHistory()
+    return _active
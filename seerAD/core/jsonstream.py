@@ -0,0 +1,107 @@
+"""
+Streaming reader for the large JSON files AD collectors write: BloodHound's
+{"data": [...], "meta": {...}} and ldapdomaindump's top-level arrays.
+
+Only one array element is decoded at a time (json.JSONDecoder.raw_decode over a
+sliding buffer), so memory stays at the size of the biggest object instead of the
+whole file.
+"""
+import json
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+CHUNK = 1 << 16
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+class _Reader:
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(max(CHUNK, len(self.buf) - self.pos))  # doubles while one value spans chunks
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos} of the buffered JSON")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _items(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("]")
+        return
+
+
+def iter_items(fp: TextIO, key: Optional[str] = None, header: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level array, or of the array under top-level `key`.
+    Other top-level members are decoded whole and, if `header` is given, stored in it
+    (those after the array only once the iteration has finished).
+    """
+    reader = _Reader(fp)
+    if key is None:
+        yield from _items(reader)
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            yield from _items(reader)
+        else:
+            value = reader.value()
+            if header is not None:
+                header[name] = value
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
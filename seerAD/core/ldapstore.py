@@ -0,0 +1,308 @@
+"""
+Offline copy of an ldapdomaindump, for `ldap import` / `ldap query`.
+
+The domain_users / domain_computers / domain_groups JSON files are streamed
+(core/jsonstream.py) into columns, one entry per object: sAMAccountName, DN,
+description, SPNs, userAccountControl, pwdLastSet and lastLogon. On top of them:
+
+- bitsets (Python ints, bit i = object i) for every userAccountControl flag, each
+  object kind and "has an SPN" / "has msDS-AllowedToDelegateTo", so questions like
+  "enabled users that do not require pre-auth" are a couple of integer ANDs;
+- inverted indexes from SPN service class and from description word to object ids.
+
+Everything lives under LOOT_DIR/<target>/ldap/: raw arrays and text columns that
+load with one read each, bitsets concatenated in one file, and the two indexes as
+JSON, read only when a query needs them.
+"""
+import io
+import json
+import re
+import time
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from seerAD.config import LOOT_DIR
+from seerAD.core.jsonstream import iter_items
+
+UAC_FLAGS = {
+    "SCRIPT": 0x1, "ACCOUNTDISABLE": 0x2, "HOMEDIR_REQUIRED": 0x8, "LOCKOUT": 0x10, "PASSWD_NOTREQD": 0x20,
+    "PASSWD_CANT_CHANGE": 0x40, "ENCRYPTED_TEXT_PWD_ALLOWED": 0x80, "TEMP_DUPLICATE_ACCOUNT": 0x100,
+    "NORMAL_ACCOUNT": 0x200, "INTERDOMAIN_TRUST_ACCOUNT": 0x800, "WORKSTATION_TRUST_ACCOUNT": 0x1000,
+    "SERVER_TRUST_ACCOUNT": 0x2000, "DONT_EXPIRE_PASSWORD": 0x10000, "MNS_LOGON_ACCOUNT": 0x20000,
+    "SMARTCARD_REQUIRED": 0x40000, "TRUSTED_FOR_DELEGATION": 0x80000, "NOT_DELEGATED": 0x100000,
+    "USE_DES_KEY_ONLY": 0x200000, "DONT_REQ_PREAUTH": 0x400000, "PASSWORD_EXPIRED": 0x800000,
+    "TRUSTED_TO_AUTH_FOR_DELEGATION": 0x1000000, "PARTIAL_SECRETS_ACCOUNT": 0x4000000,
+}
+KINDS = ("user", "computer", "group")
+FILE_KINDS = {"domain_users.json": "user", "domain_computers.json": "computer", "domain_groups.json": "group"}
+BITSETS = tuple(UAC_FLAGS) + KINDS + ("has_spn", "has_delegation")
+TEXT_COLUMNS = ("sam", "dn", "description", "spns")
+WORD_RE = re.compile(r"\w{2,}")
+FORMAT = 1
+
+
+def store_dir(label: str) -> Path:
+    return LOOT_DIR / label / "ldap"
+
+
+def _first(attrs: Dict[str, Any], name: str, default=None):
+    value = attrs.get(name)
+    if isinstance(value, list):
+        return value[0] if value else default
+    return default if value is None else value
+
+
+def _epoch(value) -> float:
+    """ldapdomaindump writes times as '2023-05-01 10:00:00.123456+00:00', sometimes raw FILETIME ints. 0 = never."""
+    if value in (None, "", 0, "0"):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return max(0.0, value / 1e7 - 11644473600) if value > 1e12 else float(value)
+    try:
+        stamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return max(0.0, stamp.timestamp())
+
+
+ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r"})  # \r too: read_text() turns it into \n
+UNESCAPES = {"n": "\n", "r": "\r"}
+UNESCAPE_RE = re.compile(r"\\(.)", re.S)
+
+
+def _clean(text: str) -> str:
+    """One value per line, escaped in one pass so that _unclean undoes it exactly."""
+    return text.translate(ESCAPES)
+
+
+def _unclean(text: str) -> str:
+    return UNESCAPE_RE.sub(lambda m: UNESCAPES.get(m.group(1), m.group(1)), text) if "\\" in text else text
+
+
+def set_bits(bits: int) -> Iterator[int]:
+    """Ids of the set bits, lowest first (str.find over the binary string, not a Python loop per bit)."""
+    s = bin(bits)[:1:-1]
+    i = s.find("1")
+    while i != -1:
+        yield i
+        i = s.find("1", i + 1)
+
+
+def _ids_to_bits(ids) -> int:
+    """Bitset from ids, set in a bytearray: OR-ing 1 << i into a growing int is quadratic."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    raw = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        raw[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(raw, "little")
+
+
+class LdapStoreBuilder:
+    def __init__(self):
+        self.columns: Dict[str, list] = {name: [] for name in TEXT_COLUMNS}
+        self.uac, self.pwd_last_set, self.last_logon = array("I"), array("d"), array("d")
+        self.kinds = bytearray()
+        self.spn_index: Dict[str, List[int]] = {}
+        self.word_index: Dict[str, List[int]] = {}
+        self.delegation: List[int] = []
+        self.domain: Optional[str] = None
+
+    def add(self, obj: Dict[str, Any], kind: str):
+        attrs = obj.get("attributes") or {}
+        i = len(self.kinds)
+        dn = obj.get("dn") or _first(attrs, "distinguishedName", "")
+        sam = _first(attrs, "sAMAccountName") or _first(attrs, "cn") or dn
+        description = _first(attrs, "description") or ""
+        spns = [str(s) for s in attrs.get("servicePrincipalName") or []]
+        if self.domain is None and "DC=" in dn.upper():
+            self.domain = ".".join(part[3:] for part in dn.split(",") if part.strip().upper().startswith("DC="))
+        self.columns["sam"].append(_clean(str(sam)))
+        self.columns["dn"].append(_clean(str(dn)))
+        self.columns["description"].append(_clean(str(description)))
+        self.columns["spns"].append(" ".join(spns))
+        self.kinds.append(KINDS.index(kind))
+        try:
+            self.uac.append(int(_first(attrs, "userAccountControl", 0)) & 0xFFFFFFFF)
+        except (TypeError, ValueError):
+            self.uac.append(0)
+        self.pwd_last_set.append(_epoch(_first(attrs, "pwdLastSet")))
+        self.last_logon.append(max(_epoch(_first(attrs, "lastLogon")), _epoch(_first(attrs, "lastLogonTimestamp"))))
+        for service in {spn.split("/", 1)[0].lower() for spn in spns}:
+            self.spn_index.setdefault(service, []).append(i)
+        for word in set(WORD_RE.findall(str(description).lower())):
+            self.word_index.setdefault(word, []).append(i)
+        if attrs.get("msDS-AllowedToDelegateTo"):
+            self.delegation.append(i)
+
+    def bitsets(self) -> Dict[str, int]:
+        n = len(self.kinds)
+        flags = {name: bytearray((n + 7) // 8) for name in UAC_FLAGS}
+        for i, uac in enumerate(self.uac):
+            if not uac:
+                continue
+            for name, flag in UAC_FLAGS.items():
+                if uac & flag:
+                    flags[name][i >> 3] |= 1 << (i & 7)
+        bits = {name: int.from_bytes(raw, "little") for name, raw in flags.items()}
+        for k, kind in enumerate(KINDS):
+            bits[kind] = _ids_to_bits(i for i, value in enumerate(self.kinds) if value == k)
+        bits["has_spn"] = _ids_to_bits(i for i, spns in enumerate(self.columns["spns"]) if spns)
+        bits["has_delegation"] = _ids_to_bits(self.delegation)
+        return bits
+
+    def save(self, out_dir: Path, **meta) -> "LdapStore":
+        out_dir.mkdir(parents=True, exist_ok=True)
+        n = len(self.kinds)
+        for name, values in self.columns.items():
+            (out_dir / f"{name}.txt").write_text("\n".join(values), encoding="utf-8")
+        (out_dir / "uac").write_bytes(self.uac.tobytes())
+        (out_dir / "pwd_last_set").write_bytes(self.pwd_last_set.tobytes())
+        (out_dir / "last_logon").write_bytes(self.last_logon.tobytes())
+        (out_dir / "kinds").write_bytes(bytes(self.kinds))
+        width = (n + 7) // 8
+        bits = self.bitsets()
+        (out_dir / "bitsets").write_bytes(b"".join(bits[name].to_bytes(width, "little") for name in BITSETS))
+        (out_dir / "spn_index.json").write_text(json.dumps(self.spn_index))
+        (out_dir / "word_index.json").write_text(json.dumps(self.word_index))
+        meta = dict(meta, objects=n, domain=self.domain, bitsets=list(BITSETS), format=FORMAT,
+                    counts={kind: self.kinds.count(k) for k, kind in enumerate(KINDS)}, imported_at=time.time())
+        (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+        return LdapStore(out_dir)
+
+
+def import_dump(dump_dir: Path) -> LdapStoreBuilder:
+    """Stream the users, computers and groups of an ldapdomaindump output dir."""
+    builder = LdapStoreBuilder()
+    found = False
+    for filename, kind in FILE_KINDS.items():
+        path = dump_dir / filename
+        if not path.exists():
+            continue
+        found = True
+        with open(path, "rb") as raw:
+            for obj in iter_items(io.TextIOWrapper(raw, encoding="utf-8-sig")):
+                if isinstance(obj, dict):
+                    builder.add(obj, kind)
+    if not found:
+        raise FileNotFoundError(f"no {', '.join(FILE_KINDS)} in {dump_dir} (run ldapdomaindump without --no-json)")
+    return builder
+
+
+class LdapStore:
+    """Read side: columns and indexes are loaded the first time a query touches them."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.meta = json.loads((directory / "meta.json").read_text())
+        if self.meta.get("format") != FORMAT or self.meta.get("bitsets") != list(BITSETS):
+            raise ValueError("LDAP data was imported by another seerAD version; run 'ldap import' again")
+        self._cache: Dict[str, Any] = {}
+
+    def __len__(self):
+        return self.meta["objects"]
+
+    def column(self, name: str):
+        if name not in self._cache:
+            path = self.directory / (f"{name}.txt" if name in TEXT_COLUMNS else name)
+            if name in TEXT_COLUMNS:
+                value = path.read_text(encoding="utf-8").split("\n") if len(self) else []
+            elif name == "kinds":
+                value = path.read_bytes()
+            else:
+                value = array("I" if name == "uac" else "d")
+                value.frombytes(path.read_bytes())
+            self._cache[name] = value
+        return self._cache[name]
+
+    def bits(self, name: str) -> int:
+        if "bitsets" not in self._cache:
+            raw, width = (self.directory / "bitsets").read_bytes(), (len(self) + 7) // 8
+            self._cache["bitsets"] = {name: int.from_bytes(raw[k * width:(k + 1) * width], "little")
+                                      for k, name in enumerate(BITSETS)}
+        return self._cache["bitsets"][name]
+
+    def index(self, name: str) -> Dict[str, List[int]]:
+        if name not in self._cache:
+            self._cache[name] = json.loads((self.directory / f"{name}_index.json").read_text())
+        return self._cache[name]
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self)) - 1
+
+    def enabled(self, include_disabled: bool = False) -> int:
+        return self.all if include_disabled else self.all & ~self.bits("ACCOUNTDISABLE")
+
+    # -- questions ---------------------------------------------------------------
+
+    def kerberoastable(self, include_disabled: bool = False) -> int:
+        """Users with an SPN (krbtgt excluded)."""
+        bits = self.bits("user") & self.bits("has_spn") & self.enabled(include_disabled)
+        sam = self.column("sam")
+        for i in set_bits(bits):
+            if sam[i].lower() == "krbtgt":
+                bits &= ~(1 << i)
+        return bits
+
+    def asreproastable(self, include_disabled: bool = False) -> int:
+        return self.bits("DONT_REQ_PREAUTH") & self.enabled(include_disabled)
+
+    def unconstrained(self, include_disabled: bool = False) -> int:
+        """TRUSTED_FOR_DELEGATION, domain controllers excluded (they always have it)."""
+        return self.bits("TRUSTED_FOR_DELEGATION") & ~self.bits("SERVER_TRUST_ACCOUNT") & self.enabled(include_disabled)
+
+    def constrained(self, include_disabled: bool = False) -> int:
+        return ((self.bits("has_delegation") | self.bits("TRUSTED_TO_AUTH_FOR_DELEGATION"))
+                & self.enabled(include_disabled))
+
+    def stale(self, days: int, include_disabled: bool = False) -> int:
+        """Users whose password was last set more than `days` ago, or never."""
+        cutoff = time.time() - days * 86400
+        candidates = self.bits("user") & self.enabled(include_disabled)
+        pwd = self.column("pwd_last_set")
+        return _ids_to_bits(i for i in set_bits(candidates) if pwd[i] < cutoff)
+
+    def flag(self, name: str, include_disabled: bool = False) -> int:
+        return self.bits(name.upper()) & self.enabled(include_disabled or name.upper() == "ACCOUNTDISABLE")
+
+    def spn_service(self, service: str, include_disabled: bool = False) -> int:
+        return _ids_to_bits(self.index("spn").get(service.lower(), [])) & self.enabled(include_disabled)
+
+    def description_words(self, words: List[str], include_disabled: bool = False) -> int:
+        """Objects whose description contains every word (whole words, case-insensitive)."""
+        index = self.index("word")
+        bits = self.enabled(include_disabled)
+        for word in words:
+            bits &= _ids_to_bits(index.get(word.lower(), []))
+        return bits
+
+    def description_regex(self, pattern: str, include_disabled: bool = False) -> int:
+        """Each distinct description is matched once: descriptions repeat a lot across accounts."""
+        regex = re.compile(pattern, re.IGNORECASE)
+        by_text: Dict[str, List[int]] = {}
+        for i, text in enumerate(self.column("description")):
+            if text:
+                by_text.setdefault(text, []).append(i)
+        ids = [i for text, group in by_text.items() if regex.search(_unclean(text)) for i in group]
+        return _ids_to_bits(ids) & self.enabled(include_disabled)
+
+    def rows(self, bits: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        out = []
+        sam, description, spns = self.column("sam"), self.column("description"), self.column("spns")
+        uac, pwd, logon, kinds = self.column("uac"), self.column("pwd_last_set"), self.column("last_logon"), self.column("kinds")
+        for i in set_bits(bits):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append({
+                "sam": _unclean(sam[i]), "kind": KINDS[kinds[i]], "description": _unclean(description[i]),
+                "spns": spns[i].split() if spns[i] else [], "uac": uac[i],
+                "flags": [name for name, flag in UAC_FLAGS.items() if uac[i] & flag],
+                "pwd_last_set": pwd[i], "last_logon": logon[i],
+            })
+        return out
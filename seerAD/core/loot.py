@@ -0,0 +1,291 @@
+"""
+Archive of tool output: every run_tool run is kept under LOOT_DIR/<target>/output/
+(gzipped, in the blob store: see core/blobs.py) and indexed line by line into an SQLite FTS5 table (LOOT_DIR/loot.db), tagged with
+module, target, credential and time, for `loot search`.
+
+The FTS5 table is contentless: it holds the index, not the text, which stays only in
+the gzipped output file. A line's rowid is (run id << 32) | line number, so a hit
+names its run and line; search() reads the hit lines back from the output files
+(each file once) and highlights the query terms itself.
+
+Lines are inserted in one transaction when the run ends, so the index grows run
+by run and a search never waits on more than one run's worth of writes.
+sqlite3 is imported on first use: run_tool's module is loaded on every startup.
+"""
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from seerAD.config import LOOT_DIR
+
+LOOT_DB = LOOT_DIR / "loot.db"
+HIT_START, HIT_END = "\x02", "\x03"  # highlight markers; the CLI turns them into markup
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- never reused: the index keys lines by run id
+    path TEXT UNIQUE,
+    module TEXT,
+    target TEXT,
+    cred TEXT,
+    command TEXT,
+    ts REAL,
+    rc INTEGER,
+    line_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_target_ts ON runs (target, ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS line_index USING fts5(text, content='', columnsize=0);
+"""
+LINE_BITS = 32
+SNIPPET_CHARS = 200
+
+
+def connect():
+    import sqlite3
+
+    LOOT_DB.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(LOOT_DB), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")  # searches don't wait for a run being indexed
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _index_lines(conn, run_id: int, path: Path) -> int:
+    with _open_text(path) as f:
+        rows = (((run_id << LINE_BITS) | lineno, line.rstrip("\n")) for lineno, line in enumerate(f, 1))
+        count = conn.executemany("INSERT INTO line_index (rowid, text) VALUES (?, ?)", rows).rowcount
+    conn.execute("UPDATE runs SET line_count = ? WHERE id = ?", (count, run_id))
+    return count
+
+
+def _unindex_lines(conn, run_id: int, path: Path):
+    """Take a run's lines out of line_index. A contentless table needs each line's text back to do it."""
+    with _open_text(path) as f:
+        rows = (((run_id << LINE_BITS) | lineno, line.rstrip("\n")) for lineno, line in enumerate(f, 1))
+        conn.executemany("INSERT INTO line_index (line_index, rowid, text) VALUES ('delete', ?, ?)", rows)
+
+
+def forget_target(label: str) -> int:
+    """
+    Drop everything loot.db holds about a target, in one transaction: its runs and their
+    indexed lines, facts and services. Call it before the target's output files go away.
+    Returns the number of runs dropped.
+    """
+    if not LOOT_DB.exists():
+        return 0
+    from seerAD.core import facts, services
+
+    conn = connect()
+    try:
+        conn.executescript(facts.SCHEMA + services.SCHEMA)
+        with conn:
+            runs = conn.execute("SELECT id, path FROM runs WHERE target = ?", (label,)).fetchall()
+            for run_id, path in runs:
+                try:
+                    _unindex_lines(conn, run_id, Path(path))
+                except OSError:
+                    pass  # the file is gone: its lines stay in the index, but no longer name a run
+            conn.execute("DELETE FROM runs WHERE target = ?", (label,))
+            conn.execute("DELETE FROM facts WHERE target = ?", (label,))
+            conn.execute("DELETE FROM services WHERE target = ?", (label,))
+        return len(runs)
+    finally:
+        conn.close()
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-")[:40] or "output"
+
+
+class OutputRecorder:
+    """run_tool output stage that writes the output to the target's loot dir and indexes it on close."""
+
+    def __init__(self, target_label: Optional[str], module: str, cred: Optional[str], command: Sequence[str]):
+        self.target_label = target_label
+        self.module = module
+        self.cred = cred
+        self.command = " ".join(command)
+        self.returncode: Optional[int] = None  # set by run_tool before close()
+        self.path: Optional[Path] = None
+        self.started = time.time()
+        self._file = None
+
+    def feed(self, line: str):
+        if not self.target_label:
+            return
+        if self._file is None:
+            stamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d-%H%M%S")
+            self.path = LOOT_DIR / self.target_label / "output" / f"{stamp}-{os.getpid()}-{_slug(self.module)}.log"
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8", errors="replace")
+        self._file.write(line if line.endswith("\n") else line + "\n")
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        try:
+            from seerAD.core import blobs
+            self.path = blobs.store(self.path, self.path, compress=True)
+        except OSError:
+            pass  # left as plain text
+        try:
+            index_run(self.path, module=self.module, target=self.target_label, cred=self.cred,
+                      command=self.command, ts=self.started, rc=self.returncode)
+        except Exception:
+            pass  # the output file is kept; indexing must never break a command
+
+
+def _open_text(path: Path):
+    if str(path).endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def index_run(path: Path, module: str, target: str, cred: Optional[str] = None, command: str = "",
+              ts: Optional[float] = None, rc: Optional[int] = None) -> int:
+    """Index one output file. Returns the number of lines indexed (0 if it was indexed before)."""
+    conn = connect()
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO runs (path, module, target, cred, command, ts, rc) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(path), module, target, cred, command, ts or time.time(), rc))
+            if not cur.rowcount:
+                return 0
+            return _index_lines(conn, cur.lastrowid, path)
+    finally:
+        conn.close()
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _phrase(query: str) -> str:
+    """Any text as one FTS5 phrase, keeping a trailing * as a prefix match."""
+    prefix = query.rstrip().endswith("*")
+    return _quote(query.rstrip().rstrip("*")) + (" *" if prefix else "")
+
+
+def _terms(query: str) -> "re.Pattern":
+    """What to highlight: the words and phrases of the query (prefix* kept), as one regex."""
+    parts = []
+    for phrase, word in re.findall(r'"((?:[^"]|"")*)"|([^\s()]+)', query):
+        text = phrase.replace('""', '"') if phrase else word
+        if not phrase and text in ("AND", "OR", "NOT", "NEAR"):
+            continue
+        prefix = text.endswith("*")
+        tokens = re.findall(r"\w+", text)
+        if tokens:
+            parts.append(r"\b" + r"\W+".join(map(re.escape, tokens)) + (r"\w*" if prefix else r"\b"))
+    return re.compile("|".join(parts) or r"(?!)", re.I)
+
+
+def _snippet(text: str, terms: "re.Pattern") -> str:
+    """The line with HIT_START/HIT_END around each hit, cut to about SNIPPET_CHARS around the first."""
+    first = terms.search(text)
+    start = max(0, first.start() - SNIPPET_CHARS // 4) if first and len(text) > SNIPPET_CHARS else 0
+    cut = text[start:start + SNIPPET_CHARS]
+    marked = terms.sub(lambda m: f"{HIT_START}{m.group(0)}{HIT_END}", cut)
+    return ("…" if start else "") + marked + ("…" if start + SNIPPET_CHARS < len(text) else "")
+
+
+def _read_lines(path: str, wanted: set) -> Dict[int, str]:
+    found: Dict[int, str] = {}
+    last = max(wanted)
+    try:
+        with _open_text(Path(path)) as f:
+            for lineno, line in enumerate(f, 1):
+                if lineno in wanted:
+                    found[lineno] = line.rstrip("\n")
+                if lineno >= last:
+                    break
+    except OSError:
+        pass
+    return found
+
+
+def _matching_lines(conn, query: str, runs: Dict[int, Any], filtered: bool, limit: int) -> List[int]:
+    """
+    Rowids of the newest `limit` matching lines in `runs`. With a filter the index is read
+    run by run over each run's rowid range, so a few runs out of many cost only their own hits.
+    """
+    if not filtered:
+        sql = "SELECT rowid FROM line_index WHERE line_index MATCH ? ORDER BY rowid DESC LIMIT ?"
+        return [rowid for (rowid,) in conn.execute(sql, (query, limit)) if rowid >> LINE_BITS in runs]
+    sql = ("SELECT rowid FROM line_index WHERE line_index MATCH ? AND rowid BETWEEN ? AND ? "
+           "ORDER BY rowid DESC LIMIT ?")
+    found: List[int] = []
+    for run_id in runs:
+        first = run_id << LINE_BITS
+        found += (rowid for (rowid,) in conn.execute(sql, (query, first, first | ((1 << LINE_BITS) - 1), limit - len(found))))
+        if len(found) >= limit:
+            break
+    return found
+
+
+def search(query: str, target: Optional[str] = None, module: Optional[str] = None, cred: Optional[str] = None,
+           since: Optional[float] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Newest matching lines first. `query` is FTS5 syntax (words, "phrases", prefix*,
+    AND/OR/NOT); anything that does not parse as such is searched as a plain phrase.
+    `module` matches whole words of the module name ("ldap" finds "nxc ldap").
+    """
+    if not LOOT_DB.exists():
+        return []
+    where, params = ["ts >= ?"], [since or 0]
+    for column, value in (("target", target), ("cred", cred)):
+        if value:
+            where.append(f"{column} = ?")
+            params.append(value)
+    if module:
+        where.append("' ' || module || ' ' LIKE ?")
+        params.append(f"% {module} %")
+    import sqlite3
+
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    filtered = bool(target or module or cred or since)
+    try:
+        runs = {row["id"]: row for row in conn.execute(
+            f"SELECT id, path, module, target, cred, ts, rc FROM runs WHERE {' AND '.join(where)} ORDER BY id DESC", params)}
+        try:
+            ids = _matching_lines(conn, query, runs, filtered, limit)
+        except sqlite3.OperationalError:
+            query = _phrase(query)
+            ids = _matching_lines(conn, query, runs, filtered, limit)
+    finally:
+        conn.close()
+
+    hits = [dict(runs[rowid >> LINE_BITS], lineno=rowid & ((1 << LINE_BITS) - 1)) for rowid in ids]
+    wanted: Dict[str, set] = {}
+    for hit in hits:
+        wanted.setdefault(hit["path"], set()).add(hit["lineno"])
+    texts = {path: _read_lines(path, linenos) for path, linenos in wanted.items()}
+    terms = _terms(query)
+    for hit in hits:
+        del hit["id"]  # the run's
+        hit["snippet"] = _snippet(texts[hit["path"]].get(hit["lineno"], ""), terms)
+    return hits
+
+
+def recent_runs(target: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Indexed runs, newest first."""
+    if not LOOT_DB.exists():
+        return []
+    import sqlite3
+
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        where, params = ("WHERE target = ?", [target]) if target else ("", [])
+        rows = conn.execute(f"SELECT * FROM runs {where} ORDER BY ts DESC LIMIT ?", params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
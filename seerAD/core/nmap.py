@@ -0,0 +1,126 @@
+"""
+nmap XML (-oX / -oA) reader for `target import`.
+
+Hosts are streamed with iterparse: each <host> is read into a ScannedHost when its end
+tag arrives and then cleared from the tree, so memory stays flat however large the scan.
+A host's ports are dated by when nmap saw them (the host's endtime/starttime, else the
+scan's start), not by the import.
+Names come from what nmap already learned: NTLM info scripts (rdp-/smb-/http-/ms-sql-
+ntlm-info), smb-os-discovery, ldap-rootdse, the "Domain:" of the AD LDAP service banner,
+the service hostname and the PTR / user hostnames, in that order of trust.
+
+A host is a DC when it serves the global catalog (3268), Kerberos with LDAP (88 + 389/636),
+or when a script or banner says so (Active Directory LDAP, domainControllerFunctionality).
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Set
+
+from seerAD.core.discover import Host, dn_to_domain
+
+DOMAIN_INFO = re.compile(r"Domain:\s*([^,\s]+)")
+ROOTDSE_LINE = re.compile(r"^\s*(defaultNamingContext|dnsHostName|domainControllerFunctionality):\s*(\S+)", re.M)
+FQDN_KEYS = ("DNS_Computer_Name", "fqdn", "dnsHostName")
+DOMAIN_KEYS = ("DNS_Domain_Name", "domain_dns")
+NETBIOS_KEYS = ("NetBIOS_Computer_Name", "server")
+NETBIOS_DOMAIN_KEYS = ("NetBIOS_Domain_Name",)
+
+
+@dataclass
+class ScannedHost(Host):
+    open_ports: Set[int] = field(default_factory=set)
+    dc_signs: Set[str] = field(default_factory=set)
+
+    @property
+    def is_dc(self) -> bool:
+        ports = self.open_ports
+        return bool(3268 in ports or (88 in ports and (389 in ports or 636 in ports)) or self.dc_signs)
+
+
+def _domain(name: Optional[str]) -> Optional[str]:
+    """corp.local from 'corp.local0.' (how nmap prints the LDAP banner domain) or 'CORP.LOCAL.'."""
+    if not name:
+        return None
+    name = name.strip().rstrip(".")
+    if re.search(r"\.[a-z]+0$", name, re.I):
+        name = name[:-1]
+    return name.lower() or None
+
+
+def _script(host: ScannedHost, script) -> None:
+    values = {}
+    for elem in script.iter("elem"):
+        key = elem.get("key")
+        if key and elem.text and key not in values:
+            values[key] = elem.text.strip()
+    if script.get("id") == "ldap-rootdse":
+        for key, value in ROOTDSE_LINE.findall(script.get("output", "")):
+            values.setdefault(key, value)
+        if "domainControllerFunctionality" in values:
+            host.dc_signs.add("ldap-rootdse")
+        if values.get("defaultNamingContext"):
+            host.domain = host.domain or dn_to_domain(values["defaultNamingContext"])
+    host.fqdn = host.fqdn or next((values[k] for k in FQDN_KEYS if values.get(k)), None)
+    host.domain = host.domain or _domain(next((values[k] for k in DOMAIN_KEYS if values.get(k)), None))
+    host.netbios = host.netbios or next((values[k] for k in NETBIOS_KEYS if values.get(k)), None)
+    host.netbios_domain = host.netbios_domain or next((values[k] for k in NETBIOS_DOMAIN_KEYS if values.get(k)), None)
+
+
+def _scan_time(*values: Optional[str]) -> Optional[float]:
+    return next((float(v) for v in values if v and v.isdigit() and int(v) > 0), None)
+
+
+def _host(elem, scan_start: Optional[str] = None) -> Optional[ScannedHost]:
+    status = elem.find("status")
+    if status is not None and status.get("state") != "up":
+        return None
+    ip = next((a.get("addr") for a in elem.iterfind("address") if a.get("addrtype") in ("ipv4", "ipv6")), None)
+    if not ip:
+        return None
+    host = ScannedHost(ip, seen=_scan_time(elem.get("endtime"), elem.get("starttime"), scan_start))
+    for port in elem.iterfind("ports/port"):
+        state_elem = port.find("state")
+        state = state_elem.get("state") if state_elem is not None else "unknown"
+        name = product = None
+        service = port.find("service")
+        if service is not None:
+            name = service.get("name")
+            product = " ".join(filter(None, (service.get("product"), service.get("version")))) or None
+            if "Active Directory LDAP" in (service.get("product") or ""):
+                host.dc_signs.add("ad-ldap")
+                match = DOMAIN_INFO.search(service.get("extrainfo") or "")
+                host.domain = host.domain or (_domain(match.group(1)) if match else None)
+            host.netbios = host.netbios or service.get("hostname")
+        number = int(port.get("portid"))
+        host.ports.append((number, port.get("protocol", "tcp"), state, name, product))
+        if state == "open":
+            host.open.append(name or str(number))
+            host.open_ports.add(number)
+            for script in port.iterfind("script"):
+                _script(host, script)
+    for script in elem.iterfind("hostscript/script"):
+        _script(host, script)
+
+    names = [h.get("name") for h in elem.iterfind("hostnames/hostname") if h.get("name")]
+    host.fqdn = host.fqdn or next((n for n in names if "." in n), None)
+    if not host.fqdn and host.netbios and host.domain:
+        host.fqdn = f"{host.netbios}.{host.domain}"
+    if not host.domain and host.fqdn and "." in host.fqdn:
+        host.domain = _domain(host.fqdn.split(".", 1)[1])
+    return host
+
+
+def iter_hosts(path) -> Iterator[ScannedHost]:
+    """Up hosts of an nmap XML file, in file order, each forgotten once yielded."""
+    from xml.etree.ElementTree import iterparse
+
+    root = scan_start = None
+    for event, elem in iterparse(str(path), events=("start", "end")):
+        if root is None:
+            root = elem
+            scan_start = root.get("start")  # read now: root.clear() drops the attributes too
+        if event == "end" and elem.tag == "host":
+            host = _host(elem, scan_start)
+            root.clear()  # drops this host and anything before it
+            if host is not None:
+                yield host
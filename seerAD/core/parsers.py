@@ -0,0 +1,230 @@
+"""
+Line parsers that turn tool output into typed records: user, group, share, sid,
+valid-login and hash.
+
+A parser is a class with `feed(line)` and `end()`, each returning a list of records
+(dicts with "type" and "key", plus whatever fields the line had). `modules` lists the
+module prefixes it understands ("nxc", "GetADUsers", ...); an empty tuple means every
+module. Decorate a subclass of Parser with @register to plug it in. Patterns are
+compiled once at import, and parsers that see every line check a cheap substring
+before running a regex.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+Record = Dict[str, Any]
+
+PARSERS: List[Type["Parser"]] = []
+
+
+def register(cls: Type["Parser"]) -> Type["Parser"]:
+    PARSERS.append(cls)
+    return cls
+
+
+def parsers_for(module: str) -> List["Parser"]:
+    module = module.lower()
+    return [cls() for cls in PARSERS if not cls.modules or module.startswith(tuple(m.lower() for m in cls.modules))]
+
+
+def record(type_: str, key: str, **fields) -> Record:
+    rec = {k: v for k, v in fields.items() if v not in (None, "")}
+    rec.update(type=type_, key=key.lower())
+    return rec
+
+
+def account(user: str, domain: Optional[str] = None) -> str:
+    return f"{domain}\\{user}" if domain else user
+
+
+def classify_secret(secret: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """('password' | 'ntlm', value) for a secret as tools print it; (None, None) if hidden or empty."""
+    if not secret or set(secret) == {"*"}:
+        return None, None
+    if NT_RE.fullmatch(secret):
+        return "ntlm", secret.lower()
+    if LMNT_RE.fullmatch(secret):
+        return "ntlm", secret.split(":")[1].lower()
+    return "password", secret
+
+
+class Parser:
+    modules: Tuple[str, ...] = ()
+
+    def feed(self, line: str) -> List[Record]:
+        return []
+
+    def end(self) -> List[Record]:
+        return []
+
+
+NT_RE = re.compile(r"[0-9a-fA-F]{32}")
+LMNT_RE = re.compile(r"[0-9a-fA-F]{32}:[0-9a-fA-F]{32}")
+# [+] corp.local\alice:Summer 2024! (Pwn3d!)   /   [+] corp.local\alice from ccache
+# The secret runs to the end of the line (passwords may hold spaces), less a trailing marker
+NXC_LOGIN_RE = re.compile(r"^\[\+\]\s+(?P<domain>[^\\\s]+)\\(?P<user>[^:\s]+)"
+                          r"(?::(?P<secret>.*?)(?P<marker>\s+\((?:Pwn3d!|Guest)\))?|\s.*)?$")
+NXC_USER_RE = re.compile(r"^(?P<user>[^\s\[\]-][^\s]*)\s+(?:\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}|<never>)\s+\d+\s*(?P<description>.*)$")
+NXC_SHARE_RE = re.compile(r"^(?P<share>\S+)\s+(?P<access>READ,WRITE|READ|WRITE)?\s*(?P<remark>.*)$")
+# 500: CORP\Administrator (SidTypeUser)
+RID_RE = re.compile(r"(?P<rid>\d+): (?P<domain>[^\\]+)\\(?P<name>.+?) \(SidType(?P<kind>\w+)\)")
+DOMAIN_SID_RE = re.compile(r"Domain SID is: (?P<sid>S-1-5-21-\d+-\d+-\d+)")
+# user:rid:lmhash:nthash::: (secretsdump, nxc --sam/--ntds), optionally DOMAIN\user
+DUMP_RE = re.compile(r"(?:(?P<domain>[\w.-]+)\\)?(?P<user>[^\s:\\]+):(?P<rid>\d+):(?P<lm>[0-9a-fA-F]{32}):(?P<nt>[0-9a-fA-F]{32}):::")
+
+
+@register
+class NxcParser(Parser):
+    """Valid logins, --users and --shares tables from nxc."""
+    modules = ("nxc",)
+
+    def __init__(self):
+        self.in_shares = False
+
+    def feed(self, line: str) -> List[Record]:
+        # PROTO HOST PORT NAME rest: split() is several times cheaper than a regex on every line
+        parts = line.split(None, 4)
+        if len(parts) < 5 or not parts[2].isdigit():
+            return []
+        proto, host, rest = parts[0], parts[1], parts[4].rstrip()
+        if rest.startswith("[+]"):
+            self.in_shares = False
+            login = NXC_LOGIN_RE.match(rest)
+            if not login or not login.group("user"):
+                return []
+            kind, secret = classify_secret(login.group("secret"))
+            user, domain = login.group("user"), login.group("domain")
+            return [record("valid-login", f"{account(user, domain)}|{host}|{proto}",
+                           user=user, domain=domain, host=host, proto=proto, secret_type=kind,
+                           secret=secret, admin="Pwn3d!" in (login.group("marker") or "") or None)]
+        if rest.startswith("["):
+            self.in_shares = False
+            return []
+        if rest.startswith("Share") and "Permissions" in rest:
+            self.in_shares = True
+            return []
+        if self.in_shares:
+            share = NXC_SHARE_RE.match(rest)
+            if not share or share.group("share").startswith("-"):
+                return []
+            return [record("share", f"{host}|{share.group('share')}", host=host, share=share.group("share"),
+                           access=share.group("access"), remark=share.group("remark"))]
+        user = NXC_USER_RE.match(rest)
+        if user:
+            return [record("user", user.group("user"), user=user.group("user"),
+                           description=user.group("description"), source=host)]
+        return []
+
+
+@register
+class SidParser(Parser):
+    """lookupsid and nxc --rid-brute: RID lines, made into full SIDs once the domain SID was printed."""
+    modules = ("lookupsid", "nxc")
+
+    def __init__(self):
+        self.domain_sid: Optional[str] = None
+
+    def feed(self, line: str) -> List[Record]:
+        if "SidType" not in line:
+            if "Domain SID" in line:
+                m = DOMAIN_SID_RE.search(line)
+                if m:
+                    self.domain_sid = m.group("sid")
+            return []
+        m = RID_RE.search(line)
+        if not m:
+            return []
+        name, domain, kind = m.group("name"), m.group("domain"), m.group("kind")
+        sid = f"{self.domain_sid}-{m.group('rid')}" if self.domain_sid else None
+        out = []
+        if sid:
+            out.append(record("sid", sid, sid=sid, name=name, domain=domain, kind=kind.lower()))
+        if kind == "User":
+            out.append(record("user", name, user=name, domain=domain, rid=int(m.group("rid")), sid=sid))
+        elif kind in ("Group", "Alias", "WellKnownGroup"):
+            out.append(record("group", name, group=name, domain=domain, rid=int(m.group("rid")), sid=sid))
+        return out
+
+
+@register
+class HashParser(Parser):
+    """NT hashes in secretsdump format, from any module."""
+
+    def feed(self, line: str) -> List[Record]:
+        if ":::" not in line:
+            return []
+        return [record("hash", f"{account(m.group('user'), m.group('domain'))}|{m.group('nt')}",
+                       user=m.group("user"), domain=m.group("domain"), rid=int(m.group("rid")),
+                       lm=m.group("lm").lower(), ntlm=m.group("nt").lower())
+                for m in DUMP_RE.finditer(line)]
+
+
+@register
+class ImpacketTableParser(Parser):
+    """
+    The fixed-width tables of GetADUsers / GetUserSPNs / GetNPUsers: column bounds
+    come from the dashes line under the header, users from the "Name" column.
+    """
+    modules = ("GetADUsers", "GetUserSPNs", "GetNPUsers")
+
+    def __init__(self):
+        self.header: Optional[str] = None
+        self.columns: Optional[List[Tuple[str, int, Optional[int]]]] = None
+
+    def feed(self, line: str) -> List[Record]:
+        line = line.rstrip("\n")
+        if self.columns is None:
+            if line.startswith("----") and self.header is not None:
+                starts = [m.start() for m in re.finditer(r"-+", line)]
+                self.columns = [(self.header[start:end].strip(), start, end)
+                                for start, end in zip(starts, starts[1:] + [None])]
+            else:
+                self.header = line
+            return []
+        if not line.strip():
+            self.columns, self.header = None, None
+            return []
+        row = {name: line[start:end].strip() for name, start, end in self.columns}
+        user = row.get("Name") or row.get("SAM AcctName")
+        if not user or user.startswith("["):
+            return []
+        out = [record("user", user, user=user, email=row.get("Email"), spn=row.get("ServicePrincipalName"))]
+        member_of = row.get("MemberOf")
+        if member_of and member_of.upper().startswith("CN="):
+            group = member_of.split(",", 1)[0][3:]
+            out.append(record("group", group, group=group, member=user))
+        return out
+
+
+@register
+class LdapBlockParser(Parser):
+    """bloodyAD's `attribute: value` blocks: users and groups with their SIDs."""
+    modules = ("bloodyAD",)
+
+    def __init__(self):
+        self.block: Dict[str, str] = {}
+
+    def feed(self, line: str) -> List[Record]:
+        line = line.rstrip()
+        if not line:
+            return self.end()
+        name, sep, value = line.partition(": ")
+        if sep:
+            self.block[name] = value
+        return []
+
+    def end(self) -> List[Record]:
+        block, self.block = self.block, {}
+        sam, sid = block.get("sAMAccountName"), block.get("objectSid")
+        out = []
+        if not sam:
+            return out
+        classes = block.get("objectClass", "").lower()
+        if "group" in classes:
+            out.append(record("group", sam, group=sam, sid=sid, dn=block.get("distinguishedName")))
+        elif "user" in classes or "computer" in classes:
+            out.append(record("user", sam, user=sam, sid=sid, dn=block.get("distinguishedName"),
+                              description=block.get("description")))
+        if sid:
+            out.append(record("sid", sid, sid=sid, name=sam, kind="group" if "group" in classes else "user"))
+        return out
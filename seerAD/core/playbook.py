@@ -0,0 +1,307 @@
+"""
+Playbooks: a YAML list of seerAD commands with dependencies, run as a DAG in one process.
+
+    target: dc01
+    credential: alice
+    parallel: 4
+    steps:
+      - id: tgt
+        run: creds fetch
+      - id: users
+        enum: adusers
+        auth: ticket
+        args: [-all]
+        needs: tgt
+        capture:
+          names: '^(\\S+)\\s+\\d{4}-'
+      - id: asrep
+        run: enum npusers anon -usersfile ${steps.users.file}
+        needs: users
+
+Steps run under Session.scoped(), so parallel steps may use different
+credentials without switching the global selection.
+"""
+import hashlib
+import io
+import json
+import re
+import shlex
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from seerAD.config import LOGS_DIR
+
+PLAYBOOK_DIR = LOGS_DIR / "playbooks"
+TEMPLATE_RE = re.compile(r"\$\{(steps|target)\.([\w-]+)(?:\.(\w+))?\}")
+# CSI (colors, cursor) and OSC (hyperlinks) escape sequences
+ANSI_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\))")
+STEP_KINDS = ("enum", "abuse")
+
+
+class PlaybookError(Exception):
+    pass
+
+
+class Step:
+    def __init__(self, data: Dict[str, Any], defaults: Dict[str, Any]):
+        if not isinstance(data, dict) or not data.get("id"):
+            raise PlaybookError(f"Every step needs an 'id': {data!r}")
+        self.id = str(data["id"])
+        self.raw = data
+
+        kind = next((k for k in STEP_KINDS if k in data), None)
+        if "run" in data:
+            run = data["run"]
+            self.argv = shlex.split(run) if isinstance(run, str) else [str(a) for a in run]
+        elif kind:
+            # Module form: enum/abuse <module> <auth> [args...]
+            self.argv = [kind, str(data[kind]), str(data.get("auth", "anon"))] + [str(a) for a in data.get("args", [])]
+        else:
+            raise PlaybookError(f"Step '{self.id}' needs 'run' or one of: {', '.join(STEP_KINDS)}")
+        if not self.argv:
+            raise PlaybookError(f"Step '{self.id}' has an empty command")
+
+        needs = data.get("needs", [])
+        self.needs: List[str] = [needs] if isinstance(needs, str) else [str(n) for n in needs]
+        self.credential: Optional[str] = data.get("as", defaults.get("credential"))
+        self.target: Optional[str] = data.get("target", defaults.get("target"))
+        self.capture: Dict[str, re.Pattern] = {
+            name: re.compile(pattern, re.MULTILINE) for name, pattern in (data.get("capture") or {}).items()
+        }
+        self.allow_failure = bool(data.get("allow_failure", False))
+
+    @property
+    def signature(self) -> str:
+        """Changes whenever the step definition changes, so resume re-runs edited steps."""
+        return hashlib.sha1(json.dumps(self.raw, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Playbook:
+    def __init__(self, path: Path):
+        import yaml
+
+        self.path = Path(path).resolve()
+        try:
+            with open(self.path) as f:
+                data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise PlaybookError(f"Invalid YAML: {e}")
+        if isinstance(data, list):
+            data = {"steps": data}
+
+        defaults = {"target": data.get("target"), "credential": data.get("credential")}
+        self.parallel = int(data.get("parallel", 4))
+        self.steps: Dict[str, Step] = {}
+        for raw in data.get("steps") or []:
+            step = Step(raw, defaults)
+            if step.id in self.steps:
+                raise PlaybookError(f"Duplicate step id: {step.id}")
+            self.steps[step.id] = step
+        if not self.steps:
+            raise PlaybookError("Playbook has no steps")
+        self.order = self._toposort()
+
+    def _toposort(self) -> List[str]:
+        for step in self.steps.values():
+            for dep in step.needs:
+                if dep not in self.steps:
+                    raise PlaybookError(f"Step '{step.id}' needs unknown step '{dep}'")
+        indegree = {sid: len(step.needs) for sid, step in self.steps.items()}
+        ready = [sid for sid, n in indegree.items() if n == 0]
+        order = []
+        while ready:
+            sid = ready.pop(0)
+            order.append(sid)
+            for other in self.steps.values():
+                if sid in other.needs:
+                    indegree[other.id] -= 1
+                    if indegree[other.id] == 0:
+                        ready.append(other.id)
+        if len(order) != len(self.steps):
+            cycle = sorted(set(self.steps) - set(order))
+            raise PlaybookError(f"Dependency cycle between: {', '.join(cycle)}")
+        return order
+
+    @property
+    def run_dir(self) -> Path:
+        digest = hashlib.sha1(str(self.path).encode()).hexdigest()[:8]
+        return PLAYBOOK_DIR / f"{self.path.stem}-{digest}"
+
+
+class _StepOutput(io.TextIOBase):
+    """
+    sys.stdout replacement while a playbook runs: each worker thread writes to
+    its own step log, and complete lines are echoed with a '[step]' prefix.
+
+    The module-level rich consoles chose their colors when the real stdout was a
+    terminal, so what they print still carries escape codes. The echo keeps them;
+    the log gets plain text, which is what captures and ${steps.X.output} read.
+    """
+
+    def __init__(self, real):
+        self.real = real
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def bind(self, step_id: Optional[str], log=None):
+        self.local.step_id, self.local.log, self.local.partial = step_id, log, ""
+
+    def isatty(self): return False
+
+    def write(self, s: str) -> int:
+        step_id = getattr(self.local, "step_id", None)
+        if step_id is None:
+            with self.lock:
+                return self.real.write(s)
+        self.local.log.write(ANSI_RE.sub("", s) if "\x1b" in s else s)
+        lines = (self.local.partial + s).split("\n")
+        self.local.partial = lines.pop()
+        if lines:
+            with self.lock:
+                self.real.write("".join(f"[{step_id}] {line}\n" for line in lines))
+        return len(s)
+
+    def flush(self):
+        with self.lock:
+            self.real.flush()
+
+
+class PlaybookRunner:
+    def __init__(self, playbook: Playbook, execute: Callable[[List[str]], None],
+                 parallel: Optional[int] = None, resume: bool = False):
+        self.playbook = playbook
+        self.execute = execute  # runs one seerAD argv in-process; raises on failure
+        self.parallel = max(1, parallel or playbook.parallel)
+        self.state_file = playbook.run_dir / "state.json"
+        self.state: Dict[str, Dict[str, Any]] = self._load_state() if resume else {}
+        self._state_lock = threading.Lock()
+
+    # === State ===
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_file) as f:
+                return json.load(f).get("steps", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        with self._state_lock:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"playbook": str(self.playbook.path), "steps": self.state}, f, indent=2)
+            tmp.replace(self.state_file)
+
+    def is_done(self, step: Step) -> bool:
+        entry = self.state.get(step.id)
+        return bool(entry) and entry.get("status") == "ok" and entry.get("signature") == step.signature
+
+    # === Templates ===
+    def render(self, arg: str) -> str:
+        def substitute(m):
+            scope, name, field = m.group(1), m.group(2), m.group(3)
+            if scope == "target":
+                from seerAD.core.session import session
+                return str((session.current_target or {}).get(name) or "")
+            entry = self.state.get(name)
+            if entry is None:
+                raise PlaybookError(f"{m.group(0)}: step '{name}' has not run")
+            field = field or "output"
+            if field == "output":
+                return Path(entry["file"]).read_text(errors="replace").strip()
+            if field in ("file", "rc", "status"):
+                return str(entry[field])
+            if field in entry.get("captures", {}):
+                return ",".join(entry["captures"][field])
+            raise PlaybookError(f"{m.group(0)}: step '{name}' has no capture '{field}'")
+        return TEMPLATE_RE.sub(substitute, arg)
+
+    # === Execution ===
+    def _run_step(self, step: Step, out: _StepOutput) -> Dict[str, Any]:
+        from seerAD.core.session import session
+        from seerAD.tool_handler.helper import collect_returncodes
+
+        log_file = self.playbook.run_dir / f"{step.id}.log"
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        error, codes = None, []
+        with open(log_file, "w") as log:
+            out.bind(step.id, log)
+            try:
+                with session.scoped(target=step.target, credential=step.credential):
+                    argv = [self.render(a) for a in step.argv]
+                    print(f"❯ seerAD {' '.join(shlex.quote(a) for a in argv)}")
+                    with collect_returncodes() as codes:
+                        self.execute(argv)
+            except SystemExit as e:
+                if e.code not in (0, None):
+                    error = f"exited with {e.code}"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            finally:
+                if out.local.partial:
+                    out.write("\n")
+                out.bind(None)
+
+        output = log_file.read_text(errors="replace")
+        captures = {}
+        for name, regex in step.capture.items():
+            values = [m.group(1) if regex.groups else m.group(0) for m in regex.finditer(output)]
+            captures[name] = list(dict.fromkeys(values))
+        rc = next((c for c in codes if c != 0), 0)
+        if error is None and rc != 0:
+            error = f"tool exited with code {rc}"
+        return {
+            "status": "ok" if error is None or step.allow_failure else "failed",
+            "error": error,
+            "rc": rc,
+            "file": str(log_file),
+            "captures": captures,
+            "signature": step.signature,
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    def run(self, on_event: Callable[[str, Step, Dict[str, Any]], None] = lambda *a: None) -> Dict[str, str]:
+        """Run every step whose dependencies succeeded. Returns {step_id: status}."""
+        steps = self.playbook.steps
+        status: Dict[str, str] = {}
+        for sid in self.playbook.order:
+            # Reuse a result only if everything it depends on is reused too
+            if self.is_done(steps[sid]) and all(status.get(d) == "ok" for d in steps[sid].needs):
+                status[sid] = "ok"
+                on_event("cached", steps[sid], self.state[sid])
+            else:
+                self.state.pop(sid, None)
+
+        out = _StepOutput(sys.stdout)
+        real_stdout, sys.stdout = sys.stdout, out
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix="seer-step") as pool:
+                while True:
+                    for sid in self.playbook.order:
+                        if sid in status or sid in running.values():
+                            continue
+                        deps = [status.get(d) for d in steps[sid].needs]
+                        if any(d in ("failed", "skipped") for d in deps):
+                            status[sid] = "skipped"
+                            on_event("skipped", steps[sid], {})
+                        elif all(d == "ok" for d in deps):
+                            on_event("start", steps[sid], {})
+                            running[pool.submit(self._run_step, steps[sid], out)] = sid
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sid = running.pop(future)
+                        result = future.result()
+                        self.state[sid] = result
+                        status[sid] = result["status"]
+                        self._save_state()
+                        on_event(result["status"], steps[sid], result)
+        finally:
+            sys.stdout = real_stdout
+        return status
@@ -0,0 +1,83 @@
+"""
+Per-command profiles: `seerAD --profile <command>` (or SEER_PROFILE=1).
+
+cProfile gives exact call counts and cumulative times (.pstats, readable with
+`python -m pstats` or snakeviz). A sampling thread records the command thread's
+stack every SAMPLE_INTERVAL seconds as collapsed stacks (.folded), which
+flamegraph.pl, speedscope and inferno read directly.
+"""
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from seerAD.config import LOGS_DIR
+
+PROFILE_DIR = LOGS_DIR / "profiles"
+SAMPLE_INTERVAL = 0.005
+KEEP = 50  # newest profiles kept; older ones are pruned
+
+
+class Profiler:
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.samples: Counter = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        self._sampler = threading.Thread(target=self._sample, name="seer-profiler", daemon=True)
+        self._sampler.start()
+        self.profile.enable()
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Tuple[Path, Path]:
+        """Stop profiling and write <stamp>-<name>.pstats and .folded. Returns both paths."""
+        self.profile.disable()
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "-" for c in self.name).strip("-") or "command"
+        base = PROFILE_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{slug}"
+        pstats_file, folded_file = base.with_suffix(".pstats"), base.with_suffix(".folded")
+        self.profile.dump_stats(str(pstats_file))
+        with open(folded_file, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        _prune()
+        return pstats_file, folded_file
+
+
+def _prune():
+    for old in list_profiles()[:-KEEP]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def list_profiles() -> List[Path]:
+    """Saved .pstats files, oldest first."""
+    if not PROFILE_DIR.exists():
+        return []
+    return sorted(PROFILE_DIR.glob("*.pstats"), key=lambda p: p.stat().st_mtime)
+
+
+def last_profile() -> Optional[Path]:
+    profiles = list_profiles()
+    return profiles[-1] if profiles else None
@@ -0,0 +1,127 @@
+"""
+Run a command on a pseudo-terminal and stream its output as it arrives.
+
+The child sees a real terminal (colors, progress bars, window size) while the
+shell never holds more than one read chunk of its output in memory. Our stdin is
+forwarded to it, with the terminal in raw mode so its own line discipline handles
+echo, editing and Ctrl-C (password prompts, ssh, y/N questions keep working).
+"""
+import errno
+import fcntl
+import os
+import pty
+import re
+import select
+import signal
+import sys
+import termios
+import threading
+import tty
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+ANSI_RE = re.compile(rb"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b\][^\x07]*\x07|\r")
+
+
+def _copy_winsize(src_fd: int, dst_fd: int):
+    try:
+        size = fcntl.ioctl(src_fd, termios.TIOCGWINSZ, b"\0" * 8)
+        fcntl.ioctl(dst_fd, termios.TIOCSWINSZ, size)
+    except OSError:
+        pass  # not a terminal
+
+
+def _stdin_fd() -> Optional[int]:
+    try:
+        return sys.stdin.fileno()
+    except (AttributeError, ValueError, OSError):
+        return None  # closed, or replaced by something without a descriptor
+
+
+def run_in_pty(argv: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+               tee: Optional[Path] = None, title: Optional[str] = None) -> int:
+    """
+    Run argv on a new pty, copying its output to stdout (and to `tee`, without
+    escape codes) chunk by chunk, and stdin to it. Ctrl-C and window resizes are
+    forwarded to the child's process group. `title` is the command line written to the tee log.
+    Returns the exit code (negative signal number if killed).
+    """
+    pid, master = pty.fork()
+    if pid == 0:  # child: new session, the pty is its controlling terminal
+        try:
+            if cwd:
+                os.chdir(cwd)
+            os.execvpe(argv[0], argv, env if env is not None else os.environ)
+        except OSError as e:
+            os.write(2, f"{argv[0]}: {e.strerror}\n".encode())
+        os._exit(127)
+
+    out_fd = sys.stdout.fileno()
+    _copy_winsize(out_fd, master)
+
+    in_main_thread = threading.current_thread() is threading.main_thread()
+    if in_main_thread:
+        # The child is in its own session, so the terminal's SIGINT reaches only us; pass it on
+        old_int = signal.signal(signal.SIGINT, lambda *_: _killpg(pid, signal.SIGINT))
+        old_winch = signal.signal(signal.SIGWINCH, lambda *_: _copy_winsize(out_fd, master))
+
+    # Only the main thread owns the terminal; parallel runs get no input
+    in_fd = _stdin_fd() if in_main_thread else None
+    old_tty = None
+    if in_fd is not None and os.isatty(in_fd):
+        old_tty = termios.tcgetattr(in_fd)
+        tty.setraw(in_fd, termios.TCSANOW)
+    watch = [master] + ([in_fd] if in_fd is not None else [])
+
+    log = open(tee, "ab") if tee else None
+    try:
+        if log:
+            stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            log.write(f"\n[{stamp}] $ {title or ' '.join(argv)}\n".encode())
+        sys.stdout.flush()
+        while True:
+            try:
+                ready, _, _ = select.select(watch, [], [])
+            except InterruptedError:
+                continue
+            if in_fd in ready:
+                data = os.read(in_fd, CHUNK_SIZE)
+                if data:
+                    os.write(master, data)
+                else:  # piped input ran out: pass the EOF on and stop watching
+                    os.write(master, termios.tcgetattr(master)[6][termios.VEOF])
+                    watch.remove(in_fd)
+            if master not in ready:
+                continue
+            try:
+                chunk = os.read(master, CHUNK_SIZE)
+            except OSError as e:
+                if e.errno == errno.EIO:  # every writer closed the slave side
+                    break
+                raise
+            if not chunk:
+                break
+            os.write(out_fd, chunk)
+            if log:
+                log.write(ANSI_RE.sub(b"", chunk))
+        _, status = os.waitpid(pid, 0)
+        # os.waitstatus_to_exitcode needs Python 3.9
+        return -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    finally:
+        if old_tty is not None:
+            termios.tcsetattr(in_fd, termios.TCSADRAIN, old_tty)
+        os.close(master)
+        if log:
+            log.close()
+        if in_main_thread:
+            signal.signal(signal.SIGINT, old_int)
+            signal.signal(signal.SIGWINCH, old_winch)
+
+
+def _killpg(pid: int, sig: int):
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        pass
@@ -0,0 +1,123 @@
+"""
+Record-level snapshots of tool output, for `enum ... --diff` / `abuse ... --diff`.
+
+Each run's output is split into records: a line, or a blank-line separated block of
+`attribute: value` lines (bloodyAD, LDIF-style dumps). A record's key is a short hash
+of its text with volatile parts (ANSI colours, timestamps, spacing) normalized away.
+The last successful run per (module, options, target, credential) is kept as a gzipped
+`key<TAB>record` file under LOOT_DIR/<target>/records/; diffing against it is two
+set differences over dicts, linear in the size of both runs.
+"""
+import gzip
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from seerAD.config import LOOT_DIR
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[+-]\d{2}:?\d{2}|Z)?")
+ATTRIBUTE_RE = re.compile(r"^[A-Za-z][\w.-]*:\s")
+SEP = "\x1f"  # joins the lines of a block record in the snapshot file
+
+
+def record_key(text: str) -> str:
+    """Expects ANSI codes already stripped (feed() does). The substring checks skip regexes on most lines."""
+    if ":" in text and "-" in text:
+        text = TIMESTAMP_RE.sub("<ts>", text)
+    normalized = " ".join(text.split()).lower()
+    return hashlib.blake2b(normalized.encode("utf-8", "replace"), digest_size=8).hexdigest()
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", text or "").strip("-") or "anon"
+
+
+def normalize_args(args: Sequence[str]) -> str:
+    """
+    A run's options as one string, independent of their order: each option with the
+    values after it is one group, and groups are sorted ("--users --shares" is
+    "--shares --users").
+    """
+    groups: List[List[str]] = []
+    for arg in args:
+        if not groups or (arg.startswith("-") and len(arg) > 1):
+            groups.append([])
+        groups[-1].append(arg)
+    return " ".join(sorted(" ".join(group) for group in groups))
+
+
+def snapshot_path(target: str, module: str, cred: Optional[str], args: Sequence[str] = ()) -> Path:
+    """The options are hashed, not spelled out: they may hold secrets and any characters."""
+    options = normalize_args(args)
+    tag = "+" + hashlib.blake2b(options.encode("utf-8", "replace"), digest_size=4).hexdigest() if options else ""
+    return LOOT_DIR / target / "records" / f"{_slug(module)}{tag}@{_slug(cred)}.tsv.gz"
+
+
+def load_snapshot(path: Path) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+        return dict(line.rstrip("\n").split("\t", 1) for line in f if "\t" in line)
+
+
+class RecordSnapshot:
+    """
+    run_tool output stage: collects the run's records and, on close, diffs them
+    against the previous run's snapshot and replaces it (successful runs only).
+    """
+
+    def __init__(self, target_label: Optional[str], module: str, cred: Optional[str], args: Sequence[str] = ()):
+        self.path = snapshot_path(target_label, module, cred, args) if target_label else None
+        self.records: Dict[str, str] = {}
+        self.returncode: Optional[int] = None  # set by run_tool before close()
+        self.baseline = False  # True when there was a previous run to compare against
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self._block: List[str] = []
+
+    def _add(self, text: str):
+        self.records.setdefault(record_key(text), text)
+
+    def _flush(self):
+        if self._block:
+            self._add(SEP.join(self._block))
+            self._block = []
+
+    def feed(self, line: str):
+        if self.path is None:
+            return
+        if "\x1b" in line:
+            line = ANSI_RE.sub("", line)
+        line = line.rstrip()
+        if not line:
+            self._flush()
+        elif ATTRIBUTE_RE.match(line):
+            self._block.append(line)
+        else:
+            self._flush()
+            self._add(line)
+
+    def close(self):
+        if self.path is None:
+            return
+        self._flush()
+        previous = load_snapshot(self.path)
+        self.baseline = self.path.exists()
+        self.added = [text for key, text in self.records.items() if key not in previous]
+        self.removed = [text for key, text in previous.items() if key not in self.records]
+        if self.returncode == 0 and self.records:
+            self._save()
+
+    def _save(self):
+        from seerAD.core import blobs
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}-{threading.get_ident()}")
+        with open(tmp, "w", encoding="utf-8", errors="replace") as f:
+            f.writelines(f"{key}\t{text}\n" for key, text in self.records.items())
+        blobs.store(tmp, self.path, compress=True)
+
@@ -0,0 +1,166 @@
+import json
+import re
+from pathlib import Path
+from typing import Dict, Optional, Any, List, Iterable, Tuple
+from datetime import datetime, timezone
+from seerAD.config import LOOT_DIR
+
+# hashcat modes keyed by (kind, etype)
+HASHCAT_MODES = {
+    ("tgs", 23): 13100,
+    ("tgs", 17): 19600,
+    ("tgs", 18): 19700,
+    ("asrep", 23): 18200,
+    ("asrep", 17): 32100,
+    ("asrep", 18): 32200,
+}
+
+HASH_RE = re.compile(r"\$krb5(?:tgs|asrep)\$\S+")
+
+# $krb5tgs$23$*user$REALM$spn*$checksum$edata
+TGS_RC4_RE = re.compile(r"^\$krb5tgs\$(\d+)\$\*([^$]+)\$([^$]+)\$(.+?)\*\$[0-9a-fA-F]+\$[0-9a-fA-F]+$")
+# $krb5tgs$18$user$REALM$*spn*$checksum$edata
+TGS_AES_RE = re.compile(r"^\$krb5tgs\$(\d+)\$([^$*]+)\$([^$]+)\$\*(.+?)\*\$[0-9a-fA-F]+\$[0-9a-fA-F]+$")
+# $krb5asrep$23$user@REALM:checksum$edata (etype is optional in john format)
+ASREP_RC4_RE = re.compile(r"^\$krb5asrep\$(?:(\d+)\$)?([^@$]+)@([^:]+):[0-9a-fA-F]+\$[0-9a-fA-F]+$")
+# $krb5asrep$18$user$REALM$checksum$edata
+ASREP_AES_RE = re.compile(r"^\$krb5asrep\$(\d+)\$([^$]+)\$([^$]+)\$[0-9a-fA-F]+\$[0-9a-fA-F]+$")
+
+
+def parse_roast_hash(value: str) -> Optional[Dict[str, Any]]:
+    """Parse a $krb5tgs$ / $krb5asrep$ hash into its fields, or None if unrecognised."""
+    value = value.strip()
+    if value.startswith("$krb5tgs$"):
+        m = TGS_RC4_RE.match(value) or TGS_AES_RE.match(value)
+        if not m:
+            return None
+        etype, user, realm, spn = int(m.group(1)), m.group(2), m.group(3), m.group(4)
+        kind = "tgs"
+    elif value.startswith("$krb5asrep$"):
+        m = ASREP_RC4_RE.match(value) or ASREP_AES_RE.match(value)
+        if not m:
+            return None
+        etype, user, realm, spn = int(m.group(1) or 23), m.group(2), m.group(3), ""
+        kind = "asrep"
+    else:
+        return None
+    return {
+        "kind": kind,
+        "etype": etype,
+        "mode": HASHCAT_MODES.get((kind, etype)),
+        "user": user,
+        "realm": realm,
+        "spn": spn.replace("~", ":"),
+        "hash": value,
+    }
+
+
+class RoastStore:
+    """Per-target store of captured roast hashes, deduplicated by (SPN, user, etype)."""
+
+    def __init__(self, target_label):
+        self.target_label = target_label
+        self.roast_file = LOOT_DIR / target_label / "roast.json"
+        self.hashes: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _key(self, entry): return f"{entry['kind']}|{entry['spn'].lower()}|{entry['user'].lower()}|{entry['etype']}"
+
+    def _load(self):
+        if not self.roast_file.exists():
+            return
+        try:
+            with open(self.roast_file) as f:
+                self.hashes = json.load(f)
+        except Exception:
+            self.hashes = {}
+
+    def _save(self):
+        self.roast_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.roast_file, "w") as f:
+            json.dump(self.hashes, f, indent=2)
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        """Add a parsed hash entry in memory. Returns False if it is already known."""
+        k = self._key(entry)
+        if k in self.hashes:
+            return False
+        entry = dict(entry)
+        entry["captured_at"] = datetime.now(timezone.utc).isoformat()
+        entry["cracked"] = None
+        self.hashes[k] = entry
+        return True
+
+    def save(self): self._save()
+
+    def get_all(self) -> List[Dict[str, Any]]: return list(self.hashes.values())
+
+    def export(self, out_dir: Path, modes: Optional[Iterable[int]] = None, include_cracked=False) -> Dict[int, Tuple[Path, int]]:
+        """Stream hashes into one file per hashcat mode. Returns {mode: (path, count)}."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        modes = set(modes) if modes else None
+        handles, written = {}, {}
+        try:
+            for entry in self.hashes.values():
+                mode = entry.get("mode")
+                if mode is None or (modes and mode not in modes):
+                    continue
+                if entry.get("cracked") and not include_cracked:
+                    continue
+                if mode not in handles:
+                    path = out_dir / f"{self.target_label}_{mode}.hash"
+                    handles[mode] = open(path, "w")
+                    written[mode] = (path, 0)
+                handles[mode].write(entry["hash"] + "\n")
+                written[mode] = (written[mode][0], written[mode][1] + 1)
+        finally:
+            for fh in handles.values():
+                fh.close()
+        return written
+
+    def match_cracked(self, lines: Iterable[str]) -> List[Tuple[Dict[str, Any], str]]:
+        """Match hashcat potfile / --show lines (hash:password) against stored hashes."""
+        by_hash = {e["hash"].lower(): e for e in self.hashes.values()}
+        results = []
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.startswith("$krb5"):
+                continue
+            # The hash itself may contain ':' (AS-REP RC4), so try every split point
+            pos = line.find(":")
+            while pos != -1:
+                entry = by_hash.get(line[:pos].lower())
+                if entry:
+                    password = line[pos + 1:]
+                    if password.startswith("$HEX[") and password.endswith("]"):
+                        password = bytes.fromhex(password[5:-1]).decode("utf-8", errors="replace")
+                    entry["cracked"] = password
+                    results.append((entry, password))
+                    break
+                pos = line.find(":", pos + 1)
+        return results
+
+
+class RoastCapture:
+    """run_tool output stage that collects roast hashes into the target's RoastStore."""
+
+    def __init__(self, target_label):
+        self.target_label = target_label
+        self.store: Optional[RoastStore] = None  # loaded on the first hash seen
+        self.added = 0
+
+    def feed(self, line: str):
+        if not self.target_label or "$krb5" not in line:
+            return
+        for m in HASH_RE.finditer(line):
+            entry = parse_roast_hash(m.group(0))
+            if not entry:
+                continue
+            if self.store is None:
+                self.store = RoastStore(self.target_label)
+            if self.store.add(entry):
+                self.added += 1
+
+    def close(self):
+        if self.added:
+            self.store.save()
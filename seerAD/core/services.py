@@ -0,0 +1,136 @@
+"""
+Service inventory, kept per target in the `services` table of LOOT_DIR/loot.db: one
+row per (target, port, proto) with its state, the IP it was seen on, and where it came
+from (a port probe, `target discover`, `target import` of an nmap scan).
+
+`check` answers "is this port open on the target?" from rows younger than the TTL
+(SEER_SERVICE_TTL seconds, default 900) and probes the rest with concurrent asyncio
+connects (core/discover.is_open), so a closed port costs one connect timeout once per
+TTL instead of a tool's whole connect timeout on every run. Rows recorded for another
+IP (the target was re-pointed with `target set ip`) are ignored.
+"""
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from seerAD.core.loot import connect
+
+SERVICE_TTL = float(os.environ.get("SEER_SERVICE_TTL", "900"))
+PROBE_TIMEOUT = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS services (
+    target TEXT,
+    port INTEGER,
+    proto TEXT,
+    ip TEXT,
+    state TEXT,
+    name TEXT,
+    product TEXT,
+    source TEXT,
+    updated REAL,
+    PRIMARY KEY (target, port, proto)
+);
+"""
+
+Entry = Dict[str, Any]
+COLUMNS = ("target", "port", "proto", "ip", "state", "name", "product", "source", "updated")
+
+
+def _connect():
+    conn = connect()
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record(entries: Iterable[Tuple], source: str, conn=None) -> int:
+    """
+    Upsert (target, ip, port, proto, state, name, product[, seen]) tuples, any number of
+    targets in one transaction. `seen` is when the state was observed (an nmap scan's
+    time), now when missing or None; a row never replaces one seen later. A known name
+    or product is kept when the new row has none (a probe knows the state only).
+    """
+    now = time.time()
+    rows = [entry[:7] + (source, entry[7] if len(entry) > 7 and entry[7] else now) for entry in map(tuple, entries)]
+    if not rows:
+        return 0
+    sql = """
+        INSERT INTO services (target, ip, port, proto, state, name, product, source, updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (target, port, proto) DO UPDATE SET
+            ip = excluded.ip, state = excluded.state, name = COALESCE(excluded.name, services.name),
+            product = COALESCE(excluded.product, services.product), source = excluded.source,
+            updated = excluded.updated
+        WHERE excluded.updated >= services.updated
+    """
+    if conn is not None:
+        conn.executemany(sql, rows)
+        return len(rows)
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(sql, rows)
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def inventory(target: str, ip: Optional[str] = None, max_age: Optional[float] = None,
+              proto: str = "tcp") -> Dict[int, Entry]:
+    """Rows of a target by port; only those seen on `ip` and younger than `max_age` seconds when given."""
+    sql, params = f"SELECT {', '.join(COLUMNS)} FROM services WHERE target = ? AND proto = ?", [target, proto]
+    if ip:
+        sql += " AND ip = ?"
+        params.append(ip)
+    if max_age is not None:
+        sql += " AND updated >= ?"
+        params.append(time.time() - max_age)
+    conn = _connect()
+    try:
+        return {row[1]: dict(zip(COLUMNS, row)) for row in conn.execute(sql, params)}
+    finally:
+        conn.close()
+
+
+def probe(ip: str, ports: Sequence[int], timeout: float = PROBE_TIMEOUT) -> Dict[int, bool]:
+    """Open/closed for each port, all connects in flight at once."""
+    import asyncio
+    from seerAD.core.discover import is_open
+
+    async def run():
+        return await asyncio.gather(*(is_open(ip, port, timeout) for port in ports))
+    return dict(zip(ports, asyncio.run(run())))
+
+
+def check(target: str, ip: str, ports: Sequence[int], ttl: float = SERVICE_TTL,
+          timeout: float = PROBE_TIMEOUT) -> Dict[int, Entry]:
+    """Entries for `ports`: cached ones younger than `ttl`, the rest probed now and recorded."""
+    found = {port: entry for port, entry in inventory(target, ip, ttl).items() if port in ports}
+    missing = [port for port in ports if port not in found]
+    if missing:
+        states = probe(ip, missing, timeout)
+        record([(target, ip, port, "tcp", "open" if up else "closed", None, None) for port, up in states.items()],
+               "probe")
+        fresh = inventory(target, ip)
+        found.update((port, fresh[port]) for port in missing if port in fresh)
+    return {port: found[port] for port in ports if port in found}
+
+
+
+def open_services(target: Optional[str] = None, name: Optional[str] = None, port: Optional[int] = None,
+                  limit: int = 1000) -> List[Entry]:
+    """Open rows by target and port; optionally of one target or port, or whose service name contains `name`."""
+    where, params = ["state = 'open'"], []
+    for column, value in (("target", target), ("port", port)):
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    if name:
+        where.append("name LIKE ?")
+        params.append(f"%{name}%")
+    sql = f"SELECT {', '.join(COLUMNS)} FROM services WHERE {' AND '.join(where)} ORDER BY target, port LIMIT ?"
+    conn = _connect()
+    try:
+        return [dict(zip(COLUMNS, row)) for row in conn.execute(sql, params + [limit])]
+    finally:
+        conn.close()
@@ -1,23 +1,42 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Dict, Optional, Any, List
 import json
 import os
-from seerAD.config import LOOT_DIR, DATA_DIR
+import threading
+from seerAD.config import LOOT_DIR, ensure_dirs
 from . import creds
+from .events import (bus, TARGET_SWITCHED, CREDENTIAL_CHANGED, TARGETS_ADDED, TARGET_DELETED, CREDENTIALS_ADDED,
+                     CREDENTIAL_DELETED, SESSION_RELOADED)
+from .telemetry import span
 from .target import Target, TargetManager
 
+# Per-thread / per-task overrides of the active target and credential (see Session.scoped)
+_scoped_target: ContextVar[Optional[str]] = ContextVar("seer_scoped_target", default=None)
+_scoped_credential: ContextVar[Optional[str]] = ContextVar("seer_scoped_credential", default=None)
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
 class Session:
     def __init__(self):
         self.session_file = LOOT_DIR / "session.json"
         self._credential_managers: Dict[str, creds.CredentialManager] = {}
-        self.target_manager = TargetManager(self.session_file)
-        self.current_credential_index: Optional[int] = None
         self._ensure_workspace()
+        # Targets are read by _load below, together with the rest of session.json
+        self.target_manager = TargetManager(self.session_file, load=False)
+        self.current_credential_index: Optional[int] = None
+        # Bumped on every save; lets caches (e.g. shell completion) notice changes cheaply
+        self.revision = 0
+        self._lock = threading.RLock()
         self._load()
 
     def _ensure_workspace(self):
-        LOOT_DIR.mkdir(parents=True, exist_ok=True)
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_dirs()
         local_bin = os.path.expanduser("~/.local/bin")
         if local_bin not in os.environ.get("PATH", ""):
             os.environ["PATH"] = f"{local_bin}:{os.environ['PATH']}"
@@ -26,86 +45,149 @@ class Session:
         self.target_manager = TargetManager(self.session_file)
         self.current_credential_index = None
         self._save()
+        bus.emit(SESSION_RELOADED)
+        bus.emit(TARGET_SWITCHED, label=None)
 
     def _load(self):
-        if not self.session_file.exists():
-            return
-        try:
-            with open(self.session_file) as f:
-                data = json.load(f)
-            self.target_manager.targets = {
-                label: Target.from_dict(label, tdata)
-                for label, tdata in data.get("targets", {}).items()
-            }
-            self.target_manager.current_target_label = data.get("current_target_label")
-            self.current_credential_index = data.get("current_credential_index")
+        with span("session.load"):
+            self._mtime = _mtime(self.session_file)
+            if not self.session_file.exists():
+                return
+            try:
+                with open(self.session_file) as f:
+                    data = json.load(f)
+                self.target_manager.targets = {
+                    label: Target.from_dict(label, tdata)
+                    for label, tdata in data.get("targets", {}).items()
+                }
+                self.target_manager.current_target_label = data.get("current_target_label")
+                self.current_credential_index = data.get("current_credential_index")
             
-            # Restore KRB5CCNAME if there's an active credential with a ticket
-            if self.current_credential_index is not None:
-                mgr = self._get_cred_mgr()
-                if mgr:
-                    creds_list = mgr.get_all_credentials()
-                    if 0 <= self.current_credential_index < len(creds_list):
-                        cred = creds_list[self.current_credential_index]
-                        ticket = cred.get("ticket")
-                        if ticket and Path(ticket).exists():
-                            ticket_path = str(Path(ticket).resolve())
-                            os.environ["KRB5CCNAME"] = ticket_path
-                        else:
-                            os.environ.pop("KRB5CCNAME", None)
-
-        except Exception as e:
-            print(f"[!] Error loading session.json: {e}")
-            self.target_manager.targets = {}
-            self.target_manager.current_target_label = None
-            self.current_credential_index = None
+                # Restore KRB5CCNAME if there's an active credential with a ticket
+                if self.current_credential_index is not None:
+                    mgr = self._get_cred_mgr()
+                    if mgr:
+                        creds_list = mgr.get_all_credentials()
+                        if 0 <= self.current_credential_index < len(creds_list):
+                            cred = creds_list[self.current_credential_index]
+                            ticket = cred.get("ticket")
+                            if ticket and Path(ticket).exists():
+                                ticket_path = str(Path(ticket).resolve())
+                                os.environ["KRB5CCNAME"] = ticket_path
+                            else:
+                                os.environ.pop("KRB5CCNAME", None)
+
+            except Exception as e:
+                print(f"[!] Error loading session.json: {e}")
+                self.target_manager.targets = {}
+                self.target_manager.current_target_label = None
+                self.current_credential_index = None
 
     def _save(self):
-        data = {
-            "targets": {l: t.to_dict() for l, t in self.target_manager.targets.items()},
-            "current_target_label": self.target_manager.current_target_label,
-            "current_credential_index": self.current_credential_index
-        }
-        self.session_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.session_file, "w") as f:
-            json.dump(data, f, indent=2)
+        with self._lock, span("session.save"):
+            self.revision += 1
+            data = {
+                "targets": {l: t.to_dict() for l, t in self.target_manager.targets.items()},
+                "current_target_label": self.target_manager.current_target_label,
+                "current_credential_index": self.current_credential_index
+            }
+            self.session_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.session_file, "w") as f:
+                json.dump(data, f, indent=2)
+            self._mtime = _mtime(self.session_file)
+
+    def refresh(self) -> bool:
+        """
+        Reload whatever other seerAD processes changed on disk since we last read or wrote it.
+        Only stats files, so long-lived processes can call it before every command.
+        """
+        changed = False
+        with self._lock:
+            if _mtime(self.session_file) != self._mtime:
+                self.target_manager = TargetManager(self.session_file, load=False)
+                self.current_credential_index = None
+                self._load()
+                changed = True
+            for label, mgr in list(self._credential_managers.items()):
+                if mgr.is_stale():
+                    del self._credential_managers[label]
+                    changed = True
+            if changed:
+                self.revision += 1
+        if changed:
+            bus.emit(SESSION_RELOADED)
+        return changed
+
+    @contextmanager
+    def scoped(self, target: Optional[str] = None, credential: Optional[str] = None):
+        """
+        Override the active target / credential for the current thread or task only,
+        so concurrent steps can run as different users without touching session.json.
+        """
+        t_token = _scoped_target.set(target) if target else None
+        c_token = _scoped_credential.set(credential) if credential else None
+        try:
+            yield self
+        finally:
+            if c_token:
+                _scoped_credential.reset(c_token)
+            if t_token:
+                _scoped_target.reset(t_token)
 
     # === Target Shortcuts ===
     @property
     def targets(self): return self.target_manager.targets
 
     @property
-    def current_target_label(self): return self.target_manager.current_target_label
+    def current_target_label(self): return _scoped_target.get() or self.target_manager.current_target_label
 
     @property
     def current_target(self): 
-        t = self.target_manager.get_current_target()
+        label = self.current_target_label
+        t = self.target_manager.get_target(label) if label else None
         return t.to_dict() if t else None
 
     def add_target(self, label, ip, **kwargs):
         added = self.target_manager.add_target(label, Target(label, ip, **kwargs))
         if added:
             self._save()
+            bus.emit(TARGETS_ADDED, labels=[label])
+        return added
+
+    def add_targets(self, entries: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Bulk add: {label: {"ip": ..., "domain": ..., "fqdn": ...}}, written to session.json once."""
+        targets = {label: Target(label, **fields) for label, fields in entries.items()}
+        added = self.target_manager.add_targets(targets, save=False)
+        if added:
+            self._save()
+            bus.emit(TARGETS_ADDED, labels=added)
         return added
 
     def delete_target(self, label):
         (LOOT_DIR / label / "creds.json").unlink(missing_ok=True)
-        if self.current_target_label == label:
+        was_current = self.current_target_label == label
+        if was_current:
             self.current_credential_index = None
         deleted = self.target_manager.delete_target(label)
         if deleted:
             self._save()
+            bus.emit(TARGET_DELETED, label=label)
+            if was_current:
+                bus.emit(TARGET_SWITCHED, label=None)
         return deleted
 
     def switch_target(self, label): 
         if self.target_manager.switch_target(label):
             self.current_credential_index = None
             self._save()
+            bus.emit(TARGET_SWITCHED, label=label)
             return True
         return False
 
     def update_current_target(self, **kwargs):
-        updated = self.target_manager.update_current_target(**kwargs)
+        label = self.current_target_label
+        t = self.target_manager.get_target(label) if label else None
+        updated = t.update(**kwargs) if t else False
         if updated:
             self._save()
         return updated
@@ -115,7 +197,9 @@ class Session:
         label = label or self.current_target_label
         if not label: return None
         if label not in self._credential_managers:
-            self._credential_managers[label] = creds.CredentialManager(label)
+            with self._lock:
+                if label not in self._credential_managers:
+                    self._credential_managers[label] = creds.CredentialManager(label)
         return self._credential_managers[label]
 
     def get_credentials(self, label=None, username=None) -> List[Dict[str, Any]]:
@@ -126,33 +210,68 @@ class Session:
             return [c] if c else []
         return mgr.get_all_credentials()
 
+    def get_usernames(self, label=None) -> List[str]:
+        mgr = self._get_cred_mgr(label)
+        return [c.username for c in mgr.credentials.values()] if mgr else []
+
     def add_credential(self, label, **kwargs):
         mgr = self._get_cred_mgr(label)
-        added = mgr.add_credential(**kwargs) if mgr else False
+        with self._lock:
+            added = mgr.add_credential(**kwargs) if mgr else False
         if added:
             self._save()
+            bus.emit(CREDENTIALS_ADDED, label=label or self.current_target_label, usernames=[kwargs["username"]])
         return added
 
     def update_credential(self, label, username, **kwargs):
         mgr = self._get_cred_mgr(label)
-        updated = mgr.update_credential(username, **kwargs) if mgr else False
+        with self._lock:
+            updated = mgr.update_credential(username, **kwargs) if mgr else False
         if updated:
             self._save()
+            current = self.current_credential if label == self.current_target_label else None
+            if current and current.get("username", "").lower() == username.lower():
+                bus.emit(CREDENTIAL_CHANGED, label=label, username=current["username"])
         return updated
 
+    def merge_credentials(self, label, entries):
+        """Bulk add_credential / fill-in of empty fields (tool output parsers). Returns (added, updated)."""
+        mgr = self._get_cred_mgr(label)
+        if not mgr:
+            return 0, 0
+        with self._lock:
+            known = set(mgr.credentials)
+            added, updated = mgr.merge_credentials(entries)
+            new = [c.username for k, c in mgr.credentials.items() if k not in known]
+        if added or updated:
+            self._save()
+            if new:
+                bus.emit(CREDENTIALS_ADDED, label=label or self.current_target_label, usernames=new)
+            current = self.current_credential if label == self.current_target_label else None
+            if updated and current and any(e["username"].lower() == current["username"].lower() for e in entries):
+                bus.emit(CREDENTIAL_CHANGED, label=label, username=current["username"])
+        return added, updated
+
     def delete_credential(self, label, username):
         mgr = self._get_cred_mgr(label)
         if not mgr:
             return False
 
         # Reset current credential index if deleting the selected one
+        deselected = False
         if label == self.current_target_label and self.current_credential:
             if self.current_credential.get("username", "").lower() == username.lower():
                 self.current_credential_index = None
+                deselected = True
 
-        deleted = mgr.delete_credential(username)
+        with self._lock:
+            stored = mgr.get_credential(username)  # as it was added: the lookup ignores case
+            deleted = mgr.delete_credential(username)
         if deleted:
             self._save()
+            bus.emit(CREDENTIAL_DELETED, label=label or self.current_target_label, username=stored["username"])
+            if deselected:
+                bus.emit(CREDENTIAL_CHANGED, label=label, username=None)
         return deleted
 
     def use_credential(self, username):
@@ -176,13 +295,21 @@ class Session:
                     print("[*] No ticket for this credential. Unsetting KRB5CCNAME.")
 
                 self._save()
+                bus.emit(CREDENTIAL_CHANGED, label=self.current_target_label, username=c["username"])
                 return True
 
         return False
 
     @property
     def current_credential(self) -> Optional[Dict[str, Any]]:
-        if self.current_target_label is None or self.current_credential_index is None:
+        if self.current_target_label is None:
+            return None
+        scoped = _scoped_credential.get()
+        if scoped:
+            mgr = self._get_cred_mgr()
+            return mgr.get_credential(scoped) if mgr else None
+        # The stored index belongs to the globally selected target
+        if self.current_credential_index is None or self.current_target_label != self.target_manager.current_target_label:
             return None
         mgr = self._get_cred_mgr()
         creds_list = mgr.get_all_credentials() if mgr else []
@@ -190,6 +317,19 @@ class Session:
             return creds_list[self.current_credential_index]
         return None
 
+class LazySession:
+    """Proxy that creates the Session on first use, so importing CLI modules stays side-effect free."""
+    _instance: Optional[Session] = None
+
+    def _get(self) -> Session:
+        if LazySession._instance is None:
+            LazySession._instance = Session()
+        return LazySession._instance
+
+    def __getattr__(self, name): return getattr(self._get(), name)
+
+    def __setattr__(self, name, value): setattr(self._get(), name, value)
+
 # Global singleton
-session = Session()
+session = LazySession()
 def current_session(): return session
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+SID -> name cache, kept per domain in the `sids` table of LOOT_DIR/loot.db (rows carry
+their domain SID, S-1-5-21-x-y-z, so each domain's names stay apart).
+
+It fills itself passively: every parsed `sid` record and every user/group record that
+carries a SID (core/facts.py), and every node of an imported BloodHound graph. What is
+still unknown can be resolved actively with `resolve_remote`, which asks the DC for a
+whole batch in one LSARPC LsarLookupSids call (impacket, imported on use).
+
+SidAnnotator is the optional run_tool output rewrite: it appends the cached name after
+each SID it knows, `S-1-5-21-...-512 (CORP\\Domain Admins)`, without network calls.
+"""
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from seerAD.core.loot import connect
+
+SID_RE = re.compile(r"\bS-1-\d+(?:-\d+)+")
+LOOKUP_BATCH = 1000  # SIDs per LsarLookupSids call
+SQL_BATCH = 500  # host parameters per IN (...) query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sids (
+    sid TEXT PRIMARY KEY,
+    domain_sid TEXT,
+    name TEXT,
+    domain TEXT,
+    kind TEXT,
+    source TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS sids_domain ON sids (domain_sid);
+"""
+
+WELL_KNOWN = {
+    "S-1-0-0": ("Nobody", "wellknowngroup"), "S-1-1-0": ("Everyone", "wellknowngroup"),
+    "S-1-3-0": ("Creator Owner", "wellknowngroup"), "S-1-5-7": ("Anonymous Logon", "wellknowngroup"),
+    "S-1-5-9": ("Enterprise Domain Controllers", "wellknowngroup"), "S-1-5-10": ("Principal Self", "wellknowngroup"),
+    "S-1-5-11": ("Authenticated Users", "wellknowngroup"), "S-1-5-18": ("Local System", "wellknowngroup"),
+    "S-1-5-32-544": ("BUILTIN\\Administrators", "alias"), "S-1-5-32-545": ("BUILTIN\\Users", "alias"),
+    "S-1-5-32-546": ("BUILTIN\\Guests", "alias"), "S-1-5-32-548": ("BUILTIN\\Account Operators", "alias"),
+    "S-1-5-32-549": ("BUILTIN\\Server Operators", "alias"), "S-1-5-32-550": ("BUILTIN\\Print Operators", "alias"),
+    "S-1-5-32-551": ("BUILTIN\\Backup Operators", "alias"),
+    "S-1-5-32-554": ("BUILTIN\\Pre-Windows 2000 Compatible Access", "alias"),
+    "S-1-5-32-555": ("BUILTIN\\Remote Desktop Users", "alias"),
+    "S-1-5-32-562": ("BUILTIN\\Distributed COM Users", "alias"),
+    "S-1-5-32-580": ("BUILTIN\\Remote Management Users", "alias"),
+}
+DOMAIN_RIDS = {
+    500: ("Administrator", "user"), 501: ("Guest", "user"), 502: ("krbtgt", "user"),
+    512: ("Domain Admins", "group"), 513: ("Domain Users", "group"), 514: ("Domain Guests", "group"),
+    515: ("Domain Computers", "group"), 516: ("Domain Controllers", "group"), 517: ("Cert Publishers", "alias"),
+    518: ("Schema Admins", "group"), 519: ("Enterprise Admins", "group"),
+    520: ("Group Policy Creator Owners", "group"), 521: ("Read-only Domain Controllers", "group"),
+    525: ("Protected Users", "group"), 526: ("Key Admins", "group"), 527: ("Enterprise Key Admins", "group"),
+}
+
+Entry = Dict[str, Any]
+
+
+def domain_sid(sid: str) -> Optional[str]:
+    """S-1-5-21-a-b-c for a domain account SID S-1-5-21-a-b-c-rid, else None."""
+    parts = sid.split("-")
+    return "-".join(parts[:7]) if len(parts) == 8 and sid.startswith("S-1-5-21-") else None
+
+
+def well_known(sid: str) -> Optional[Entry]:
+    if sid in WELL_KNOWN:
+        name, kind = WELL_KNOWN[sid]
+        return {"sid": sid, "name": name, "domain": None, "kind": kind, "source": "well-known"}
+    dom = domain_sid(sid)
+    rid = int(sid.rsplit("-", 1)[1]) if dom else None
+    if rid in DOMAIN_RIDS:
+        name, kind = DOMAIN_RIDS[rid]
+        return {"sid": sid, "name": name, "domain": None, "kind": kind, "source": "well-known", "domain_sid": dom}
+    return None
+
+
+def label(entry: Entry) -> str:
+    """How a resolved SID is shown: DOMAIN\\name, or just the name."""
+    name = entry.get("name") or "?"
+    return f"{entry['domain']}\\{name}" if entry.get("domain") and "\\" not in name else name
+
+
+def _connect():
+    conn = connect()
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def remember(entries: Iterable[Tuple[str, str, Optional[str], Optional[str]]], source: str, conn=None) -> int:
+    """
+    Upsert (sid, name, domain, kind) tuples; rows without a name are skipped. Runs inside
+    the caller's transaction when given its connection (which must have created the table).
+    """
+    now = time.time()
+    rows = [(sid.upper(), domain_sid(sid.upper()), name, domain, kind, source, now)
+            for sid, name, domain, kind in entries if sid and name]
+    if not rows:
+        return 0
+    sql = """
+        INSERT INTO sids (sid, domain_sid, name, domain, kind, source, updated) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (sid) DO UPDATE SET
+            name = excluded.name, domain = COALESCE(excluded.domain, sids.domain),
+            kind = COALESCE(excluded.kind, sids.kind), source = excluded.source, updated = excluded.updated
+    """
+    if conn is not None:
+        conn.executemany(sql, rows)
+        return len(rows)
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(sql, rows)
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def from_records(records: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    """SID entries in parsed facts: `sid` records, and users/groups that carry a SID."""
+    out = []
+    for r in records:
+        sid = r.get("sid")
+        if not sid:
+            continue
+        name = r.get("name") or r.get("user") or r.get("group")
+        kind = r.get("kind") or (r["type"] if r["type"] in ("user", "group") else None)
+        out.append((sid, name, r.get("domain"), kind))
+    return out
+
+
+def lookup(sids: Iterable[str], conn=None) -> Dict[str, Entry]:
+    """Cached entries for the SIDs that are known; well-known SIDs are answered without the database."""
+    wanted = {s.upper() for s in sids}
+    found: Dict[str, Entry] = {}
+    rest = []
+    for sid in wanted:
+        entry = well_known(sid)
+        if entry:
+            found[sid] = entry
+        if not entry or entry.get("domain_sid"):
+            rest.append(sid)  # a domain's own row (with the NetBIOS domain) beats the generic RID name
+    if not rest:
+        return found
+    own = conn is None
+    conn = conn or _connect()
+    try:
+        for i in range(0, len(rest), SQL_BATCH):
+            chunk = rest[i:i + SQL_BATCH]
+            cur = conn.execute(f"SELECT sid, name, domain, kind, source FROM sids WHERE sid IN ({','.join('?' * len(chunk))})",
+                               chunk)
+            for sid, name, domain, kind, source in cur:
+                found[sid] = {"sid": sid, "name": name, "domain": domain, "kind": kind, "source": source}
+    finally:
+        if own:
+            conn.close()
+    return found
+
+
+def list_sids(domain: Optional[str] = None, match: Optional[str] = None, limit: int = 100) -> List[Entry]:
+    """Cached entries, newest first; `domain` is a domain SID or a domain name."""
+    where, params = [], []
+    if domain:
+        where.append("(domain_sid = ? OR UPPER(domain) = ?)")
+        params += [domain.upper(), domain.upper()]
+    if match:
+        where.append("(name LIKE ? OR sid LIKE ?)")
+        params += [f"%{match}%", f"%{match.upper()}%"]
+    sql = ("SELECT sid, name, domain, kind, source, updated FROM sids" + (" WHERE " + " AND ".join(where) if where else "")
+           + " ORDER BY updated DESC LIMIT ?")
+    conn = _connect()
+    try:
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(("sid", "name", "domain", "kind", "source", "updated"), row)) for row in rows]
+
+
+def resolve_remote(sids: List[str], target: Dict[str, Any], cred: Dict[str, Any], method: str) -> Dict[str, Entry]:
+    """
+    Resolve SIDs on the target's DC over \\pipe\\lsarpc: one LsarLookupSids call per
+    LOOKUP_BATCH SIDs. Found names are stored in the cache and returned.
+    """
+    import os
+    from impacket.dcerpc.v5 import lsad, lsat, transport
+    from impacket.dcerpc.v5.dtypes import MAXIMUM_ALLOWED
+    from impacket.dcerpc.v5.rpcrt import DCERPCException
+    from impacket.dcerpc.v5.samr import SID_NAME_USE
+
+    kerberos = method in ("ticket", "aes128", "aes256")
+    host = target.get("fqdn") if kerberos and target.get("fqdn") else target["ip"]
+    rpc = transport.DCERPCTransportFactory(rf"ncacn_np:{host}[\pipe\lsarpc]")
+    rpc.set_credentials(cred.get("username") or "",
+                        (cred.get("password") or "") if method == "password" else "",
+                        target.get("domain") or "", "",
+                        (cred.get("ntlm") or "") if method == "ntlm" else "",
+                        (cred.get(method) or "") if method.startswith("aes") else "")
+    if kerberos:
+        rpc.set_kerberos(True, kdcHost=target.get("ip"))
+    previous_ccache = os.environ.get("KRB5CCNAME")
+    if method == "ticket":
+        os.environ["KRB5CCNAME"] = cred["ticket"]  # impacket reads the ccache from the environment
+    found: Dict[str, Entry] = {}
+    try:
+        dce = rpc.get_dce_rpc()
+        dce.connect()
+        dce.bind(lsat.MSRPC_UUID_LSAT)
+        handle = lsad.hLsarOpenPolicy2(dce, MAXIMUM_ALLOWED | lsat.POLICY_LOOKUP_NAMES)["PolicyHandle"]
+        for i in range(0, len(sids), LOOKUP_BATCH):
+            chunk = sids[i:i + LOOKUP_BATCH]
+            try:
+                resp = lsat.hLsarLookupSids(dce, handle, chunk, lsat.LSAP_LOOKUP_LEVEL.LsapLookupWksta)
+            except DCERPCException as e:
+                if "STATUS_NONE_MAPPED" in str(e):
+                    continue
+                if "STATUS_SOME_NOT_MAPPED" not in str(e):
+                    raise
+                resp = e.get_packet()
+            domains = [d["Name"] for d in resp["ReferencedDomains"]["Domains"]]
+            for sid, item in zip(chunk, resp["TranslatedNames"]["Names"]):
+                use = SID_NAME_USE.enumItems(item["Use"]).name
+                if use in ("SidTypeUnknown", "SidTypeInvalid"):
+                    continue
+                domain = domains[item["DomainIndex"]] if 0 <= item["DomainIndex"] < len(domains) else None
+                found[sid.upper()] = {"sid": sid.upper(), "name": item["Name"], "domain": domain or None,
+                                      "kind": use[len("SidType"):].lower(), "source": "lsarpc"}
+        dce.disconnect()
+    finally:
+        if method == "ticket":
+            if previous_ccache is None:
+                os.environ.pop("KRB5CCNAME", None)
+            else:
+                os.environ["KRB5CCNAME"] = previous_ccache
+    remember(((e["sid"], e["name"], e["domain"], e["kind"]) for e in found.values()), "lsarpc")
+    return found
+
+
+class SidAnnotator:
+    """
+    run_tool output rewrite: `rewrite(line)` appends the cached name after each known
+    SID. Each distinct SID is looked up once per run; lines without "S-1-" are returned as is.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, Optional[str]] = {}
+        self._conn = None
+        self.unknown: set = set()
+
+    def _name(self, sid: str) -> Optional[str]:
+        if sid not in self._names:
+            if self._conn is None:
+                self._conn = _connect()
+            entry = lookup([sid], self._conn).get(sid)
+            self._names[sid] = label(entry) if entry else None
+            if entry is None:
+                self.unknown.add(sid)
+        return self._names[sid]
+
+    def _replace(self, match) -> str:
+        sid = match.group(0)
+        name = self._name(sid.upper())
+        return f"{sid} ({name})" if name else sid
+
+    def rewrite(self, line: str) -> str:
+        if "S-1-" not in line:
+            return line
+        return SID_RE.sub(self._replace, line)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
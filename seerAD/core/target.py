@@ -12,7 +12,6 @@ class Target:
         self.fqdn = fqdn
         self.created_at = created_at or datetime.now(timezone.utc).isoformat()
         self.updated_at = updated_at or self.created_at
-        (LOOT_DIR / label).mkdir(parents=True, exist_ok=True)
 
     def update(self, **kwargs):
         changed = False
@@ -40,11 +39,12 @@ class Target:
         return cls(label=label, **data)
 
 class TargetManager:
-    def __init__(self, session_file: Path):
+    def __init__(self, session_file: Path, load: bool = True):
         self.session_file = session_file
         self.targets: Dict[str, Target] = {}
         self.current_target_label: Optional[str] = None
-        self._load()
+        if load:
+            self._load()
 
     def _load(self):
         if not self.session_file.exists():
@@ -72,14 +72,33 @@ class TargetManager:
 
     def add_target(self, label, target):
         if label in self.targets: return False
+        (LOOT_DIR / label).mkdir(parents=True, exist_ok=True)
         self.targets[label] = target
         self._save()
         return True
 
+    def add_targets(self, targets: Dict[str, Target], save: bool = True):
+        """
+        Add many targets with at most one save (none when the caller writes the file itself).
+        Labels already in use are skipped; returns the added labels.
+        """
+        added = [label for label in targets if label not in self.targets]
+        for label in added:
+            (LOOT_DIR / label).mkdir(parents=True, exist_ok=True)
+            self.targets[label] = targets[label]
+        if added and save:
+            self._save()
+        return added
+
     def delete_target(self, label):
         if label not in self.targets: return False
-        import shutil
-        shutil.rmtree(LOOT_DIR / label, ignore_errors=True)
+        from seerAD.core import blobs, loot
+        try:
+            loot.forget_target(label)  # before the output files it reads move to the trash
+        except Exception:
+            pass  # like indexing, this must never stop the deletion
+        if blobs.discard(LOOT_DIR / label):  # tickets/outputs are links: the sweep drops their refs
+            blobs.collect_in_background()
         del self.targets[label]
         if self.current_target_label == label:
             self.current_target_label = None
@@ -0,0 +1,203 @@
+"""
+Per-command timing spans, written as JSONL under LOGS_DIR.
+
+    with span("tool", module="nxc smb", target="dc01") as record:
+        ...
+        record["rc"] = 0
+
+Spans nest per thread/task: a nested span records its parent's id and inherits
+its module and target. Records are buffered and written as one line when the
+outermost span ends, so instrumented code never waits on the disk mid-command.
+The file is rotated at MAX_BYTES. Set SEER_TELEMETRY=0 to turn recording off.
+"""
+import json
+import math
+import os
+import threading
+import time
+from contextvars import ContextVar
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from seerAD.config import LOGS_DIR
+
+TELEMETRY_FILE = LOGS_DIR / "telemetry.jsonl"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+INHERITED = ("module", "target")
+GLOBAL_FLAGS = ("--profile",)  # options of the top-level app, before the command
+
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("seer_span", default=None)
+_ids = count(1)
+_buffer: List[Dict[str, Any]] = []
+_file = None  # open append handle, kept across commands
+_encoder = json.JSONEncoder(default=str, separators=(",", ":"))
+_lock = threading.Lock()
+
+
+class span:
+    """
+    Time the block: `with span("tool", tool="nxc") as record: ...`. Fields set on the
+    yielded record (rc, bytes, ...) are saved with it. A plain class rather than a
+    generator context manager, since every command enters several of these.
+    """
+    __slots__ = ("record", "parent", "token", "start")
+
+    def __init__(self, name: str, **fields):
+        self.record: Dict[str, Any] = {"span": name}
+        self.record.update((k, v) for k, v in fields.items() if v is not None)
+
+    def __enter__(self) -> Dict[str, Any]:
+        record, parent = self.record, _current.get()
+        if parent is None and not enabled():  # nested spans only open inside an enabled one
+            self.token = None
+            return record
+        record["id"] = next(_ids)
+        record["parent"] = parent["id"] if parent else None
+        if parent:
+            for key in INHERITED:
+                if key not in record and parent.get(key) is not None:
+                    record[key] = parent[key]
+        self.parent = parent
+        self.token = _current.set(record)
+        record["ts"] = time.time()
+        self.start = time.perf_counter()
+        return record
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.token is None:
+            return
+        record = self.record
+        record["ms"] = round((time.perf_counter() - self.start) * 1000, 3)
+        _current.reset(self.token)
+        if exc_type is SystemExit:
+            record.setdefault("rc", exc.code if isinstance(exc.code, int) else int(exc.code is not None))
+        elif exc_type is not None:
+            record.setdefault("error", exc_type.__name__)
+        with _lock:
+            _buffer.append(record)
+        if self.parent is None:
+            flush()
+
+
+def enabled() -> bool:
+    return os.environ.get("SEER_TELEMETRY") != "0"
+
+
+def command_name(argv: List[str]) -> str:
+    """The subcommand path of an argv ('enum smb'), without options or values that may hold secrets."""
+    words = []
+    argv = list(argv)
+    while argv and argv[0] in GLOBAL_FLAGS:
+        argv.pop(0)
+    for arg in argv[:2]:
+        if arg.startswith("-"):
+            break
+        words.append(arg)
+    return " ".join(words)
+
+
+def current() -> Optional[Dict[str, Any]]:
+    """The innermost open span's record in this thread/task, if any."""
+    return _current.get()
+
+
+def flush():
+    """Append buffered records to the telemetry file, rotating it once it is full."""
+    global _file
+    with _lock:
+        if not _buffer:
+            return
+        records, _buffer[:] = list(_buffer), []
+        # One line per batch (normally one command): a single encode call instead of one per span
+        data = _encoder.encode({"pid": os.getpid(), "spans": records}) + "\n"
+        try:
+            # Long-lived processes keep the file open; reopen it if another process rotated it away
+            if _file is None or os.fstat(_file.fileno()).st_ino != _inode(TELEMETRY_FILE):
+                _reopen()
+            _file.write(data)
+            _file.flush()
+            if _file.tell() >= MAX_BYTES:
+                _file.close()
+                _file = None
+                _rotate()
+        except OSError:
+            pass  # telemetry must never break a command
+
+
+def _inode(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def _reopen():
+    global _file
+    if _file is not None:
+        _file.close()
+    TELEMETRY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _file = open(TELEMETRY_FILE, "a", encoding="utf-8")
+
+
+def _rotate():
+    for i in range(BACKUPS - 1, 0, -1):
+        older = TELEMETRY_FILE.with_name(f"{TELEMETRY_FILE.name}.{i}")
+        if older.exists():
+            older.replace(TELEMETRY_FILE.with_name(f"{TELEMETRY_FILE.name}.{i + 1}"))
+    TELEMETRY_FILE.replace(TELEMETRY_FILE.with_name(f"{TELEMETRY_FILE.name}.1"))
+
+
+# === Reading ===
+def log_files() -> List[Path]:
+    """Telemetry files, oldest first."""
+    files = [TELEMETRY_FILE.with_name(f"{TELEMETRY_FILE.name}.{i}") for i in range(BACKUPS, 0, -1)]
+    return [f for f in files + [TELEMETRY_FILE] if f.exists()]
+
+
+def load_records(since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    for path in log_files():
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    continue  # torn write
+                for record in batch.get("spans", ()):
+                    if since is None or record.get("ts", 0) >= since:
+                        record["pid"] = batch.get("pid")
+                        yield record
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(records: List[Dict[str, Any]], key: Union[str, Callable[[Dict[str, Any]], Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Group records by a field name (or a function of the record) and return count,
+    failures, p50/p95/p99/max ms and total output bytes per group.
+    """
+    get = key if callable(key) else (lambda record: record.get(key))
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(str(get(record) or "-"), []).append(record)
+
+    summary = {}
+    for name, group in groups.items():
+        times = sorted(r.get("ms", 0.0) for r in group)
+        summary[name] = {
+            "count": len(group),
+            "failed": sum(1 for r in group if r.get("error") or r.get("rc") not in (None, 0)),
+            "p50": percentile(times, 50),
+            "p95": percentile(times, 95),
+            "p99": percentile(times, 99),
+            "max": times[-1],
+            "bytes": sum(r.get("bytes", 0) for r in group),
+        }
+    return summary
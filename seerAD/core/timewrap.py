@@ -0,0 +1,151 @@
+import json
+import re
+import sys
+import types
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from seerAD.config import LOOT_DIR
+from seerAD.core.events import bus, TIMEWRAP_CHANGED
+
+FAKETIME_LIB = "/usr/lib/x86_64-linux-gnu/faketime/libfaketime.so.1"
+LEGACY_TIMEWRAP_FILE = LOOT_DIR / "timewrap.json"
+
+# KRB_AP_ERR_SKEW as reported by nxc, impacket, bloodyAD and certipy
+SKEW_ERROR_RE = re.compile(r"KRB_AP_ERR_SKEW|clock skew (is )?too great", re.IGNORECASE)
+
+# minikerberos modules that read the clock through their module-level `datetime` import
+KERBEROS_TIME_MODULES = [
+    "minikerberos.aioclient",
+    "minikerberos.client",
+    "minikerberos.pkinit",
+    "minikerberos.security",
+    "minikerberos.protocol.ticketutils",
+]
+
+
+def timewrap_file(label: str) -> Path:
+    return LOOT_DIR / label / "timewrap.json"
+
+
+def get_timewrap(label: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the timewrap config of a target, or None if it runs on system time."""
+    if not label:
+        return None
+    path = timewrap_file(label)
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def set_timewrap(label: str, dc_ip: str, offset: str) -> Dict[str, Any]:
+    data = {
+        "dc_ip": dc_ip,
+        "offset": offset,
+        "set_at": datetime.utcnow().isoformat()
+    }
+    path = timewrap_file(label)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    bus.emit(TIMEWRAP_CHANGED, label=label)
+    return data
+
+
+def clear_timewrap(label: str) -> bool:
+    path = timewrap_file(label)
+    if not path.exists():
+        return False
+    path.unlink()
+    bus.emit(TIMEWRAP_CHANGED, label=label)
+    return True
+
+
+def get_offset_seconds(label: Optional[str]) -> float:
+    data = get_timewrap(label)
+    if not data:
+        return 0.0
+    try:
+        return float(data["offset"])
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def apply_timewrap(env: Dict[str, str], label: Optional[str]) -> Dict[str, str]:
+    """Inject libfaketime into a child environment if the target has a timewrap offset."""
+    data = get_timewrap(label)
+    if not data:
+        return env
+    preload = env.get("LD_PRELOAD", "")
+    if FAKETIME_LIB not in preload and Path(FAKETIME_LIB).exists():
+        env["LD_PRELOAD"] = f"{FAKETIME_LIB}:{preload}" if preload else FAKETIME_LIB
+    env["FAKETIME"] = data["offset"]
+    return env
+
+
+def recover_skew(label: str, dc_ip: str, realm: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Measure the DC clock after a skew error and store it as the target's timewrap.
+    A fresh measurement is forced when an offset was already applied and still failed.
+    """
+    from seerAD.core.clock import get_skew, format_offset_as_faketime
+
+    skew = get_skew(dc_ip, realm=realm, refresh=get_timewrap(label) is not None)
+    return set_timewrap(label, dc_ip, format_offset_as_faketime(skew["offset"]))
+
+
+class SkewDetector:
+    """run_tool output stage that notices Kerberos clock skew errors."""
+
+    def __init__(self):
+        self.detected = False
+
+    def feed(self, line: str):
+        # substring test first: a case-insensitive search on every line costs more than the rest of the stage
+        if not self.detected and ("kew" in line or "KEW" in line) and SKEW_ERROR_RE.search(line):
+            self.detected = True
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def kerberos_time_offset(seconds: float):
+    """Shift the clock seen by in-process minikerberos calls by `seconds`."""
+    if not seconds:
+        yield
+        return
+
+    import datetime as real_datetime
+    from datetime import timedelta
+
+    class ShiftedDatetime(real_datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return real_datetime.datetime.now(tz) + timedelta(seconds=seconds)
+
+        @classmethod
+        def utcnow(cls):
+            return real_datetime.datetime.utcnow() + timedelta(seconds=seconds)
+
+    shim = types.ModuleType("datetime")
+    shim.__dict__.update(real_datetime.__dict__)
+    shim.datetime = ShiftedDatetime
+
+    patched = []
+    for name in KERBEROS_TIME_MODULES:
+        mod = sys.modules.get(name)
+        if mod is not None and getattr(mod, "datetime", None) is real_datetime:
+            mod.datetime = shim
+            patched.append(mod)
+    try:
+        yield
+    finally:
+        for mod in patched:
+            mod.datetime = real_datetime
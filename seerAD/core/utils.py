@@ -1,97 +1,53 @@
-import subprocess, shutil, os, hashlib, asyncio, json, re, time, datetime, ntplib
+import hashlib
 from pathlib import Path
-from impacket.krb5.crypto import _enctype_table
-from impacket.krb5.types import Principal
-from Crypto.Protocol.KDF import PBKDF2
-from Crypto.Hash import SHA1
 from urllib.parse import quote_plus
 from rich.console import Console
 from typing import Optional
-from datetime import timezone
 
-from minikerberos.common.creds import KerberosCredential
-from minikerberos.common.target import KerberosTarget
-from minikerberos.aioclient import AIOKerberosClient
-from minikerberos.protocol.errors import KerberosError
-from minikerberos.common.factory import KerberosClientFactory
-
-from seerAD.config import LOOT_DIR, ROOT_DIR
+# impacket, minikerberos and pycryptodome are slow to import, so they are
+# imported inside the functions that need them.
+from seerAD.config import LOOT_DIR
+from seerAD.core import blobs
+from seerAD.core.timewrap import kerberos_time_offset, get_offset_seconds
 from seerAD.core.session import session
 
 console = Console()
 
-def get_faketime_offset(target_ip: str) -> str:
+def get_faketime_offset(target_ip: str, realm: Optional[str] = None, refresh: bool = False) -> str:
     """
-    Return the faketime offset string (e.g., '+3h') based on difference between local and DC time.
-    Tries ntpdate first, falls back to ntplib if ntpdate fails.
-    Returns "0" if both methods fail.
+    Return the faketime offset string (e.g., '+28740.512') based on difference between local and DC time.
+    NTP and Kerberos samples are taken concurrently and cached per DC (see core.clock).
+    Returns "+0" if no sample could be taken.
     """
+    from seerAD.core.clock import get_skew, describe_offset, format_offset_as_faketime
+
     try:
-        # Try ntpdate first
-        try:
-            offset_sec = get_ntp_offset_ntpdate(target_ip)
-            if offset_sec is not None:
-                return format_offset_as_faketime(offset_sec)
-        except Exception as e:
-            console.print(f"[yellow]ntpdate failed: {e}[/]")
-        
-        # Fall back to ntplib
-        try:
-            console.print("[yellow]Falling back to ntplib...[/]")
-            offset_sec = get_ntp_offset_ntplib(target_ip)
-            if offset_sec is not None:
-                return format_offset_as_faketime(offset_sec)
-        except Exception as e:
-            console.print(f"[yellow]ntplib failed: {e}[/]")
-            
-        # If both methods failed
-        console.print("[yellow]Using system time as fallback[/]")
-        return "+0h"
-        
+        skew = get_skew(target_ip, realm=realm, refresh=refresh)
+        source = "cached" if skew.get("cached") else ", ".join(skew["sources"])
+        console.print(f"[blue]Skew {describe_offset(skew['offset'])} ± {skew['error'] * 1000:.0f} ms "
+                      f"({skew['samples']} samples, {source})[/]")
+        return format_offset_as_faketime(skew["offset"])
     except Exception as e:
         console.print(f"[red]Failed to calculate time offset: {e}[/]")
-        return "+0h"
-
-def format_offset_as_faketime(offset: float) -> str:
-    """
-    Converts float seconds offset to faketime string like '+7h59'
-    """
-    sign = '+' if offset >= 0 else '-'
-    abs_offset = abs(offset)
-    hours = int(abs_offset // 3600)
-    minutes = int((abs_offset % 3600) // 60)
-    return f"{sign}{hours}h{minutes:02d}"
-
-
-def get_ntp_offset_ntpdate(target_ip: str) -> float:
-    """
-    Uses `ntpdate -q` to get time offset with the target.
-    Returns offset in seconds (can be float).
-    """
-    import subprocess
-
-    result = subprocess.run(["ntpdate", "-q", target_ip], capture_output=True, text=True)
-    for line in result.stdout.splitlines():
-        if target_ip in line:
-            parts = line.strip().split()
-            return float(parts[3])
-    raise ValueError("Could not parse offset from ntpdate output")
-
-def get_ntp_offset_ntplib(target_ip: str) -> float:
-    client = ntplib.NTPClient()
-    response = client.request(target_ip, version=3, timeout=3)
-    return response.offset
+        console.print("[yellow]Using system time as fallback[/]")
+        return "+0"
 
 def derive_ntlm(password):
     return hashlib.new('md4', password.encode('utf-16le')).hexdigest()
 
 def derive_aes(password, domain, username):
+    from Crypto.Protocol.KDF import PBKDF2
+    from Crypto.Hash import SHA1
+
     salt = (domain.upper() + username).encode()
     aes128 = PBKDF2(password.encode(), salt, dkLen=16, count=4096, hmac_hash_module=SHA1)
     aes256 = PBKDF2(password.encode(), salt, dkLen=32, count=4096, hmac_hash_module=SHA1)
     return aes128.hex(), aes256.hex()
 
 def run_gettgt(domain, username, password=None, ntlm=None, aes256=None, dc_ip=None):
+    import asyncio
+    from minikerberos.common.factory import KerberosClientFactory
+
     async def do_fetch():
         try:
             if not domain or not username:
@@ -116,16 +72,18 @@ def run_gettgt(domain, username, password=None, ntlm=None, aes256=None, dc_ip=No
             console.print(f"[cyan]→ Using kerberos_url:[/] {kerberos_url}")
 
             # Create Kerberos client and fetch ticket
+            label = session.current_target_label
             cf = KerberosClientFactory.from_url(kerberos_url)
             client = cf.get_client()
-            await client.get_TGT()
+            with kerberos_time_offset(get_offset_seconds(label)):
+                await client.get_TGT()
 
-            # Save ccache
-            label = session.current_target_label
+            # Save ccache (the target's own copy: tools may rewrite it in place)
             out_dir = LOOT_DIR / label / "tickets"
             out_dir.mkdir(parents=True, exist_ok=True)
-            final_path = out_dir / f"{username}.ccache"
-            client.ccache.to_file(str(final_path))
+            fetched = out_dir / f".{username}.ccache.new"
+            client.ccache.to_file(str(fetched))
+            final_path = blobs.keep_private(fetched, out_dir / f"{username}.ccache")
 
             return True, str(final_path)
 
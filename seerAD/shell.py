@@ -0,0 +1,860 @@
+"""Interactive Seer shell. Imported only when seerAD is started without arguments."""
+
+# Standard library imports
+import os
+import shlex
+import subprocess
+import sys
+import termios
+import re
+import glob
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Callable, Optional
+import json
+
+# Third-party imports
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import Completer, Completion, CompleteEvent
+from prompt_toolkit.document import Document
+from prompt_toolkit.history import ThreadedHistory
+from prompt_toolkit.styles import Style
+from rich.console import Console
+from datetime import datetime, timedelta
+
+# Local application imports
+from seerAD.cli.main import app as typer_app
+from seerAD.cli.abuse import COMMANDS as abuse_commands
+from seerAD.cli.enum import COMMANDS as enum_commands
+from seerAD.core.timewrap import apply_timewrap, timewrap_file, get_timewrap
+from seerAD.core.events import (bus, TARGET_SWITCHED, CREDENTIAL_CHANGED, TIMEWRAP_CHANGED, CWD_CHANGED, TARGETS_ADDED,
+                                TARGET_DELETED, CREDENTIALS_ADDED, CREDENTIAL_DELETED, SESSION_RELOADED)
+from seerAD.core.completion import PrefixIndex, DirectoryCache
+from seerAD.core.history import SeerHistory, set_active_history
+from seerAD.core.pty_runner import run_in_pty
+from seerAD.core.telemetry import span, command_name
+from seerAD.config import LOOT_DIR, LOGS_DIR
+
+# Rich console theme for consistent styling
+class SeerTheme:
+    SUCCESS = "green"
+    INFO = "blue"
+    WARNING = "yellow"
+    ERROR = "red"
+    DEBUG = "magenta"
+    PROMPT = "cyan"
+    SEPARATOR = "#555555"
+    HIGHLIGHT = "#ffffff"
+    MUTED = "#888888"
+    COMMAND = "cyan"
+    ARGUMENT = "yellow"
+    OPTION = "blue"
+    TARGET = "cyan"
+    CREDENTIAL = "green"
+    PATH = "yellow"
+
+    @classmethod
+    def get_style(cls) -> Style:
+        return Style.from_dict({
+            "clock": f"{cls.WARNING} bold",
+            "prompt": f"{cls.PROMPT} bold",
+            "brackets": f"{cls.SEPARATOR}",
+            "userinfo": f"{cls.CREDENTIAL} bold",
+            "path": f"{cls.PATH}",
+            "separator": f"{cls.SEPARATOR}",
+            "completion-menu.completion": "bg:#008888 #ffffff",
+            "completion-menu.completion.current": "bg:#00aaaa #000000",
+            "scrollbar.background": "bg:#88aaaa",
+            "scrollbar.button": "bg:#222222",
+            "bottom-toolbar": f"noreverse bg:#222222 {cls.MUTED}",
+            "status.ok": f"{cls.SUCCESS}",
+            "status.warn": f"{cls.WARNING} bold",
+            "status.error": f"{cls.ERROR} bold",
+        })
+
+THEME = SeerTheme()
+PROMPT_STYLE = THEME.get_style()
+INTERACTIVE_COMMANDS = {'nano', 'vim', 'vi', 'less', 'more', 'top', 'htop'}
+MAX_COMPLETIONS = 100  # the menu cannot usefully show more; keeps 100k-user workspaces snappy
+console = Console()
+
+class SeerCompleter(Completer):
+    """Command completer for Seer shell with support for command hierarchy and file completion."""
+    
+    def __init__(self, get_cwd_func: callable) -> None:
+        """Initialize the command completer.
+        
+        Args:
+            get_cwd_func: Function that returns the current working directory
+        """
+        self.get_cwd = get_cwd_func
+        self.shell_builtins = ["cd", "ls", "pwd"]
+        self._dir_cache = DirectoryCache(ttl=2.0)
+        # Dynamic indexes are built once and then kept in step with the session's add/delete events
+        self._user_index = PrefixIndex()
+        self._user_index_label = None  # target whose usernames _user_index holds; None = not built
+        self._target_index: Optional[PrefixIndex] = None
+        bus.subscribe(TARGETS_ADDED, self._on_targets_added)
+        bus.subscribe(TARGET_DELETED, self._on_target_deleted)
+        bus.subscribe(CREDENTIALS_ADDED, self._on_credentials_added)
+        bus.subscribe(CREDENTIAL_DELETED, self._on_credential_deleted)
+        bus.subscribe(SESSION_RELOADED, self._on_session_reloaded)
+        self._node_indexes: Dict[int, PrefixIndex] = {}
+        self.commands = {
+            "version": {},
+            "reset": {},
+            "target": {
+                "add": {},
+                "info": {},
+                "list": {},
+                "switch": self.get_target_labels,
+                "set": {
+                    "ip": {},
+                    "domain": {},
+                    "fqdn": {},
+                    "os": {},
+                },
+                "del": self.get_target_labels,
+                "discover": {
+                    "--timeout": {},
+                    "--concurrency": {},
+                    "--dry-run": {},
+                },
+                "import": {
+                    "--dry-run": {},
+                },
+                "services": self.get_target_labels,
+            },
+            "creds": {
+                "add": {},
+                "list": {},
+                "use": self.get_cred_users,
+                "del": self.get_cred_users,
+                "info": self.get_cred_users,
+                "set": {
+                    "password": {},
+                    "ntlm": {},
+                    "aes128": {},
+                    "aes256": {},
+                    "ticket": {},
+                    "cert": {},
+                    "notes": {},
+                    "domain": {},
+                },
+                "fetch": {},
+            },
+            "enum": self.get_enum_module_tree(),
+            "abuse": self.get_abuse_module_tree(),
+            "roast": {
+                "list": {},
+                "export": {},
+                "import": {},
+            },
+            "history": {
+                "search": {
+                    "--target": self.get_target_labels,
+                    "--cred": self.get_cred_users,
+                },
+            },
+            "loot": {
+                "search": {
+                    "--target": self.get_target_labels,
+                    "--module": ["nxc", "smb", "ldap", "winrm", "mssql", "GetUserSPNs", "GetNPUsers", "GetADUsers", "bloodyAD", "certipy"],
+                    "--cred": self.get_cred_users,
+                    "--since": ["30m", "2h", "1d", "7d"],
+                    "--limit": {},
+                },
+                "list": {
+                    "--target": self.get_target_labels,
+                    "--limit": {},
+                },
+                "facts": {
+                    "--target": self.get_target_labels,
+                    "--type": ["user", "group", "share", "sid", "valid-login", "hash"],
+                    "--match": {},
+                    "--limit": {},
+                },
+            },
+            "graph": {
+                "import": {
+                    "--target": self.get_target_labels,
+                },
+                "path": {
+                    "--from": {},
+                    "--to": ["DOMAIN ADMINS", "ENTERPRISE ADMINS", "ADMINISTRATORS"],
+                    "--target": self.get_target_labels,
+                },
+            },
+            "ldap": {
+                "import": {
+                    "--target": self.get_target_labels,
+                },
+                "query": {
+                    "kerberoastable": {}, "asreproastable": {}, "unconstrained": {}, "constrained": {},
+                    "stale": {}, "description": {}, "spn": {}, "flag": {},
+                    "--regex": {},
+                    "--word": {},
+                    "--service": ["mssqlsvc", "http", "cifs", "host", "ldap", "wsman", "termsrv"],
+                    "--flag": ["PASSWD_NOTREQD", "DONT_EXPIRE_PASSWORD", "DONT_REQ_PREAUTH", "TRUSTED_FOR_DELEGATION",
+                               "TRUSTED_TO_AUTH_FOR_DELEGATION", "ACCOUNTDISABLE", "USE_DES_KEY_ONLY"],
+                    "--days": {},
+                    "--disabled": {},
+                    "--target": self.get_target_labels,
+                    "--limit": {},
+                },
+            },
+            "sid": {
+                "resolve": {
+                    "--auth": ["ticket", "password", "ntlm", "aes256", "aes128"],
+                    "--offline": {},
+                },
+                "list": {
+                    "--domain": {},
+                    "--match": {},
+                    "--limit": {},
+                },
+            },
+            "run": {},
+            "serve": {},
+            "stats": {
+                "--span": ["tool", "helper", "command", "session.load", "session.save", "creds.load", "creds.save"],
+                "--days": {},
+            },
+            "profile": {
+                "last": {
+                    "--limit": {},
+                    "--sort": ["cumulative", "tottime", "calls"],
+                },
+            },
+            "smart": {},
+            "timewrap": {
+                "set": {},
+                "reset": {},
+                "status": {},
+            },
+            "help": {
+                "reset": {},
+                "target": {},
+                "creds": {},
+                "enum": {},
+                "abuse": {},
+                "roast": {},
+                "history": {},
+                "loot": {},
+                "graph": {},
+                "ldap": {},
+                "sid": {},
+                "run": {},
+                "serve": {},
+                "stats": {},
+                "profile": {},
+                "smart": {},
+                "timewrap": {},
+                "exit": {},
+                "quit": {}
+            },
+            "exit": {}
+        }
+
+    def get_cred_users(self) -> PrefixIndex:
+        """Get the username index of the current target's credentials.
+        
+        Returns:
+            Prefix index of usernames for the current target
+        """
+        try:
+            from seerAD.core.session import session
+            label = session.current_target_label
+            if not label:
+                return PrefixIndex()
+            if label != self._user_index_label:
+                self._user_index = PrefixIndex(session.get_usernames(label))
+                self._user_index_label = label
+            return self._user_index
+        except Exception as e:
+            console.print(f"[yellow][!] Error getting credential users: {e}[/]")
+            return PrefixIndex()
+
+    def get_abuse_module_tree(self) -> Dict[str, Callable]:
+        """Get list of abuse modules.
+        Returns:
+            Dictionary of abuse modules
+        """
+        return {name: lambda: self.get_auth_type(['anon']) for name in abuse_commands}
+
+    def get_enum_module_tree(self) -> Dict[str, Callable]:
+        """Get list of enum modules.
+        Returns:
+            Dictionary of enum modules
+        """
+        return {name: lambda: self.get_auth_type() for name in enum_commands}
+
+    def get_target_labels(self) -> PrefixIndex:
+        """Get the index of all target labels from the session.
+        Returns:
+            Prefix index of target labels
+        """
+        try:
+            from seerAD.core.session import session
+            if self._target_index is None:
+                self._target_index = PrefixIndex(session.targets.keys())
+            return self._target_index
+        except Exception as e:
+            console.print(f"[yellow][!] Error getting target labels: {e}[/]")
+            return PrefixIndex()
+
+    def _on_targets_added(self, event, labels):
+        if self._target_index is not None:
+            for label in labels:
+                self._target_index.add(label)
+
+    def _on_target_deleted(self, event, label):
+        if self._target_index is not None:
+            self._target_index.discard(label)
+        if label == self._user_index_label:
+            self._user_index_label = None
+
+    def _on_credentials_added(self, event, label, usernames):
+        if label == self._user_index_label:
+            for username in usernames:
+                self._user_index.add(username)
+
+    def _on_credential_deleted(self, event, label, username):
+        if label == self._user_index_label:
+            self._user_index.discard(username)
+
+    def _on_session_reloaded(self, event):
+        self._target_index = None
+        self._user_index_label = None
+
+    def _node_index(self, node: dict) -> PrefixIndex:
+        """Prefix index over the (static) subcommand / module names of a command tree node."""
+        index = self._node_indexes.get(id(node))
+        if index is None:
+            index = self._node_indexes[id(node)] = PrefixIndex(node.keys())
+        return index
+
+    def get_auth_type(self, exclude: List[str] = []) -> List[str]:
+        """Get list of available auth types.
+        Returns:
+            List of auth types
+        """
+        try:
+            auth_types = ["anon", "password", "ntlm", "ticket", "aes128", "aes256"]
+            return [t for t in auth_types if t not in exclude]
+        except Exception as e:
+            console.print(f"[yellow][!] Error getting auth types: {e}[/]")
+            return []
+    
+    def _get_file_suggestions(self, text):
+        if not text.startswith('@'):
+            return []
+
+        partial = text[1:]  # remove '@'
+
+        # Expand ~ to home
+        partial = os.path.expanduser(partial)
+        directory, prefix = os.path.split(partial)
+
+        try:
+            # An existing directory lists its own entries
+            if prefix and os.path.isdir(partial):
+                directory, prefix = partial, ""
+            listing = self._dir_cache.listdir(directory or ".")
+        except OSError:
+            return []
+
+        return [
+            f"@{os.path.join(directory, name)}" for name, _ in listing
+            if name.startswith(prefix) and (prefix.startswith('.') or not name.startswith('.'))
+        ]
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent):
+        text = document.text_before_cursor.lstrip()
+        words = [w for w in text.split() if w]
+        
+        current_word = ""
+        is_completing_word = False
+        if document.cursor_position > 0 and not document.text_before_cursor[-1].isspace():
+            is_completing_word = True
+            current_word = words[-1] if words else ""
+
+        # `--profile <command>` completes like <command>
+        if words[:1] == ["--profile"] and (len(words) > 1 or not is_completing_word):
+            words = words[1:]
+
+        if not words:
+            for cmd in self.commands:
+                yield Completion(cmd)
+            return
+
+        first_word = words[0].lower()
+
+        # Special case: file suggestion
+        for word in words:
+            if word.startswith('@'):
+                for path in self._get_file_suggestions(word):
+                    yield Completion(path, start_position=-len(word))
+                return
+
+        # Shell builtins (cd, ls)
+        if first_word in self.shell_builtins and len(words) > 1:
+            path_prefix = words[1]
+            cwd = self.get_cwd()
+            try:
+                for entry, is_dir in self._dir_cache.listdir(cwd):
+                    if entry.startswith(path_prefix) and not entry.startswith('.'):
+                        display = entry + ('/' if is_dir else '')
+                        yield Completion(entry, start_position=-len(path_prefix), display=display)
+            except Exception:
+                pass
+            return
+
+        # Begin recursive command traversal
+        current = self.commands
+        idx = 0
+        while idx < len(words):
+            word = words[idx]
+            if isinstance(current, dict):
+                if word in current:
+                    current = current[word]
+                    idx += 1
+                else:
+                    break
+            else:
+                break
+
+        # At this point, `current` might be:
+        # 1. a callable -> dynamic completion (like usernames)
+        # 2. a dict -> more subcommands to show
+        # 3. a list/tuple -> valid argument values
+
+        # If we're at a leaf that provides a completion callback
+        if callable(current):
+            try:
+                options = current() or []
+                if not isinstance(options, (list, tuple, PrefixIndex)):
+                    options = []
+            except Exception as e:
+                if os.getenv("SEER_DEBUG"):
+                    console.print(f"[yellow][!] Error in dynamic completion: {e}[/]")
+                options = []
+
+            last = current_word if is_completing_word else ""
+            if isinstance(options, PrefixIndex):
+                # Prefix hits first, then fuzzy matches
+                for opt in options.search(last, limit=MAX_COMPLETIONS):
+                    yield Completion(opt, start_position=-len(last))
+                return
+            for opt in options:
+                if isinstance(opt, str) and opt.startswith(last):
+                    yield Completion(opt, start_position=-len(last))
+            return
+
+        # If we're at a dict: suggest next subcommand
+        if isinstance(current, dict):
+            last = current_word if is_completing_word else ""
+            if not last:
+                for subcmd in current:
+                    yield Completion(subcmd)
+                return
+            for subcmd in self._node_index(current).search(last, limit=MAX_COMPLETIONS):
+                yield Completion(subcmd, start_position=-len(last))
+            return
+
+        # If list/tuple of static options
+        if isinstance(current, (list, tuple)):
+            last = current_word if is_completing_word else ""
+            for item in current:
+                if isinstance(item, str) and item.startswith(last):
+                    yield Completion(item, start_position=-len(last))
+            return
+
+
+def run_seer_command(args: List[str]) -> None:
+    """Execute a Seer command using the Typer CLI app.
+    
+    Args:
+        args: List of command line arguments
+    """      
+    from seerAD.core.session import session
+    try:
+        # Always use typer_app with the modified environment
+        with span("command", command=command_name(args), target=session.current_target_label):
+            typer_app(prog_name="seerAD", args=args)
+            
+    except SystemExit as e:
+        if e.code == 130:
+            console.print(f"[{THEME.INFO}][*] Interrupted. Exiting...")
+        elif e.code != 0 and args: 
+            console.print(f"[red][!] Error: Unknown or invalid command '{args[0]}'[/]")
+            console.print("[yellow]Type 'help' for available commands[/]")
+    except Exception as e:
+        console.print(f"[red][!] Error executing command: {e}[/]")
+
+def resolve_at_files(cmdline: str) -> str:
+    """
+    Replace @<path> tokens with full resolved path *only if* it looks like a valid local file or directory.
+    """
+    def replace_match(match):
+        raw_path = match.group(1)
+        expanded = os.path.expanduser(raw_path)
+        path = Path(expanded)
+        if path.exists():
+            return str(path.resolve())
+        else:
+            # Not a real path, leave as-is
+            return f"@{raw_path}"
+
+    return re.sub(r'@([^\s]+)', replace_match, cmdline)
+
+def shell_log_path(label) -> Optional[Path]:
+    """Where shell command output is teed when SEER_TEE_LOG is set (the target's loot dir)."""
+    if not os.getenv("SEER_TEE_LOG"):
+        return None
+    log_dir = LOOT_DIR / label if label else LOGS_DIR
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / "shell.log"
+
+
+def expand_args(args: List[str]) -> List[str]:
+    """Expand ~ and globs the way sh would (patterns without matches stay literal)."""
+    expanded = []
+    for arg in args:
+        arg = os.path.expanduser(arg)
+        matches = sorted(glob.glob(arg)) if glob.has_magic(arg) else []
+        expanded.extend(matches or [arg])
+    return expanded
+
+
+def run_shell_command(cmd: str) -> None:
+    """Execute a shell command with proper terminal handling.
+    
+    Args:
+        cmd: The shell command to execute
+    """
+    if not cmd.strip():
+        return
+        
+    try:
+        cmd_name = cmd.split()[0]
+        
+        # Get current environment, with the current target's timewrap applied
+        from seerAD.core.session import session
+        current_env = apply_timewrap(os.environ.copy(), session.current_target_label)
+        
+        # Handle interactive commands that need terminal control
+        if cmd_name in INTERACTIVE_COMMANDS:
+            old_settings = termios.tcgetattr(sys.stdin)
+            try:
+                subprocess.run(cmd, shell=True, env=current_env)
+            finally:
+                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+        # Stream everything else through a pty so output shows up as it is produced
+        else:
+            run_in_pty(["/bin/sh", "-c", cmd], cwd=os.getcwd(), env=current_env,
+                       tee=shell_log_path(session.current_target_label), title=cmd)
+    except FileNotFoundError:
+        console.print(f"[red]Command not found: {cmd.split()[0]}[/]")
+    except PermissionError:
+        console.print("[red]Permission denied. Check your permissions.[/]")
+    except Exception as e:
+        console.print(f"[red]Error executing command: {e}[/]")
+
+
+class PromptState:
+    """Prompt fragments rendered once and re-rendered only after a session event changes them."""
+
+    EVENTS = (TARGET_SWITCHED, CREDENTIAL_CHANGED, TIMEWRAP_CHANGED, CWD_CHANGED)
+
+    def __init__(self, get_cwd: Callable[[], str]):
+        self.get_cwd = get_cwd
+        self._fragments = None
+        for event in self.EVENTS:
+            bus.subscribe(event, self._invalidate)
+
+    def _invalidate(self, event, **data):
+        self._fragments = None
+
+    def fragments(self):
+        if self._fragments is None:
+            self._fragments = self._render()
+        return self._fragments
+
+    def _display_path(self) -> str:
+        current_dir = self.get_cwd()
+        try:
+            # Resolve any . or .. in the path
+            resolved_path = Path(current_dir).resolve()
+            # Try to make it relative to home directory
+            try:
+                display_path = str(resolved_path.relative_to(Path.home()))
+                if not display_path.startswith('.'):
+                    display_path = os.path.join("~", display_path)
+            except ValueError:
+                # If not under home, use absolute path
+                display_path = str(resolved_path)
+        except Exception:
+            # Fallback to current_dir if any error occurs
+            display_path = current_dir
+        return display_path
+
+    def _render(self):
+        from seerAD.core.session import session
+
+        label = session.current_target_label
+        current_cred = session.current_credential
+        cred_username = current_cred.get('username') if current_cred else None
+        cred_display = f"{cred_username}@" if cred_username else ""
+        clock_symbol = "◷" if label and timewrap_file(label).exists() else ""
+
+        return [
+            ("class:clock", clock_symbol),
+            ("class:prompt", "seer"),
+            ("class:brackets", "["),
+            ("class:userinfo", f"{cred_display}{label or 'no-target'} "),
+            ("class:path", self._display_path()),
+            ("class:brackets", "]> ")
+        ]
+
+
+def count_child_processes() -> int:
+    """Live children of this process (tools still running in the background). Linux only."""
+    total = 0
+    try:
+        for task in os.scandir(f"/proc/{os.getpid()}/task"):
+            with open(os.path.join(task.path, "children")) as f:
+                total += len(f.read().split())
+    except OSError:
+        return 0
+    return total
+
+
+def read_ticket_endtime(path: str):
+    """End time (epoch seconds) of the TGT in a ccache, or None."""
+    from minikerberos.common.ccache import CCACHE
+
+    end = None
+    for cred in CCACHE.from_file(path).credentials:
+        if cred.server.to_string().lower().startswith("krbtgt"):
+            end = max(end or 0, cred.time.endtime)
+    return end
+
+
+def format_remaining(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m" if hours else f"{rest // 60}m"
+
+
+class StatusLine:
+    """
+    Bottom toolbar with ticket lifetime, running jobs and clock skew.
+    A daemon thread recomputes it on session events (and every `interval` seconds);
+    the prompt only ever reads the cached fragments.
+    """
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self.app = None
+        self._fragments = []
+        self._wake = threading.Event()
+        for event in PromptState.EVENTS:
+            bus.subscribe(event, lambda event, **data: self._wake.set())
+
+    def __call__(self):
+        return self._fragments
+
+    def start(self, app):
+        self.app = app
+        threading.Thread(target=self._run, name="seer-status", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                fragments = self._render()
+            except Exception as e:
+                fragments = [("class:status.error", f" status: {e}")]
+            if fragments != self._fragments:
+                self._fragments = fragments
+                if self.app is not None:
+                    self.app.invalidate()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _ticket_fragments(self, cred):
+        ticket = (cred or {}).get("ticket") or os.environ.get("KRB5CCNAME", "").replace("FILE:", "")
+        if not ticket or not os.path.exists(ticket):
+            return []
+        try:
+            end = read_ticket_endtime(ticket)
+        except Exception:
+            return [("class:status.warn", " TGT unreadable ")]
+        if end is None:
+            return []
+        remaining = end - time.time()
+        if remaining <= 0:
+            return [("class:status.error", " TGT expired ")]
+        style = "class:status.warn" if remaining < 3600 else "class:status.ok"
+        return [(style, f" TGT {format_remaining(remaining)} ")]
+
+    def _skew_fragments(self, label, target):
+        data = get_timewrap(label)
+        from seerAD.core.clock import describe_offset, get_cached_skew
+        if data:
+            return [("class:clock", f" ◷ {describe_offset(float(data['offset']))} ")]
+        measured = get_cached_skew(target["ip"]) if target and target.get("ip") else None
+        if measured and abs(measured["offset"]) > 60:
+            return [("class:status.warn", f" skew {describe_offset(measured['offset'])} (no timewrap) ")]
+        return []
+
+    def _render(self):
+        from seerAD.core.session import session
+
+        label = session.current_target_label
+        fragments = self._ticket_fragments(session.current_credential)
+        if label:
+            fragments += self._skew_fragments(label, session.current_target)
+        jobs = count_child_processes()
+        if jobs:
+            fragments.append(("class:status.warn", f" jobs {jobs} "))
+        return fragments
+
+
+def history_context():
+    """(target, credential) that new history entries are tagged with."""
+    from seerAD.core.session import session
+    cred = session.current_credential
+    return session.current_target_label, cred.get("username") if cred else None
+
+
+def run_interactive() -> None:
+    """Run the interactive Seer shell.
+    
+    Handles command input, command routing, and maintains shell state.
+    """
+    current_dir = os.getcwd()
+    seer_commands = SeerCompleter(get_cwd_func=lambda: current_dir)
+    prompt_state = PromptState(get_cwd=lambda: current_dir)
+    status_line = StatusLine()
+    
+    history = SeerHistory(max_size=1000, context=history_context)
+    set_active_history(history)
+
+    try:
+        prompt = PromptSession(
+            # Loaded in a background thread; the prompt is usable immediately
+            history=ThreadedHistory(history),
+            bottom_toolbar=status_line,
+            style=PROMPT_STYLE,
+            completer=seer_commands,
+            complete_while_typing=True,
+            # Completion runs in a background thread; stale runs are cancelled as the user types
+            complete_in_thread=True,
+        )
+    except Exception as e:
+        console.print(f"[bold {THEME.WARNING}][!] Warning: Could not load command history: {e}[/]")
+        prompt = PromptSession(style=PROMPT_STYLE, completer=seer_commands, complete_in_thread=True,
+                               bottom_toolbar=status_line)
+    status_line.start(prompt.app)
+
+    # Main interactive loop
+    while True:
+        try:
+            prompt_text = prompt_state.fragments()
+
+            # Get user input with completion
+            try:
+                cmdline = prompt.prompt(prompt_text)
+                cmdline = resolve_at_files(cmdline)
+            except KeyboardInterrupt:
+                console.print(f"[{THEME.INFO}][*] Command cancelled")
+                continue
+            except EOFError:
+                console.print(f"[{THEME.SUCCESS}][*] Goodbye")
+                break
+
+            # Handle empty input
+            if not cmdline.strip():
+                continue
+                
+            # Handle exit commands
+            if cmdline.strip().lower() in ("exit", "quit"):
+                console.print(f"[{THEME.SUCCESS}][*] Goodbye")
+                break
+                
+            try:
+                # Handle built-in shell commands
+                if cmdline.startswith("cd "):
+                    try:
+                        target = cmdline[3:].strip()
+                        target_path = Path(target).expanduser().absolute()
+                        
+                        # Handle 'cd -' to go back to previous directory
+                        if target == "-":
+                            if hasattr(run_interactive, '_last_dir') and run_interactive._last_dir:
+                                target_path = run_interactive._last_dir
+                            else:
+                                console.print(f"[{THEME.WARNING}][*] No previous directory in history")
+                                continue
+                        
+                        # Update current directory
+                        if target_path.is_dir():
+                            run_interactive._last_dir = current_dir
+                            current_dir = str(target_path)
+                            os.chdir(current_dir)
+                            bus.emit(CWD_CHANGED, cwd=current_dir)
+                        else:
+                            console.print(f"[{THEME.ERROR}][*] No such directory: {target}")
+                    except Exception as e:
+                        console.print(f"[{THEME.ERROR}][!] cd: {e}[/]")
+                    continue
+                    
+                elif cmdline.strip() == "pwd":
+                    console.print(current_dir)
+                    continue
+                    
+                # Handle ls command
+                elif cmdline.strip() == "ls" or cmdline.strip().startswith("ls "):
+                    try:
+                        run_in_pty(["ls", "--color=auto", *expand_args(shlex.split(cmdline[2:]))], cwd=current_dir)
+                    except Exception as e:
+                        console.print(f"[{THEME.ERROR}][*] ls: {e}")
+                    continue
+                
+                # Handle help command
+                args = shlex.split(cmdline)
+                if not args:  # Shouldn't happen due to strip() check above
+                    continue
+                    
+                cmd_name = args[0].lower()
+                
+                if cmd_name == "help":
+                    help_args = args[1:] + ["--help"] if len(args) > 1 else ["--help"]
+                    typer_app(prog_name="seerAD", args=help_args)
+                    continue
+                    
+                # Handle Seer commands
+                if cmd_name in seer_commands.commands or cmd_name == "--profile":
+                    run_seer_command(args)
+                    continue
+                    
+                # Fall back to shell command
+                run_shell_command(cmdline)
+                
+            except Exception as e:
+                console.print(f"[{THEME.ERROR}][!] Error: {e}[/]")
+                if os.getenv("SEER_DEBUG"):
+                    console.print_exception()
+
+        except SystemExit as e:
+            if e.code != 0:
+                console.print(f"[{THEME.WARNING}][!] Process exited with code {e.code}[/]")
+                if os.getenv("SEER_DEBUG"):
+                    console.print_exception()
+        except Exception as e:
+            console.print(f"\n[bold {THEME.ERROR}][!] Error: {e}")
+            if os.getenv("SEER_DEBUG"):
+                console.print_exception()
+            console.print(f"[{THEME.INFO}]Type 'exit' or press Ctrl+D to quit.[/]")
+            continue
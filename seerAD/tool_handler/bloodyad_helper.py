@@ -5,7 +5,8 @@ import shutil
 from typing import List, Dict, Tuple
 from rich.console import Console
 from seerAD.core.session import session
-from seerAD.tool_handler.helper import build_target_host_bloodyAD, run_tool
+from seerAD.core.telemetry import span
+from seerAD.tool_handler.helper import build_target_host_bloodyAD, run_tool, tool_module
 
 console = Console()
 
@@ -56,12 +57,14 @@ def run_bloodyad(tool: List[str], method: str, args: List[str]):
         console.print("[yellow]No credential selected. Use 'creds use' or use 'anon'.[/]")
         return
     
-    try:
-        target = build_target_host_bloodyAD(method)
-        auth_args, env_vars = build_auth_args_bloodyad(method, session.current_credential or {})
-        cmd = ["bloodyAD"] + target + auth_args + tool + args
-        env = os.environ.copy()
-        env.update(env_vars)
-        run_tool(cmd, env=env)
-    except Exception as e:
-        console.print(f"[red]{tool[0].upper() + tool[1:]} error: {e}[/]")
\ No newline at end of file
+    module = " ".join(["bloodyAD"] + tool[:2])
+    with span("helper", module=module, auth=method, target=session.current_target_label), tool_module(module, tool[2:] + args):
+        try:
+            target = build_target_host_bloodyAD(method)
+            auth_args, env_vars = build_auth_args_bloodyad(method, session.current_credential or {})
+            cmd = ["bloodyAD"] + target + auth_args + tool + args
+            env = os.environ.copy()
+            env.update(env_vars)
+            run_tool(cmd, env=env)
+        except Exception as e:
+            console.print(f"[red]{tool[0].upper() + tool[1:]} error: {e}[/]")
\ No newline at end of file
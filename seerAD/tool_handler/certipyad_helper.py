@@ -4,7 +4,8 @@ import shutil
 from typing import List, Dict, Tuple, Any
 from rich.console import Console
 from seerAD.core.session import session
-from seerAD.tool_handler.helper import build_target_host_certipy, run_tool
+from seerAD.core.telemetry import span
+from seerAD.tool_handler.helper import build_target_host_certipy, run_tool, tool_module
 
 console = Console()
 
@@ -64,13 +65,15 @@ def run_certipy(tool: List[str], method: str, args: List[str]):
         console.print("[yellow]No credential selected. Use 'creds use'.[/]")
         return
     
-    try:
-        target = build_target_host_certipy(method)
-        auth_args, env_vars = build_auth_args_certipy(method, session.current_credential or {})
-        global_args = ["-debug"]
-        cmd = ["certipy-ad"] + [arg for arg in global_args if any(x == arg for x in args)] + [tool] + auth_args + target + [arg for arg in args if arg not in global_args]
-        env = os.environ.copy()
-        env.update(env_vars)
-        run_tool(cmd, env=env)
-    except Exception as e:
-        console.print(f"[red]{tool[0].upper() + tool[1:]} error: {e}[/]")
\ No newline at end of file
+    module = f"certipy {tool}"
+    with span("helper", module=module, auth=method, target=session.current_target_label), tool_module(module, args):
+        try:
+            target = build_target_host_certipy(method)
+            auth_args, env_vars = build_auth_args_certipy(method, session.current_credential or {})
+            global_args = ["-debug"]
+            cmd = ["certipy-ad"] + [arg for arg in global_args if any(x == arg for x in args)] + [tool] + auth_args + target + [arg for arg in args if arg not in global_args]
+            env = os.environ.copy()
+            env.update(env_vars)
+            run_tool(cmd, env=env)
+        except Exception as e:
+            console.print(f"[red]{tool[0].upper() + tool[1:]} error: {e}[/]")
\ No newline at end of file
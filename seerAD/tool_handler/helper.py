@@ -1,20 +1,174 @@
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Tuple, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
 from rich.console import Console
+from rich.markup import escape
 from seerAD.core.session import session
+from seerAD.core.telemetry import span
+from seerAD.core.timewrap import FAKETIME_LIB, SkewDetector, apply_timewrap, recover_skew
 import subprocess
+import os
 
 console = Console()
 
-def run_tool(cmd: List[str], env: Dict[str, str] = None) -> None:
-    console.print(f"[red]❯[/] [yellow]{' '.join(cmd)}[/]")
+# Exit codes of the tools run in the current context, when someone is collecting them
+_returncodes: ContextVar[Optional[List[int]]] = ContextVar("seer_tool_returncodes", default=None)
+
+@contextmanager
+def collect_returncodes():
+    """Collect the exit code of every run_tool call made inside the block (in this thread/task)."""
+    codes: List[int] = []
+    token = _returncodes.set(codes)
+    try:
+        yield codes
+    finally:
+        _returncodes.reset(token)
+
+# Module ("nxc smb") and user options (["--shares"]) of the run_tool calls made by a tool helper;
+# output, records and facts are filed under the module, record snapshots under both
+_module: ContextVar[Optional[Tuple[str, Tuple[str, ...]]]] = ContextVar("seer_tool_module", default=None)
+
+@contextmanager
+def tool_module(name: str, args: List[str] = ()):
+    """Inside the block, run_tool files what it keeps under module `name` (and `args`) instead of the tool's command line."""
+    token = _module.set((name, tuple(args)))
+    try:
+        yield
+    finally:
+        _module.reset(token)
+
+# When set, run_tool shows only the records added/removed since the previous run
+_diff_mode: ContextVar[bool] = ContextVar("seer_tool_diff", default=False)
+
+@contextmanager
+def show_diff():
+    """Inside the block, run_tool prints a record diff against the last run instead of the output."""
+    token = _diff_mode.set(True)
+    try:
+        yield
+    finally:
+        _diff_mode.reset(token)
+
+# When set, run_tool appends cached names after the SIDs in the output it prints
+_annotate_sids: ContextVar[bool] = ContextVar("seer_tool_sids", default=False)
+
+@contextmanager
+def annotate_sids():
+    """Inside the block, run_tool prints `S-1-5-21-...-512 (CORP\\Domain Admins)` for SIDs in the cache."""
+    token = _annotate_sids.set(True)
+    try:
+        yield
+    finally:
+        _annotate_sids.reset(token)
+
+def _print_diff(snapshot) -> None:
+    from seerAD.core.records import SEP
+
+    if not snapshot.baseline:
+        console.print("[yellow]No previous run of this module with this credential: everything is new.[/]")
+    for sign, style, records in (("+", "green", snapshot.added), ("-", "red", snapshot.removed)):
+        for text in records:
+            first, *rest = text.split(SEP)
+            console.print(f"[{style}]{sign} {escape(first)}[/]", soft_wrap=True)
+            for line in rest:
+                console.print(f"[{style}]  {escape(line)}[/]", soft_wrap=True)
+    console.print(f"[cyan]{len(snapshot.added)} added, {len(snapshot.removed)} removed[/] "
+                  f"[dim]({len(snapshot.records)} records)[/]")
+    if snapshot.returncode != 0:
+        console.print("[dim]The run failed, so the previous run stays the baseline.[/]")
+
+def _run_once(cmd: List[str], env: Dict[str, str]):
+    """Run cmd once through the output stages. Returns (returncode, skew detected, output bytes, record snapshot)."""
+    # Loaded on the first tool run, not by every command that imports a helper
+    from seerAD.core.facts import FactCollector
+    from seerAD.core.loot import OutputRecorder
+    from seerAD.core.records import RecordSnapshot
+    from seerAD.core.roast import RoastCapture
+    from seerAD.core.sids import SidAnnotator
+
+    # Output stages see every line of the tool's output stream
+    roast = RoastCapture(session.current_target_label)
+    skew = SkewDetector()
+    module, args = _module.get() or (os.path.basename(cmd[0]), tuple(cmd[1:]))
+    username = (session.current_credential or {}).get("username")
+    recorder = OutputRecorder(session.current_target_label, module, username, cmd)
+    snapshot = RecordSnapshot(session.current_target_label, module, username, args)
+    facts = FactCollector(session.current_target_label, module)
+    stages = [roast, skew, recorder, snapshot, facts]
+    quiet = _diff_mode.get()
+    annotator = SidAnnotator() if _annotate_sids.get() and not quiet else None
+
+    # Per-target clock skew is applied to the child only; the shell keeps system time
+    env = apply_timewrap(dict(env) if env is not None else os.environ.copy(), session.current_target_label)
     process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
 
+    output_bytes = 0
     for line in process.stdout:
-        console.print(line.rstrip())
+        output_bytes += len(line)
+        if annotator is not None:
+            console.print(annotator.rewrite(line.rstrip()), soft_wrap=True, markup=False, highlight=False)
+        elif not quiet:
+            console.print(line.rstrip(), soft_wrap=True, markup=False, highlight=False)  # tool output is text, not rich markup
+        for stage in stages:
+            stage.feed(line)
 
     process.wait()
+    recorder.returncode = snapshot.returncode = process.returncode
+    for stage in stages:
+        stage.close()
+    if annotator is not None:
+        annotator.close()
+        if annotator.unknown:
+            console.print(f"[dim]{len(annotator.unknown)} SID(s) are not in the cache yet; 'sid resolve <sid>...' "
+                          f"looks them up on the DC.[/]")
+
+    if roast.added:
+        console.print(f"[green]✔ Captured {roast.added} new roast hash(es). Use 'roast export' to crack them.[/]")
+    if facts.creds_added or facts.creds_updated:
+        console.print(f"[green]✔ Credentials from output: {facts.creds_added} added, {facts.creds_updated} updated. "
+                      f"See 'creds list'.[/]")
     if process.returncode != 0:
         console.print(f"[red][!] Process exited with code {process.returncode}[/]")
+    return process.returncode, skew.detected, output_bytes, snapshot
+
+def _recover_skew() -> bool:
+    """Measure and store the target's clock offset after a skew error. Returns True if a retry makes sense."""
+    target = session.current_target or {}
+    if not target.get("ip"):
+        return False
+    if not Path(FAKETIME_LIB).exists():
+        console.print(f"[yellow][!] Clock skew detected, but {FAKETIME_LIB} is missing. Install libfaketime.[/]")
+        return False
+
+    console.print(f"[yellow][!] Clock skew detected. Measuring offset against {target['ip']}...[/]")
+    try:
+        data = recover_skew(session.current_target_label, target["ip"], realm=target.get("domain"))
+    except Exception as e:
+        console.print(f"[red]✘ Could not measure clock skew: {e}[/]")
+        return False
+    console.print(f"[green]✓ Timewrap offset set for {session.current_target_label}:[/] {data['offset']}")
+    return True
+
+def run_tool(cmd: List[str], env: Dict[str, str] = None) -> int:
+    console.print(f"[red]❯[/] [yellow]{' '.join(cmd)}[/]", soft_wrap=True)
+    with span("tool", tool=os.path.basename(cmd[0]), target=session.current_target_label) as record:
+        returncode, skewed, output_bytes, snapshot = _run_once(cmd, env)
+
+        # Retry once under the corrected fake time
+        if skewed and _recover_skew():
+            console.print(f"[red]❯[/] [yellow]{' '.join(cmd)}[/] [dim](retry with timewrap)[/]")
+            record["retried"] = True
+            returncode, _, output_bytes, snapshot = _run_once(cmd, env)
+        record["rc"], record["bytes"] = returncode, output_bytes
+
+    if _diff_mode.get():
+        _print_diff(snapshot)
+
+    codes = _returncodes.get()
+    if codes is not None:
+        codes.append(returncode)
+    return returncode
 
 def run_command(command: str, method: str, args: List[str], COMMANDS: Dict[str, Callable]) -> None:
     creds = session.current_credential
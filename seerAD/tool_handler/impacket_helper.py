@@ -4,7 +4,8 @@ import shutil
 from typing import List, Dict, Tuple
 from rich.console import Console
 from seerAD.core.session import session
-from seerAD.tool_handler.helper import impacket_identity, resolve_flags, run_tool
+from seerAD.core.telemetry import span
+from seerAD.tool_handler.helper import impacket_identity, resolve_flags, run_tool, tool_module
 
 console = Console()
 
@@ -136,33 +137,34 @@ def run_impacket(tool: str, method: str, extra_args: List[str]):
         console.print("[yellow]No credential selected. Use 'creds use' or use 'anon'.[/]")
         return
 
-    try:
-        target = session.current_target
-        cred = session.current_credential or {}
+    with span("helper", module=tool, auth=method, target=session.current_target_label), tool_module(tool, extra_args):
+        try:
+            target = session.current_target
+            cred = session.current_credential or {}
 
-        config = IMPACKET_TOOL_CONFIG.get(tool.lower())
-        if not config:
-            console.print(f"[red]No config for tool: {tool}[/]")
-            return
+            config = IMPACKET_TOOL_CONFIG.get(tool.lower())
+            if not config:
+                console.print(f"[red]No config for tool: {tool}[/]")
+                return
 
-        target_str = config["target"](method, target, cred)
-        auth_flags = resolve_flags(config.get("auth", {}).get(method, []), cred, target)
-        extra_flags = resolve_flags(config.get("extra", []), cred, target)
+            target_str = config["target"](method, target, cred)
+            auth_flags = resolve_flags(config.get("auth", {}).get(method, []), cred, target)
+            extra_flags = resolve_flags(config.get("extra", []), cred, target)
 
-        args = [target_str] + auth_flags + extra_flags + extra_args
-        cmd = [f"{tool}.py"] + args
+            args = [target_str] + auth_flags + extra_flags + extra_args
+            cmd = [f"{tool}.py"] + args
 
-        if shutil.which(tool + ".py") is None:
-            console.print(f"[red]{tool}.py not found. Please install impacket.[/]")
-            console.print(f"[yellow]You can install impacket using 'pipx install impacket'.[/]")
-            return
+            if shutil.which(tool + ".py") is None:
+                console.print(f"[red]{tool}.py not found. Please install impacket.[/]")
+                console.print(f"[yellow]You can install impacket using 'pipx install impacket'.[/]")
+                return
 
-        env = os.environ.copy()
-        if method == "ticket" and cred.get("ticket"):
-            env["KRB5CCNAME"] = cred["ticket"]
-        env["PYTHONWARNINGS"] = "ignore::UserWarning"
+            env = os.environ.copy()
+            if method == "ticket" and cred.get("ticket"):
+                env["KRB5CCNAME"] = cred["ticket"]
+            env["PYTHONWARNINGS"] = "ignore::UserWarning"
 
-        run_tool(cmd, env=env)
+            run_tool(cmd, env=env)
 
-    except Exception as e:
-        console.print(f"[red]{tool.upper()} error: {e}[/]")
+        except Exception as e:
+            console.print(f"[red]{tool.upper()} error: {e}[/]")
@@ -5,7 +5,8 @@ import shutil
 from typing import List, Dict, Tuple
 from rich.console import Console
 from seerAD.core.session import session
-from seerAD.tool_handler.helper import build_target_host, run_tool
+from seerAD.core.telemetry import span
+from seerAD.tool_handler.helper import build_target_host, run_tool, tool_module
 
 console = Console()
 
@@ -80,17 +81,19 @@ def run_nxc(tool: str, method: str, extra_args: List[str]):
         console.print("[yellow]No credential selected. Use 'creds use' or use 'anon'.[/]")
         return
 
-    try:
-        target = build_target_host(method)
-        auth_args, env_vars = build_auth_args_nxc(method, session.current_credential or {})
-        more_args = get_extra_args(tool)
+    module = f"nxc {tool}"
+    with span("helper", module=module, auth=method, target=session.current_target_label), tool_module(module, extra_args):
+        try:
+            target = build_target_host(method)
+            auth_args, env_vars = build_auth_args_nxc(method, session.current_credential or {})
+            more_args = get_extra_args(tool)
         
-        cmd = ["nxc", tool, target] + auth_args + more_args + extra_args
+            cmd = ["nxc", tool, target] + auth_args + more_args + extra_args
 
-        env = os.environ.copy()
-        env.update(env_vars)
+            env = os.environ.copy()
+            env.update(env_vars)
 
-        run_tool(cmd, env=env)
+            run_tool(cmd, env=env)
 
-    except Exception as e:
-        console.print(f"[red]{tool.upper()} error: {e}[/]")
\ No newline at end of file
+        except Exception as e:
+            console.print(f"[red]{tool.upper()} error: {e}[/]")
\ No newline at end of file